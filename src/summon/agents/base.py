@@ -12,6 +12,7 @@ logger = logging.getLogger(__name__)
 
 from langchain_core.messages import HumanMessage, SystemMessage
 
+from summon.concurrency import limiter
 from summon.config import SummonConfig
 from summon.models import get_llm
 
@@ -28,11 +29,13 @@ def create_agent_node(
 
     The returned function:
     1. Formats the user prompt with state values
-    2. Calls the configured LLM
+    2. Calls the configured LLM (within the shared ``llm`` limiter, see
+       :mod:`summon.concurrency`)
     3. Parses JSON output
     4. Returns {output_key: parsed_result}
     """
     max_retries = 5
+    llm_slots = limiter("llm", config.max_concurrent_llm_calls)
 
     def node(state: dict[str, Any]) -> dict[str, Any]:
         model_name = config.get_model(model_key)
@@ -53,7 +56,8 @@ def create_agent_node(
                 time.sleep(min(2 ** (attempt - 1), 30))
 
             try:
-                response = llm.invoke(messages)
+                with llm_slots.slot(state.get("_priority", 0.0)):
+                    response = llm.invoke(messages)
                 content = response.content
             except Exception as exc:
                 last_error = exc
@@ -108,7 +112,8 @@ def create_structured_agent_node(
             HumanMessage(content=user_prompt),
         ]
 
-        result = structured_llm.invoke(messages)
+        with limiter("llm", config.max_concurrent_llm_calls).slot(state.get("_priority", 0.0)):
+            result = structured_llm.invoke(messages)
         if hasattr(result, 'model_dump'):
             return {output_key: result.model_dump()}
         return {output_key: result}
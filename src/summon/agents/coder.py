@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from summon.agents.base import create_agent_node
 from summon.config import SummonConfig
-from summon.prompts.stage4 import CODER
+from summon.prompts.stage4 import CODER, FILE_CODER
 
 
 def create_coder_node(config: SummonConfig):
@@ -15,3 +15,14 @@ def create_coder_node(config: SummonConfig):
         user_prompt_template=CODER,
         output_key="_code_result",
     )
+
+
+def create_file_coder_node(config: SummonConfig):
+    """Writes a single file of a component against the LLD's file contract."""
+    return create_agent_node(
+        config=config,
+        model_key="coder",
+        system_prompt="You are an expert programmer who writes production-quality code.",
+        user_prompt_template=FILE_CODER,
+        output_key="_file_result",
+    )
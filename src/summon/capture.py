@@ -0,0 +1,160 @@
+"""Bounded output capture and failure-preserving summaries for test runs.
+
+pytest prints passing test names first and failure details last, so simply
+keeping the first N bytes of a run hands the fixer a list of PASSED lines
+and no traceback.  This module provides:
+
+- :class:`HeadTailBuffer` — a byte buffer that keeps the start and the end
+  of a stream (a ring buffer for the tail) and drops the middle, so memory
+  stays bounded no matter how much a command prints.
+- :func:`summarize_test_output` — extracts the FAILURES / ERRORS sections,
+  the short test summary and the final result line from pytest output (or
+  ``ACCEPTANCE FAIL`` lines from acceptance scripts) and fits them into a
+  byte budget, falling back to head+tail clipping for anything else.
+"""
+
+from __future__ import annotations
+
+import re
+from collections import deque
+
+# Default budget for output handed to fixer prompts.
+DEFAULT_OUTPUT_BUDGET = 4000
+
+_SECTION_RE = re.compile(r"^={3,} (.+?) ={3,}$", re.MULTILINE)
+_BLOCK_HEADER_RE = re.compile(r"^_{3,} .+? _{3,}$", re.MULTILINE)
+_ACCEPTANCE_RE = re.compile(r"^.*ACCEPTANCE (FAIL|RESULTS)\b.*$", re.MULTILINE)
+
+
+class HeadTailBuffer:
+    """Byte buffer keeping the first *head* and last *tail* bytes written.
+
+    The tail is a ring of chunks trimmed from the left as new data arrives,
+    so total memory never exceeds roughly ``head + tail`` bytes.
+    """
+
+    def __init__(self, limit: int, head: int | None = None):
+        self.head_limit = limit // 4 if head is None else min(head, limit)
+        self.tail_limit = limit - self.head_limit
+        self._head = bytearray()
+        self._tail: deque[bytes] = deque()
+        self._tail_size = 0
+        self.dropped = 0
+
+    def write(self, chunk: bytes) -> None:
+        room = self.head_limit - len(self._head)
+        if room > 0:
+            self._head += chunk[:room]
+            chunk = chunk[room:]
+        if not chunk:
+            return
+        self._tail.append(chunk)
+        self._tail_size += len(chunk)
+        while self._tail_size > self.tail_limit and self._tail:
+            excess = self._tail_size - self.tail_limit
+            first = self._tail[0]
+            if len(first) <= excess:
+                self._tail.popleft()
+                self._tail_size -= len(first)
+                self.dropped += len(first)
+            else:
+                self._tail[0] = first[excess:]
+                self._tail_size -= excess
+                self.dropped += excess
+
+    def getvalue(self) -> str:
+        head = self._head.decode("utf-8", errors="replace")
+        tail = b"".join(self._tail).decode("utf-8", errors="replace")
+        if self.dropped:
+            return f"{head}\n[... {self.dropped} bytes truncated ...]\n{tail}"
+        return head + tail
+
+
+def clip_output(text: str, budget: int = DEFAULT_OUTPUT_BUDGET) -> str:
+    """Fit *text* into *budget* characters, keeping a quarter head and the tail.
+
+    Errors and tracebacks tend to come last, so the tail gets the larger share.
+    """
+    if len(text) <= budget:
+        return text
+    marker = f"\n[... {len(text) - budget} chars omitted ...]\n"
+    keep = max(budget - len(marker), 0)
+    head = keep // 4
+    tail = keep - head
+    return text[:head] + marker + (text[-tail:] if tail else "")
+
+
+def _pytest_sections(output: str) -> dict[str, str]:
+    """Split pytest output into its ``=== NAME ===`` sections."""
+    sections: dict[str, str] = {}
+    matches = list(_SECTION_RE.finditer(output))
+    for i, match in enumerate(matches):
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+        sections[match.group(1).strip()] = output[match.end():end].strip("\n")
+    if matches:
+        sections["_result"] = matches[-1].group(0)
+    return sections
+
+
+def _split_blocks(section: str) -> list[str]:
+    """Split a FAILURES/ERRORS section into one block per test."""
+    starts = [m.start() for m in _BLOCK_HEADER_RE.finditer(section)]
+    if not starts:
+        return [section] if section.strip() else []
+    starts.append(len(section))
+    return [section[starts[i]:starts[i + 1]].strip("\n") for i in range(len(starts) - 1)]
+
+
+def _summarize_pytest(sections: dict[str, str], budget: int) -> str:
+    parts: list[str] = []
+    result_line = sections.get("_result", "")
+    short = sections.get("short test summary info", "")
+    header = "\n".join(p for p in (result_line, short and "short test summary info:\n" + short) if p)
+    header = clip_output(header, budget // 2)
+    parts.append(header)
+
+    blocks: list[str] = []
+    for name, body in sections.items():
+        if name in ("FAILURES", "ERRORS") or name.startswith("ERROR"):
+            blocks.extend(_split_blocks(body))
+
+    remaining = budget - len(header) - 2
+    if blocks and remaining > 0:
+        per_block = max(remaining // len(blocks), 200)
+        details: list[str] = []
+        used = 0
+        for block in blocks:
+            clipped = clip_output(block, per_block)
+            if used + len(clipped) > remaining:
+                details.append(f"[... {len(blocks) - len(details)} more failure blocks omitted ...]")
+                break
+            details.append(clipped)
+            used += len(clipped) + 1
+        parts.append("\n".join(details))
+
+    return "\n\n".join(p for p in parts if p)
+
+
+def summarize_test_output(output: str, budget: int = DEFAULT_OUTPUT_BUDGET) -> str:
+    """Return the most useful *budget* characters of a test run's output.
+
+    Output that fits is returned unchanged.  Otherwise pytest FAILURES /
+    ERRORS blocks, the short test summary and the result line are kept in
+    preference to PASSED lines; acceptance-script output keeps its
+    ``ACCEPTANCE FAIL`` and ``ACCEPTANCE RESULTS`` lines.  Anything else is
+    clipped to its head and tail.
+    """
+    if len(output) <= budget:
+        return output
+
+    sections = _pytest_sections(output)
+    if any(k in sections for k in ("FAILURES", "ERRORS", "short test summary info")):
+        return _summarize_pytest(sections, budget)
+
+    acceptance = [m.group(0) for m in _ACCEPTANCE_RE.finditer(output)]
+    if acceptance:
+        key_lines = clip_output("\n".join(acceptance), budget // 2)
+        rest = budget - len(key_lines) - 2
+        return key_lines + "\n\n" + clip_output(output, rest) if rest > 0 else key_lines
+
+    return clip_output(output, budget)
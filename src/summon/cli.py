@@ -208,6 +208,7 @@ def main():
 @click.option("--no-publish", is_flag=True, help="Skip package publishing")
 @click.option("--dry-run", is_flag=True, help="Run pipeline but don't create external resources")
 @click.option("--resume", "resume_id", default=None, help="Resume a previous run by its ID")
+@click.option("--force-regenerate", is_flag=True, help="Ignore cached Stage 4 component results")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed output")
 def run(
     idea: str,
@@ -218,6 +219,7 @@ def run(
     no_publish: bool,
     dry_run: bool,
     resume_id: str | None,
+    force_regenerate: bool,
     verbose: bool,
 ):
     """Run the full pipeline: idea → spec → design → code → test → ship.
@@ -233,6 +235,8 @@ def run(
     ))
 
     config = SummonConfig.load(config_path)
+    if force_regenerate:
+        config.regenerate_components = True
 
     if dry_run:
         no_github = True
@@ -651,6 +655,7 @@ def design(
 @click.option("--no-publish", is_flag=True, help="Skip package publishing")
 @click.option("--dry-run", is_flag=True, help="Run pipeline but don't create external resources")
 @click.option("--resume", "resume_id", default=None, help="Resume a previous run by its ID")
+@click.option("--force-regenerate", is_flag=True, help="Ignore cached Stage 4 component results")
 @click.option("--verbose", "-v", is_flag=True, help="Show detailed output")
 def build(
     spec_file: str,
@@ -661,6 +666,7 @@ def build(
     no_publish: bool,
     dry_run: bool,
     resume_id: str | None,
+    force_regenerate: bool,
     verbose: bool,
 ):
     """Build a project from a JSON file (auto-detects start stage).
@@ -689,6 +695,8 @@ def build(
     ))
 
     config = SummonConfig.load(config_path)
+    if force_regenerate:
+        config.regenerate_components = True
 
     if dry_run:
         no_github = True
@@ -751,5 +759,73 @@ def build(
         sys.exit(1)
 
 
+@main.group()
+def wheelhouse():
+    """Manage the local wheelhouse used for offline dependency installs."""
+
+
+def _wheelhouse_dir(dir_path: str | None, config_path: str | None) -> Path:
+    path = dir_path or SummonConfig.load(config_path).wheelhouse
+    if not path:
+        console.print("[red]No wheelhouse configured: set `wheelhouse` in summon.yaml or pass --dir[/red]")
+        sys.exit(1)
+    return Path(path).expanduser()
+
+
+@wheelhouse.command("add")
+@click.argument("packages", nargs=-1)
+@click.option("--requirement", "-r", "requirement_files", multiple=True, help="Add everything in a requirements file")
+@click.option("--dir", "dir_path", default=None, help="Wheelhouse directory (default: `wheelhouse` from summon.yaml)")
+@click.option("--config", "-c", "config_path", default=None, help="Path to summon.yaml")
+def wheelhouse_add(
+    packages: tuple[str, ...],
+    requirement_files: tuple[str, ...],
+    dir_path: str | None,
+    config_path: str | None,
+):
+    """Download packages (with dependencies) or copy local wheels into the wheelhouse.
+
+    Run on a machine with network access, then ship the directory.
+
+    Example: summon wheelhouse add requests "flask>=3" ./dist/mylib-1.0-py3-none-any.whl
+    """
+    from summon import wheelhouse as wh
+
+    if not packages and not requirement_files:
+        console.print("[red]Nothing to add: pass packages or -r requirements.txt[/red]")
+        sys.exit(1)
+
+    root = _wheelhouse_dir(dir_path, config_path)
+    result = wh.add(root, list(packages), list(requirement_files))
+    if result is not None and result.returncode != 0:
+        console.print("[red bold]pip download failed[/red bold]")
+        console.print(f"[red]{result.stderr or result.stdout}[/red]")
+        sys.exit(1)
+    count = sum(len(dists) for dists in wh.scan(root).values())
+    console.print(f"[green]✓[/green] {root} now holds {count} distribution(s)")
+
+
+@wheelhouse.command("check")
+@click.argument("requirements_file", type=click.Path(exists=True, dir_okay=False))
+@click.option("--dir", "dir_path", default=None, help="Wheelhouse directory (default: `wheelhouse` from summon.yaml)")
+@click.option("--config", "-c", "config_path", default=None, help="Path to summon.yaml")
+def wheelhouse_check(requirements_file: str, dir_path: str | None, config_path: str | None):
+    """Report requirements (and their dependencies) missing from the wheelhouse."""
+    from summon import wheelhouse as wh
+
+    root = _wheelhouse_dir(dir_path, config_path)
+    lines = [
+        line.split(" #", 1)[0].strip()
+        for line in Path(requirements_file).read_text().splitlines()
+    ]
+    missing = wh.missing_requirements([line for line in lines if line and not line.startswith("#")], root)
+    if missing:
+        console.print(f"[red bold]Missing from {root}:[/red bold]")
+        for entry in missing:
+            console.print(f"  [red]- {entry}[/red]")
+        sys.exit(1)
+    console.print(f"[green]✓[/green] {root} satisfies {requirements_file}")
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,88 @@
+"""Cross-run cache of Stage 4 component results.
+
+Rebuilding from a design file after tweaking one requirement used to
+regenerate every component, though most saw byte-identical inputs.  A
+component's result (LLD, files, review) is now stored under a hash of the
+inputs that determine it:
+
+- exactly what its prompts are given: the component dict and its spec
+  and HLD slices (see :mod:`summon.context_slice`);
+- the actual signatures of its generated dependencies, so a dependency
+  that came out differently invalidates its dependents;
+- the language, the models for the LLD/coder/reviewer roles and the
+  prompt templates.
+
+A hit replays the stored result without any LLM call.  Only approved
+results are stored.  When the implementation gate rejects Stage 4, its
+retry skips the cache and evicts the entries the rejected attempt used.
+Set ``regenerate_components`` (``--force-regenerate``) to ignore hits and
+overwrite them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".summon" / "components"
+
+# Bump when the stored entry format changes.
+_FORMAT = 1
+
+
+def component_key(**inputs: Any) -> str:
+    """Stable hash of a component's prompt inputs (any JSON-serializable values)."""
+    payload = json.dumps({"format": _FORMAT, **inputs}, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def _entry_path(key: str, cache_dir: str | Path | None) -> Path:
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return root / key[:2] / f"{key}.json"
+
+
+def load(key: str, cache_dir: str | Path | None = None) -> dict[str, Any] | None:
+    """The stored entry for *key*: ``{lld, files, review}``, or None."""
+    try:
+        entry = json.loads(_entry_path(key, cache_dir).read_text())
+    except (OSError, ValueError):
+        return None
+    if not isinstance(entry, dict) or entry.get("format") != _FORMAT or not entry.get("files"):
+        return None
+    return entry
+
+
+def store(
+    key: str,
+    lld: Any,
+    files: list[dict[str, Any]],
+    review: dict[str, Any],
+    cache_dir: str | Path | None = None,
+) -> None:
+    """Store a component result (written atomically)."""
+    path = _entry_path(key, cache_dir)
+    entry = {"format": _FORMAT, "lld": lld, "files": files, "review": review}
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".tmp-{os.getpid()}-{threading.get_ident()}")
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+    except OSError as exc:
+        logger.warning("Could not store component result %s: %s", key, exc)
+
+
+def evict(key: str, cache_dir: str | Path | None = None) -> None:
+    """Drop the entry for *key*, if any."""
+    try:
+        _entry_path(key, cache_dir).unlink()
+    except FileNotFoundError:
+        pass
+    except OSError as exc:
+        logger.warning("Could not evict component result %s: %s", key, exc)
@@ -0,0 +1,96 @@
+"""Shared, prioritized concurrency limits for LLM-heavy work.
+
+Stage 4 used to start every component subgraph at once; with 25
+components that meant 25 simultaneous LLM conversations, provider rate
+limits, and components finishing in random order.  Work now passes through
+named :class:`PrioritySemaphore` limiters shared by the whole process:
+
+- ``components`` bounds concurrent Stage 4 component subgraphs
+  (``max_parallel_components``);
+- ``llm`` bounds concurrent LLM calls from every agent in every stage
+  (``max_concurrent_llm_calls``).
+
+Waiters are admitted highest priority first (FIFO among equals), so the
+largest components start first — longest-job-first keeps the makespan
+close to the longest single component instead of leaving it for last.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+
+class PrioritySemaphore:
+    """A counting semaphore that admits the highest-priority waiter first.
+
+    A *limit* of 0 or less means unlimited.
+    """
+
+    def __init__(self, limit: int) -> None:
+        self._limit = limit
+        self._in_use = 0
+        self._waiting: list[tuple[float, int]] = []
+        self._tickets = itertools.count()
+        self._cond = threading.Condition()
+        self.peak = 0
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    @limit.setter
+    def limit(self, value: int) -> None:
+        with self._cond:
+            self._limit = value
+            self._cond.notify_all()
+
+    @property
+    def in_use(self) -> int:
+        return self._in_use
+
+    def _has_room(self) -> bool:
+        return self._limit <= 0 or self._in_use < self._limit
+
+    def acquire(self, priority: float = 0.0) -> None:
+        with self._cond:
+            ticket = (-priority, next(self._tickets))
+            heapq.heappush(self._waiting, ticket)
+            while not (self._has_room() and self._waiting[0] == ticket):
+                self._cond.wait()
+            heapq.heappop(self._waiting)
+            self._in_use += 1
+            self.peak = max(self.peak, self._in_use)
+            # The next waiter in line may fit too.
+            self._cond.notify_all()
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_use -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: float = 0.0) -> Iterator[None]:
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+_LIMITERS: dict[str, PrioritySemaphore] = {}
+_LIMITERS_LOCK = threading.Lock()
+
+
+def limiter(name: str, limit: int) -> PrioritySemaphore:
+    """The process-wide limiter called *name*, set to *limit*."""
+    with _LIMITERS_LOCK:
+        sem = _LIMITERS.get(name)
+        if sem is None:
+            sem = _LIMITERS[name] = PrioritySemaphore(limit)
+    if sem.limit != limit:
+        sem.limit = limit
+    return sem
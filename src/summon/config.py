@@ -19,6 +19,40 @@ class QualityThresholds(BaseModel):
     release: float = 0.8
 
 
+class SandboxLimits(BaseModel):
+    """Resource limits for running generated code (tests, imports, acceptance).
+
+    A limit of 0 disables it.  ``processes`` is the number of processes the
+    command may add on top of what the user already runs.
+    """
+    enabled: bool = True
+    address_space_mb: int = 8192
+    cpu_seconds: int = 600
+    open_files: int = 1024
+    processes: int = 256
+    file_size_mb: int = 1024
+    use_cgroup: bool = True
+    # Environment variables passed through to sandboxed commands; everything
+    # else (API keys, tokens, credentials) is scrubbed.
+    env_passthrough: list[str] = Field(default_factory=lambda: [
+        "PATH", "HOME", "LANG", "LC_ALL", "LC_CTYPE", "TERM", "TMPDIR", "TZ",
+        "USER", "LOGNAME", "SHELL", "SYSTEMROOT",
+    ])
+
+
+class PerTestTimeouts(BaseModel):
+    """Deadlines for individual generated tests (see summon.pytest_timeouts).
+
+    A test seen before gets ``multiplier`` times its last duration, clamped
+    to ``[min_seconds, max_seconds]``; a new test gets ``default_seconds``.
+    """
+    enabled: bool = True
+    default_seconds: float = 30.0
+    multiplier: float = 10.0
+    min_seconds: float = 5.0
+    max_seconds: float = 60.0
+
+
 class SummonConfig(BaseModel):
     models: dict[str, str] = Field(default_factory=lambda: {
         "supervisor": "claude-sonnet-4-20250514",
@@ -47,7 +81,34 @@ class SummonConfig(BaseModel):
         "publisher": "gpt-4o-mini",
     })
     quality_thresholds: QualityThresholds = Field(default_factory=QualityThresholds)
+    sandbox: SandboxLimits = Field(default_factory=SandboxLimits)
+    test_timeouts: PerTestTimeouts = Field(default_factory=PerTestTimeouts)
     max_stage_retries: int = 3
+    # Concurrent Stage 4 component subgraphs, largest first (0 = unlimited).
+    max_parallel_components: int = 6
+    # Concurrent LLM calls across all stages (0 = unlimited).
+    max_concurrent_llm_calls: int = 8
+    # Stage 4 components this small (total lines) that pass the static
+    # pre-review checks skip the LLM code review (0 = always review).
+    review_skip_max_lines: int = 150
+    # Stage 4 components whose LLD lists at least this many files are
+    # written one file per (parallel) LLM call (0 = always one call).
+    per_file_min_files: int = 4
+    # Reuse approved Stage 4 component results across runs when the
+    # component's inputs are unchanged (~/.summon/components).
+    component_cache: bool = True
+    # Ignore cached component results and regenerate (--force-regenerate).
+    regenerate_components: bool = False
+    # Parallel pytest workers for Stage 5 test runs (0 = one per CPU core).
+    test_workers: int = 0
+    # Directory of wheels for offline installs (see `summon wheelhouse add`).
+    # Empty means install from the package index.
+    wheelhouse: str = ""
+    # Install dependencies in the background from the SDD and as Stage 4
+    # components write requirements.txt (Python projects, needs uv).
+    prefetch_dependencies: bool = True
+    # Reuse a warm pytest process per workspace across fix iterations.
+    warm_test_server: bool = True
 
     @classmethod
     def load(cls, path: str | Path | None = None) -> SummonConfig:
@@ -68,3 +129,7 @@ class SummonConfig(BaseModel):
     def get_threshold(self, stage: str) -> float:
         """Get quality threshold for a given stage name."""
         return getattr(self.quality_thresholds, stage, 0.7)
+
+    def get_wheelhouse(self) -> str:
+        """Absolute wheelhouse directory, or "" to install from the index."""
+        return str(Path(self.wheelhouse).expanduser().resolve()) if self.wheelhouse else ""
@@ -0,0 +1,114 @@
+"""Per-component slices of the spec and HLD.
+
+A Stage 4 component only needs its own HLD entry, the interfaces of the
+components it depends on, the shared types and the entry point — not
+every other component's description and file list.  Likewise only the
+project-wide parts of the spec and the functional requirements that
+concern the component are specific to it.
+
+Stage 4 sends each component only its slices, which is what the LLD,
+coder and reviewer prompts embed — for large designs the full HLD JSON
+was most of Stage 4's input tokens (:func:`slice_report` estimates the
+savings).  Because the slices are the prompts' inputs they also key the
+cross-run result cache (:mod:`summon.component_cache`): editing one
+requirement only regenerates the components it concerns.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from pathlib import Path
+from typing import Any
+
+from summon.patching import estimate_tokens
+from summon.scheduling import component_id
+from summon.static_checks import interface_names
+
+
+def hld_slice(
+    hld: dict[str, Any], component: dict[str, Any], dependency_ids: list[str],
+) -> dict[str, Any]:
+    """The parts of the HLD a component's prompts need."""
+    components = hld.get("components") or []
+    by_id = {component_id(c, i): c for i, c in enumerate(components)}
+    own = by_id.get(component_id(component), component)
+    dependencies = [
+        {key: by_id[dep].get(key) for key in ("id", "name", "files", "interfaces")}
+        for dep in dependency_ids if dep in by_id
+    ]
+    return {
+        "project_name": hld.get("project_name", ""),
+        "entry_point": hld.get("entry_point", ""),
+        "shared_types": hld.get("shared_types", []),
+        "component": own,
+        "dependencies": dependencies,
+    }
+
+
+def _terms(component: dict[str, Any]) -> set[str]:
+    terms = set()
+    name = str(component.get("name", "")).strip().lower()
+    if name:
+        terms.add(name)
+    for path in component.get("files") or []:
+        stem = Path(str(path)).stem.lower()
+        if len(stem) >= 4 and stem not in ("__init__", "main", "utils", "models"):
+            terms.add(stem.replace("_", " "))
+            terms.add(stem)
+    terms.update(n.lower() for n in interface_names(component.get("interfaces") or []))
+    return terms
+
+
+def _concerns(requirement: Any, component: dict[str, Any]) -> bool:
+    """True if *requirement* mentions *component* or the component cites its id."""
+    text = str(requirement.get("description", "") if isinstance(requirement, dict) else requirement).lower()
+    rid = requirement.get("id") if isinstance(requirement, dict) else None
+    cited = set(re.findall(r"\b[A-Z]+-\d+\b", str(component.get("description", ""))))
+    return rid in cited or any(term in text for term in _terms(component))
+
+
+def spec_slice(
+    spec: dict[str, Any], component: dict[str, Any], components: list[dict[str, Any]] | None = None,
+) -> dict[str, Any]:
+    """The parts of the spec a component's prompts need.
+
+    Everything but the functional requirements is project-wide and kept.
+    A requirement is kept when it mentions the component's name, one of its
+    file names or interfaces, or when the component's description cites its
+    id.  Requirements that concern none of *components* go to every
+    component, so nothing is dropped.
+    """
+    sliced = {key: value for key, value in spec.items() if key != "functional_requirements"}
+    requirements = spec.get("functional_requirements")
+    if requirements is None:
+        return sliced
+    others = [c for c in components or [] if c is not component]
+    sliced["functional_requirements"] = [
+        req for req in requirements
+        if _concerns(req, component) or not any(_concerns(req, other) for other in others)
+    ]
+    return sliced
+
+
+def slice_report(
+    hld: dict[str, Any],
+    components: list[dict[str, Any]],
+    dependencies: dict[str, list[str]],
+) -> dict[str, Any]:
+    """Estimated HLD tokens per prompt, full HLD versus each component's slice."""
+    full = estimate_tokens(json.dumps(hld, indent=2))
+    per_component = {}
+    for index, component in enumerate(components):
+        cid = component_id(component, index)
+        sliced = hld_slice(hld, component, dependencies.get(cid, []))
+        per_component[cid] = estimate_tokens(json.dumps(sliced, indent=2))
+    full_total = full * len(per_component)
+    sliced_total = sum(per_component.values())
+    return {
+        "full_tokens": full,
+        "per_component": per_component,
+        "full_total": full_total,
+        "sliced_total": sliced_total,
+        "saved_pct": round(100 * (1 - sliced_total / full_total), 1) if full_total else 0.0,
+    }
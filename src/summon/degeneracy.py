@@ -0,0 +1,94 @@
+"""Deterministic checks for catastrophically degenerate generated files.
+
+Shared by Stage 4, which checks each component's files as soon as they are
+written, and Stage 5's ``check_degeneracy`` node, which scans the whole
+project before testing.
+"""
+
+from __future__ import annotations
+
+import ast
+from collections import Counter
+
+
+def check_file(path: str, content: str) -> dict[str, str] | None:
+    """Return ``{file, issue, detail}`` if a .py file is degenerate, else None.
+
+    Checks for:
+    1. Repetition: >30% of non-blank lines are duplicates of a single line
+    2. Syntax errors: compile() fails (truncation, unclosed brackets, etc.)
+    3. Stub-only: all function/method bodies are just pass/Ellipsis/raise NotImplementedError
+    """
+    if not path.endswith(".py") or not content.strip():
+        return None
+
+    # Check 1: Repetition — >30% of non-blank lines are the same line
+    lines = [line for line in content.splitlines() if line.strip()]
+    if len(lines) > 10:
+        counts = Counter(lines)
+        top_line, top_count = counts.most_common(1)[0]
+        if top_count / len(lines) > 0.30:
+            return {
+                "file": path,
+                "issue": "repetition",
+                "detail": f"{top_count}/{len(lines)} lines ({top_count*100//len(lines)}%) are: {top_line[:80]}",
+            }
+
+    # Check 2: Syntax errors via compile()
+    try:
+        compile(content, path, "exec")
+    except SyntaxError as exc:
+        return {
+            "file": path,
+            "issue": "syntax_error",
+            "detail": f"{exc.msg} (line {exc.lineno})",
+        }
+
+    # Check 3: Stub-only bodies — all function/method bodies are pass/Ellipsis/raise
+    try:
+        tree = ast.parse(content)
+    except SyntaxError:
+        return None  # already caught above but just in case
+
+    func_defs = [
+        node for node in ast.walk(tree)
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
+    ]
+    if len(func_defs) >= 2:
+        stub_count = sum(1 for func in func_defs if is_stub_body(func.body))
+        if stub_count == len(func_defs):
+            return {
+                "file": path,
+                "issue": "stub_only",
+                "detail": f"All {len(func_defs)} functions have stub-only bodies (pass/Ellipsis/raise NotImplementedError)",
+            }
+    return None
+
+
+def is_stub_body(body: list[ast.stmt]) -> bool:
+    """True if a function body (docstring aside) is only stub statements."""
+    stmts = [
+        s for s in body
+        if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant) and isinstance(s.value.value, str))
+    ]
+    return not stmts or all(is_stub_stmt(s) for s in stmts)
+
+
+def is_stub_stmt(node: ast.stmt) -> bool:
+    """Return True if a statement is a stub: pass, Ellipsis, or raise NotImplementedError."""
+    if isinstance(node, ast.Pass):
+        return True
+    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+        if node.value.value is ...:
+            return True
+    if isinstance(node, ast.Raise):
+        exc = node.exc
+        if exc is not None:
+            # raise NotImplementedError or raise NotImplementedError(...)
+            if isinstance(exc, ast.Name) and exc.id == "NotImplementedError":
+                return True
+            if isinstance(exc, ast.Call):
+                func = exc.func
+                if isinstance(func, ast.Name) and func.id == "NotImplementedError":
+                    return True
+    return False
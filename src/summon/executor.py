@@ -1,10 +1,40 @@
-"""Subprocess runner for tests and builds in the workspace."""
+"""Subprocess runner for tests and builds in the workspace.
+
+Every command runs in its own process group (session).  On timeout the whole
+group is terminated, and any stragglers left behind after a normal exit
+(servers, forked test workers) are killed too, so generated code can't leak
+processes that hold ports and CPU across fix loops.
+
+stdout/stderr are drained by reader threads into bounded head+tail buffers
+(see :mod:`summon.capture`), so a chatty command can't exhaust memory and
+the end of its output — where errors usually are — survives.  Each result
+carries resource accounting (wall time, CPU time, max RSS) from ``wait4``.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import os
+import signal
 import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any, Iterable
+
+from summon.capture import HeadTailBuffer
+
+if TYPE_CHECKING:
+    from summon.config import SandboxLimits
+
+# Default cap on captured bytes per stream.
+DEFAULT_MAX_OUTPUT = 1_000_000
+
+# Seconds between SIGTERM and SIGKILL when tearing down a process group.
+_KILL_GRACE = 1.0
 
 
 @dataclass
@@ -12,6 +42,12 @@ class ExecResult:
     returncode: int
     stdout: str
     stderr: str
+    timed_out: bool = False
+    wall_time: float = 0.0
+    cpu_time: float = 0.0
+    max_rss_kb: int = 0
+    truncated: bool = False
+    limit_exceeded: str = ""  # sandbox limit hit: memory, cpu_time, processes, ...
 
     @property
     def success(self) -> bool:
@@ -24,45 +60,208 @@ class ExecResult:
             parts.append(self.stdout.strip())
         if self.stderr.strip():
             parts.append(f"STDERR:\n{self.stderr.strip()}")
+        if self.limit_exceeded:
+            parts.append(
+                f"RESOURCE LIMIT EXCEEDED: {self.limit_exceeded} "
+                "(the sandbox stopped this run; look for runaway loops, "
+                "unbounded allocation, leaked files or processes)"
+            )
         return "\n".join(parts) or "(no output)"
 
 
+def _pump(stream: IO[bytes], buffer: HeadTailBuffer) -> None:
+    """Drain *stream* into *buffer* until EOF."""
+    try:
+        for chunk in iter(lambda: stream.read1(65536), b""):
+            buffer.write(chunk)
+    except (OSError, ValueError):
+        pass
+    finally:
+        try:
+            stream.close()
+        except OSError:
+            pass
+
+
+def _wait(pid: int, holder: dict[str, Any]) -> None:
+    """Reap *pid* with wait4 so its resource usage is captured."""
+    try:
+        _, status, rusage = os.wait4(pid, 0)
+        holder["status"] = status
+        holder["rusage"] = rusage
+    except ChildProcessError:
+        holder["status"] = None
+
+
+def _group_alive(pgid: int) -> bool:
+    try:
+        os.killpg(pgid, 0)
+        return True
+    except (ProcessLookupError, PermissionError):
+        return False
+
+
+def _kill_group(pgid: int, grace: float = _KILL_GRACE) -> None:
+    """SIGTERM the process group, then SIGKILL whatever is left after *grace*."""
+    try:
+        os.killpg(pgid, signal.SIGTERM)
+    except (ProcessLookupError, PermissionError):
+        return
+    deadline = time.monotonic() + grace
+    while time.monotonic() < deadline:
+        if not _group_alive(pgid):
+            return
+        time.sleep(0.05)
+    try:
+        os.killpg(pgid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def _max_rss_kb(rusage: Any) -> int:
+    # ru_maxrss is kilobytes on Linux, bytes on macOS.
+    if sys.platform == "darwin":
+        return int(rusage.ru_maxrss) // 1024
+    return int(rusage.ru_maxrss)
+
+
 def run_command(
     cmd: str | list[str],
     cwd: str | Path,
     timeout: int = 120,
     env: dict[str, str] | None = None,
+    max_output: int = DEFAULT_MAX_OUTPUT,
+    sandbox: SandboxLimits | None = None,
 ) -> ExecResult:
-    """Run a shell command in the given directory."""
+    """Run a shell command in the given directory.
+
+    The command runs in a new process group with stdin closed.  If it runs
+    longer than *timeout* seconds, the whole group is killed and the partial
+    output is returned with ``timed_out=True``.  At most *max_output* bytes
+    of each stream are kept: the first quarter and the most recent rest.
+
+    With *sandbox* (and ``sandbox.enabled``), the command runs under rlimits,
+    in a transient cgroup when one can be created, with a scrubbed
+    environment; a limit breach is reported in ``limit_exceeded``.
+    """
+    cgroup = None
+    if sandbox is not None and sandbox.enabled:
+        from summon.sandbox import Cgroup, rlimits_for, scrub_env, wrap_command
+
+        cgroup = Cgroup.create(sandbox) if sandbox.use_cgroup else None
+        spec = {
+            "rlimits": rlimits_for(sandbox),
+            "cgroup": str(cgroup.path) if cgroup else "",
+        }
+        cmd = wrap_command(cmd, spec)
+        env = scrub_env(env, sandbox)
+
     if isinstance(cmd, str):
         shell = True
     else:
         shell = False
 
+    start = time.monotonic()
     try:
-        result = subprocess.run(
+        proc = subprocess.Popen(
             cmd,
             cwd=str(cwd),
-            capture_output=True,
-            text=True,
-            timeout=timeout,
             shell=shell,
             env=env,
-        )
-        return ExecResult(
-            returncode=result.returncode,
-            stdout=result.stdout,
-            stderr=result.stderr,
-        )
-    except subprocess.TimeoutExpired:
-        return ExecResult(
-            returncode=-1,
-            stdout="",
-            stderr=f"Command timed out after {timeout}s",
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            start_new_session=True,
         )
     except Exception as e:
+        if cgroup is not None:
+            cgroup.remove()
         return ExecResult(
             returncode=-1,
             stdout="",
             stderr=str(e),
         )
+
+    out_buf = HeadTailBuffer(max_output)
+    err_buf = HeadTailBuffer(max_output)
+    readers = [
+        threading.Thread(target=_pump, args=(proc.stdout, out_buf), daemon=True),
+        threading.Thread(target=_pump, args=(proc.stderr, err_buf), daemon=True),
+    ]
+    for reader in readers:
+        reader.start()
+
+    holder: dict[str, Any] = {}
+    waiter = threading.Thread(target=_wait, args=(proc.pid, holder), daemon=True)
+    waiter.start()
+    waiter.join(timeout)
+
+    timed_out = waiter.is_alive()
+    # Tear down the group either way: on timeout to stop the command, after a
+    # normal exit to kill stragglers that would otherwise hold the pipes open.
+    _kill_group(proc.pid, grace=_KILL_GRACE if timed_out else 0.0)
+    waiter.join()
+    for reader in readers:
+        reader.join(timeout=5)
+
+    status = holder.get("status")
+    returncode = os.waitstatus_to_exitcode(status) if status is not None else -1
+    proc.returncode = returncode  # already reaped by wait4
+
+    rusage = holder.get("rusage")
+    stdout = out_buf.getvalue()
+    stderr = err_buf.getvalue()
+
+    limit_exceeded = ""
+    if sandbox is not None and sandbox.enabled:
+        from summon.sandbox import detect_breach
+
+        events = cgroup.events() if cgroup is not None else {}
+        if cgroup is not None:
+            cgroup.remove()
+        limit_exceeded = detect_breach(
+            returncode, stdout + "\n" + stderr, timed_out=timed_out, cgroup_events=events,
+            rlimits=spec["rlimits"],
+        )
+
+    if timed_out:
+        returncode = -1
+        stderr = (stderr + "\n" if stderr.strip() else "") + f"Command timed out after {timeout}s"
+
+    return ExecResult(
+        returncode=returncode,
+        stdout=stdout,
+        stderr=stderr,
+        timed_out=timed_out,
+        wall_time=time.monotonic() - start,
+        cpu_time=(rusage.ru_utime + rusage.ru_stime) if rusage else 0.0,
+        max_rss_kb=_max_rss_kb(rusage) if rusage else 0,
+        truncated=bool(out_buf.dropped or err_buf.dropped),
+        limit_exceeded=limit_exceeded,
+    )
+
+
+async def run_command_async(
+    cmd: str | list[str],
+    cwd: str | Path,
+    **kwargs: Any,
+) -> ExecResult:
+    """Async wrapper around :func:`run_command` (runs in a worker thread)."""
+    return await asyncio.to_thread(run_command, cmd, cwd, **kwargs)
+
+
+def run_commands(
+    jobs: Iterable[dict[str, Any]],
+    max_workers: int | None = None,
+) -> list[ExecResult]:
+    """Run several commands concurrently.
+
+    Each job is a dict of :func:`run_command` keyword arguments.  Results
+    are returned in job order.  *max_workers* defaults to the CPU count.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return []
+    workers = max(1, min(max_workers or os.cpu_count() or 1, len(jobs)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(lambda job: run_command(**job), jobs))
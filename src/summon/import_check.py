@@ -0,0 +1,199 @@
+"""Single-interpreter import validation for generated Python projects.
+
+Spawning ``python -c "import X"`` per module costs one interpreter startup
+plus one import of every heavy third-party dependency for each of the
+project's modules, on every import-fix loop.  Instead, one subprocess runs
+:data:`_VALIDATOR`: it pre-imports the project's third-party dependencies
+once (the warm parent), then forks a child per project module so each
+import runs in isolation, and prints structured per-module results as JSON.
+Platforms without ``fork`` fall back to importing in-process and resetting
+``sys.modules`` between modules.
+"""
+
+from __future__ import annotations
+
+import ast
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from summon.executor import ExecResult, run_command
+from summon.repomap import module_name
+
+# Prefix of the stdout line carrying the JSON results.
+_RESULT_MARKER = "__SUMMON_IMPORT_RESULTS__"
+
+_VALIDATOR = r'''
+import importlib, json, os, signal, sys, traceback
+
+modules = json.loads(sys.argv[1])
+preload = json.loads(sys.argv[2])
+per_module_timeout = int(sys.argv[3])
+MARKER = sys.argv[4]
+
+for name in preload:
+    try:
+        importlib.import_module(name)
+    except BaseException:
+        pass
+
+
+def _check(name):
+    try:
+        importlib.import_module(name)
+        return {"module": name, "ok": True}
+    except BaseException as exc:
+        return {
+            "module": name,
+            "ok": False,
+            "error": "%s: %s" % (type(exc).__name__, exc),
+            "traceback": traceback.format_exc(),
+        }
+
+
+def _timeout(signum, frame):
+    raise TimeoutError("import did not finish within %ds" % per_module_timeout)
+
+
+results = []
+sys.stdout.flush()
+for name in modules:
+    if hasattr(os, "fork"):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            signal.signal(signal.SIGALRM, _timeout)
+            signal.alarm(per_module_timeout)
+            payload = json.dumps(_check(name)).encode()
+            signal.alarm(0)
+            with os.fdopen(write_fd, "wb") as out:
+                out.write(payload)
+            os._exit(0)
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as inp:
+            data = inp.read()
+        _, status = os.waitpid(pid, 0)
+        try:
+            results.append(json.loads(data))
+        except ValueError:
+            results.append({
+                "module": name,
+                "ok": False,
+                "error": "interpreter crashed while importing (exit status %d)"
+                         % os.waitstatus_to_exitcode(status),
+                "traceback": "",
+            })
+    else:
+        before = set(sys.modules)
+        results.append(_check(name))
+        for key in set(sys.modules) - before:
+            del sys.modules[key]
+
+sys.stdout.flush()
+print(MARKER + json.dumps(results))
+'''
+
+
+# Directories that never hold project modules.
+_NON_PROJECT_DIRS = {".venv", ".summon", ".git", "__pycache__", "node_modules"}
+
+
+def local_module_names(workspace_path: str | Path) -> set[str]:
+    """Every top-level name a workspace module could be imported under.
+
+    Both the workspace and ``src/`` are importable roots, and pytest puts
+    test directories on ``sys.path`` too, so each directory and module stem
+    of every project file counts as local.
+    """
+    root = Path(workspace_path)
+    names: set[str] = set()
+    for path in root.rglob("*.py"):
+        parts = path.relative_to(root).with_suffix("").parts
+        if _NON_PROJECT_DIRS.intersection(parts):
+            continue
+        names.update(part for part in parts if part != "__init__")
+    return names
+
+
+def third_party_imports(workspace_path: str | Path, files: list[str]) -> list[str]:
+    """Top-level modules imported by *files* that are neither stdlib nor local.
+
+    These are pre-imported once in the validator's warm parent so each
+    forked child doesn't pay for them again.  Anything the workspace itself
+    provides is left out, so no project module is ever preloaded.
+    """
+    root = Path(workspace_path)
+    local = local_module_names(root)
+    local.update(Path(f).parts[0].removesuffix(".py") for f in files)
+    found: set[str] = set()
+    for f in files:
+        try:
+            tree = ast.parse((root / f).read_text())
+        except (OSError, SyntaxError, ValueError):
+            continue
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                found.update(alias.name.split(".")[0] for alias in node.names)
+            elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                found.add(node.module.split(".")[0])
+    stdlib = set(sys.stdlib_module_names)
+    return sorted(name for name in found if name not in stdlib and name not in local)
+
+
+def parse_results(result: ExecResult, modules: list[str]) -> list[dict[str, Any]]:
+    """Extract per-module results from the validator's output.
+
+    If the validator itself failed (no result line), every module is
+    reported with the validator's output as the error.
+    """
+    for line in reversed(result.stdout.splitlines()):
+        if line.startswith(_RESULT_MARKER):
+            try:
+                return json.loads(line[len(_RESULT_MARKER):])
+            except json.JSONDecodeError:
+                break
+    return [
+        {"module": m, "ok": False, "error": "import validator failed", "traceback": result.output}
+        for m in modules
+    ]
+
+
+def validate_modules(
+    python_cmd: str,
+    workspace_path: str | Path,
+    files: list[str],
+    env: dict[str, str] | None = None,
+    per_module_timeout: int = 30,
+    **run_kwargs: Any,
+) -> list[dict[str, Any]]:
+    """Import every module in *files* in isolation using one subprocess.
+
+    Returns one ``{"module", "ok", "error", "traceback"}`` dict per file,
+    in order.  Extra keyword arguments are passed to :func:`run_command`.
+    """
+    modules = [module_name(f) for f in files]
+    if not modules:
+        return []
+    preload = third_party_imports(workspace_path, files)
+    timeout = min(per_module_timeout * len(modules) + 30, 600)
+    result = run_command(
+        [
+            python_cmd, "-c", _VALIDATOR,
+            json.dumps(modules), json.dumps(preload),
+            str(per_module_timeout), _RESULT_MARKER,
+        ],
+        cwd=workspace_path,
+        timeout=timeout,
+        env=env,
+        **run_kwargs,
+    )
+    results = parse_results(result, modules)
+    for entry, path in zip(results, files):
+        entry["file"] = path
+    if result.limit_exceeded:
+        for entry in results:
+            if not entry.get("ok"):
+                entry["error"] += f" [resource limit exceeded: {result.limit_exceeded}]"
+    return results
@@ -0,0 +1,542 @@
+"""Static import resolution for generated Python projects.
+
+Most Stage 5 import failures are mechanical: ``from src.x import ...`` in a
+flat project, a name imported from the wrong sibling module, or a package
+directory without ``__init__.py``.  This module resolves every ``import`` /
+``from ... import`` in the workspace against:
+
+- the workspace's own module symbol tables (top-level definitions, imports,
+  submodules of packages),
+- the standard library, and
+- the top-level names installed in the workspace's ``.venv``.
+
+It runs in milliseconds.  Unresolved names are reported directly; modules
+that depend on anything it can't fully vouch for (third-party packages,
+star imports, module ``__getattr__``, stdlib names it can't confirm,
+circular imports) are marked *ambiguous*.  Mechanical mistakes come with
+deterministic rewrites so the LLM import fixer can be skipped entirely.
+
+The analysis is not a substitute for importing: it can't see module-level
+runtime errors, so Stage 5 still imports every module
+(:mod:`summon.import_check`) after applying the rewrites.
+"""
+
+from __future__ import annotations
+
+import ast
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from summon.repomap import module_name
+from summon.scheduling import strongly_connected
+from summon.workspace import Workspace
+
+_STDLIB = frozenset(sys.stdlib_module_names) | {"__future__"}
+
+# .pth files that ship with every venv and don't add importable names.
+_STANDARD_PTH = {"distutils-precedence.pth", "_virtualenv.pth"}
+
+
+@dataclass
+class ModuleInfo:
+    """Symbol table for one workspace module."""
+    name: str
+    path: str
+    is_package: bool
+    defined: set[str] = field(default_factory=set)   # classes, functions, assignments
+    imported: set[str] = field(default_factory=set)  # names bound by imports
+    dynamic: bool = False  # star import or module-level __getattr__
+    tree: ast.Module | None = None
+    syntax_error: str = ""
+
+    @property
+    def names(self) -> set[str]:
+        return self.defined | self.imported
+
+
+@dataclass
+class Rewrite:
+    """A deterministic fix for one import statement."""
+    file: str
+    line: int
+    end_line: int
+    new_text: str
+    reason: str
+
+
+@dataclass
+class ImportAnalysis:
+    unresolved: list[dict[str, str | int]] = field(default_factory=list)
+    rewrites: list[Rewrite] = field(default_factory=list)
+    missing_inits: list[str] = field(default_factory=list)
+    ambiguous: set[str] = field(default_factory=set)  # files needing dynamic validation
+
+    @property
+    def has_fixes(self) -> bool:
+        return bool(self.rewrites or self.missing_inits)
+
+
+# ---------------------------------------------------------------------------
+# Symbol tables
+# ---------------------------------------------------------------------------
+
+
+def _bind_targets(target: ast.expr, names: set[str]) -> None:
+    if isinstance(target, ast.Name):
+        names.add(target.id)
+    elif isinstance(target, (ast.Tuple, ast.List)):
+        for elt in target.elts:
+            _bind_targets(elt, names)
+
+
+def _collect_names(body: list[ast.stmt], info: ModuleInfo) -> None:
+    """Record names bound at module level, descending into if/try/with blocks."""
+    for node in body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            info.defined.add(node.name)
+            if node.name == "__getattr__" and not isinstance(node, ast.ClassDef):
+                info.dynamic = True
+        elif isinstance(node, ast.Assign):
+            for target in node.targets:
+                _bind_targets(target, info.defined)
+        elif isinstance(node, (ast.AnnAssign, ast.AugAssign)):
+            _bind_targets(node.target, info.defined)
+        elif isinstance(node, ast.Import):
+            for alias in node.names:
+                info.imported.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, ast.ImportFrom):
+            for alias in node.names:
+                if alias.name == "*":
+                    info.dynamic = True
+                else:
+                    info.imported.add(alias.asname or alias.name)
+        elif isinstance(node, (ast.If, ast.Try, ast.With, ast.AsyncWith, ast.For, ast.While)):
+            for child in ("body", "orelse", "finalbody"):
+                _collect_names(getattr(node, child, []) or [], info)
+            for handler in getattr(node, "handlers", []) or []:
+                _collect_names(handler.body, info)
+
+
+def build_symbol_tables(ws: Workspace, files: list[str]) -> dict[str, ModuleInfo]:
+    """Parse every ``.py`` file in *files* into a :class:`ModuleInfo`."""
+    modules: dict[str, ModuleInfo] = {}
+    for path in files:
+        if not path.endswith(".py"):
+            continue
+        info = ModuleInfo(
+            name=module_name(path), path=path, is_package=path.endswith("__init__.py"),
+        )
+        try:
+            info.tree = ast.parse(ws.read_file(path))
+            _collect_names(info.tree.body, info)
+        except SyntaxError as exc:
+            info.syntax_error = f"{exc.msg} (line {exc.lineno})"
+        except (OSError, ValueError):
+            continue
+        modules[info.name] = info
+    return modules
+
+
+def _namespace_packages(files: list[str]) -> set[str]:
+    """Dotted names of every directory that contains .py files."""
+    packages: set[str] = set()
+    for path in files:
+        parts = Path(path).parts[:-1]
+        for i in range(1, len(parts) + 1):
+            packages.add(".".join(parts[:i]))
+    return packages
+
+
+def installed_top_levels(workspace_path: str | Path) -> set[str] | None:
+    """Top-level importable names in the workspace venv.
+
+    Returns None when there is no venv, or when it contains custom ``.pth``
+    files (editable installs) whose importable names can't be listed.
+    """
+    venv = Path(workspace_path) / ".venv"
+    site_dirs = list(venv.glob("lib/python*/site-packages")) + list(venv.glob("Lib/site-packages"))
+    if not site_dirs:
+        return None
+    names: set[str] = set()
+    for site in site_dirs:
+        for entry in site.iterdir():
+            name = entry.name
+            if name.endswith((".dist-info", ".egg-info")):
+                top_level = entry / "top_level.txt"
+                if top_level.is_file():
+                    names.update(line.strip() for line in top_level.read_text().splitlines() if line.strip())
+            elif name.endswith(".pth"):
+                if name not in _STANDARD_PTH:
+                    return None
+            elif name == "__pycache__":
+                continue
+            elif entry.is_dir():
+                names.add(name)
+            elif name.endswith(".py"):
+                names.add(name[:-3])
+            elif name.endswith((".so", ".pyd")):
+                names.add(name.split(".")[0])
+    return names
+
+
+# ---------------------------------------------------------------------------
+# Resolution
+# ---------------------------------------------------------------------------
+
+
+def _guarded_import_lines(tree: ast.Module) -> set[int]:
+    """Line numbers of imports that are allowed to fail.
+
+    Imports inside ``try: ... except ImportError`` blocks and under
+    ``if TYPE_CHECKING:`` are skipped by the analysis.
+    """
+    guarded: set[int] = set()
+    for node in ast.walk(tree):
+        body: list[ast.stmt] = []
+        if isinstance(node, ast.Try):
+            caught = set()
+            for handler in node.handlers:
+                if handler.type is None:
+                    caught.add("ImportError")
+                else:
+                    caught.update(
+                        n.id for n in ast.walk(handler.type) if isinstance(n, ast.Name)
+                    )
+            if caught & {"ImportError", "ModuleNotFoundError", "Exception", "BaseException"}:
+                body = node.body
+        elif isinstance(node, ast.If) and "TYPE_CHECKING" in ast.unparse(node.test):
+            body = node.body
+        for stmt in body:
+            for child in ast.walk(stmt):
+                if isinstance(child, (ast.Import, ast.ImportFrom)):
+                    guarded.add(child.lineno)
+    return guarded
+
+
+def _resolve_relative(info: ModuleInfo, node: ast.ImportFrom) -> str:
+    package = info.name.split(".") if info.is_package else info.name.split(".")[:-1]
+    if node.level > 1:
+        package = package[: len(package) - (node.level - 1)]
+    if node.module:
+        package = package + node.module.split(".")
+    return ".".join(package)
+
+
+def _is_test_module(path: str) -> bool:
+    name = Path(path).name
+    return (
+        path.startswith("tests/") or "/tests/" in path
+        or name.startswith("test_") or name == "conftest.py" or name == "acceptance_test.py"
+    )
+
+
+def _stdlib_provides(module: str, name: str) -> bool:
+    """Whether stdlib *module* is known to provide *name*.
+
+    Only modules already loaded in this process are inspected (importing
+    arbitrary stdlib modules can have side effects); anything else is
+    unknown.
+    """
+    loaded = sys.modules.get(module)
+    if loaded is None:
+        return False
+    return hasattr(loaded, name) or f"{module}.{name}" in sys.modules
+
+
+class _Resolver:
+    def __init__(self, modules: dict[str, ModuleInfo], files: list[str], installed: set[str] | None):
+        self.modules = modules
+        self.packages = _namespace_packages(files) | {m.name for m in modules.values() if m.is_package}
+        self.local_tops = {name.split(".")[0] for name in modules} | {p.split(".")[0] for p in self.packages}
+        self.installed = installed
+
+    def is_local(self, dotted: str) -> bool:
+        return dotted in self.modules or dotted in self.packages
+
+    def kind(self, dotted: str) -> str:
+        """Classify a module: local, stdlib, third_party, missing or unknown."""
+        top = dotted.split(".")[0]
+        if top in self.local_tops:
+            return "local" if self.is_local(dotted) else "missing"
+        if top in _STDLIB:
+            return "stdlib"
+        if self.installed is None:
+            return "unknown"
+        return "third_party" if top in self.installed else "missing"
+
+    def definers(self, name: str) -> list[str]:
+        """Non-test modules defining *name* (candidates for a wrong-sibling rewrite)."""
+        return sorted(
+            m.name for m in self.modules.values()
+            if name in m.defined and not _is_test_module(m.path)
+        )
+
+    def provides(self, dotted: str, name: str) -> bool:
+        info = self.modules.get(dotted)
+        if f"{dotted}.{name}" in self.modules or f"{dotted}.{name}" in self.packages:
+            return True
+        if info is None:
+            return False  # namespace package: only submodules are importable
+        return info.dynamic or name in info.names
+
+
+def _statement_span(source_lines: list[str], node: ast.stmt) -> tuple[str, bool]:
+    """Return (indent, rewritable) for a statement occupying whole lines."""
+    first = source_lines[node.lineno - 1]
+    last = source_lines[(node.end_lineno or node.lineno) - 1]
+    before = first[: node.col_offset]
+    after = last[node.end_col_offset:] if node.end_col_offset is not None else ""
+    rewritable = not before.strip() and (not after.strip() or after.strip().startswith("#"))
+    return before, rewritable
+
+
+def _from_import_text(indent: str, module: str, aliases: list[ast.alias]) -> str:
+    node = ast.ImportFrom(module=module, names=aliases, level=0)
+    return indent + ast.unparse(node)
+
+
+def analyze_imports(
+    ws: Workspace,
+    files: list[str],
+    targets: list[str] | None = None,
+    installed: set[str] | None = None,
+) -> ImportAnalysis:
+    """Statically resolve imports of *targets* (default: all .py *files*).
+
+    *files* is the full set of project files used to build symbol tables;
+    *installed* defaults to :func:`installed_top_levels` of the workspace.
+    """
+    if installed is None:
+        installed = installed_top_levels(ws.path)
+    modules = build_symbol_tables(ws, files)
+    resolver = _Resolver(modules, files, installed)
+    analysis = ImportAnalysis()
+    local_deps: dict[str, set[str]] = {}
+
+    target_files = targets if targets is not None else [f for f in files if f.endswith(".py")]
+    for info in modules.values():
+        if info.path not in target_files:
+            continue
+        deps = local_deps.setdefault(info.path, set())
+        if info.syntax_error:
+            analysis.unresolved.append({
+                "file": info.path, "line": 0, "module": info.name, "name": "",
+                "reason": f"SyntaxError: {info.syntax_error}",
+            })
+            continue
+        if info.dynamic:
+            analysis.ambiguous.add(info.path)
+
+        source_lines = ws.read_file(info.path).splitlines()
+        guarded = _guarded_import_lines(info.tree)
+
+        for node in ast.walk(info.tree):
+            if not isinstance(node, (ast.Import, ast.ImportFrom)) or node.lineno in guarded:
+                continue
+
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    kind = resolver.kind(alias.name)
+                    if kind == "local":
+                        deps.add(alias.name)
+                    elif kind in ("third_party", "unknown"):
+                        analysis.ambiguous.add(info.path)
+                    elif kind == "missing":
+                        analysis.unresolved.append({
+                            "file": info.path, "line": node.lineno, "module": alias.name,
+                            "name": "", "reason": f"No module named '{alias.name}'",
+                        })
+                continue
+
+            target = _resolve_relative(info, node) if node.level else (node.module or "")
+            kind = resolver.kind(target)
+            indent, rewritable = _statement_span(source_lines, node)
+
+            if kind == "missing" and not node.level and target.startswith("src."):
+                stripped = target[len("src."):]
+                if resolver.kind(stripped) == "local" and rewritable:
+                    analysis.rewrites.append(Rewrite(
+                        file=info.path, line=node.lineno, end_line=node.end_lineno or node.lineno,
+                        new_text=_from_import_text(indent, stripped, node.names),
+                        reason=f"'{target}' → '{stripped}' (flat layout, no src package)",
+                    ))
+                    deps.add(stripped)
+                    continue
+
+            if kind in ("third_party", "unknown"):
+                analysis.ambiguous.add(info.path)
+                continue
+            if kind == "stdlib":
+                if not all(_stdlib_provides(target, a.name) for a in node.names if a.name != "*"):
+                    analysis.ambiguous.add(info.path)
+                continue
+            if kind == "missing":
+                analysis.unresolved.append({
+                    "file": info.path, "line": node.lineno, "module": target, "name": "",
+                    "reason": f"No module named '{target}'",
+                })
+                continue
+
+            deps.add(target)
+            target_info = modules.get(target)
+            if target_info is not None and target_info.dynamic:
+                analysis.ambiguous.add(info.path)
+
+            missing = [a for a in node.names if a.name != "*" and not resolver.provides(target, a.name)]
+            if not missing:
+                continue
+
+            # Wrong sibling: each missing name is defined in exactly one other module.
+            moves: dict[str, list[ast.alias]] = {}
+            for alias in missing:
+                homes = [m for m in resolver.definers(alias.name) if m != info.name]
+                if len(homes) == 1:
+                    moves.setdefault(homes[0], []).append(alias)
+                else:
+                    analysis.unresolved.append({
+                        "file": info.path, "line": node.lineno, "module": target,
+                        "name": alias.name,
+                        "reason": f"cannot import name '{alias.name}' from '{target}'"
+                        + (f" (defined in: {', '.join(homes)})" if homes else ""),
+                    })
+            if not moves or not rewritable or node.level:
+                for home, aliases in moves.items():
+                    for alias in aliases:
+                        analysis.unresolved.append({
+                            "file": info.path, "line": node.lineno, "module": target,
+                            "name": alias.name,
+                            "reason": f"cannot import name '{alias.name}' from '{target}' "
+                                      f"(defined in '{home}')",
+                        })
+                continue
+
+            moved = {a.name for aliases in moves.values() for a in aliases}
+            kept = [a for a in node.names if a.name not in moved]
+            lines = [_from_import_text(indent, target, kept)] if kept else []
+            lines += [_from_import_text(indent, home, aliases) for home, aliases in sorted(moves.items())]
+            analysis.rewrites.append(Rewrite(
+                file=info.path, line=node.lineno, end_line=node.end_lineno or node.lineno,
+                new_text="\n".join(lines),
+                reason="; ".join(
+                    f"'{a.name}' is defined in '{home}', not '{target}'"
+                    for home, aliases in sorted(moves.items()) for a in aliases
+                ),
+            ))
+            deps.update(moves)
+
+    # Packages that are imported from but have no __init__.py.
+    imported_packages = {
+        ".".join(dep.split(".")[:i])
+        for deps in local_deps.values() for dep in deps
+        for i in range(1, dep.count(".") + 2)
+    }
+    for pkg in sorted(imported_packages & resolver.packages):
+        if pkg not in modules:
+            analysis.missing_inits.append(pkg.replace(".", "/") + "/__init__.py")
+
+    # Circular imports may fail at import time ("partially initialized module").
+    by_name = {m.name: m.path for m in modules.values()}
+    graph = {
+        path: sorted(by_name[d] for d in deps if d in by_name and by_name[d] in local_deps)
+        for path, deps in local_deps.items()
+    }
+    for scc in strongly_connected(graph):
+        if len(scc) > 1:
+            analysis.ambiguous.update(scc)
+
+    # A module is only statically clean if everything it imports locally is too.
+    changed = True
+    while changed:
+        changed = False
+        for path, deps in local_deps.items():
+            if path in analysis.ambiguous:
+                continue
+            if any(by_name.get(d) in analysis.ambiguous for d in deps):
+                analysis.ambiguous.add(path)
+                changed = True
+
+    return analysis
+
+
+def apply_rewrites(ws: Workspace, analysis: ImportAnalysis) -> list[str]:
+    """Apply deterministic rewrites and create missing ``__init__.py`` files.
+
+    Returns a human-readable line per change.
+    """
+    applied: list[str] = []
+    by_file: dict[str, list[Rewrite]] = {}
+    for rewrite in analysis.rewrites:
+        by_file.setdefault(rewrite.file, []).append(rewrite)
+
+    for path, rewrites in by_file.items():
+        content = ws.read_file(path)
+        lines = content.splitlines()
+        # Bottom-up so earlier line numbers stay valid.
+        for rewrite in sorted(rewrites, key=lambda r: r.line, reverse=True):
+            lines[rewrite.line - 1:rewrite.end_line] = rewrite.new_text.splitlines()
+            applied.append(f"{path}:{rewrite.line}: {rewrite.reason}")
+        ws.write_file(path, "\n".join(lines) + ("\n" if content.endswith("\n") else ""))
+
+    for init in analysis.missing_inits:
+        ws.write_file(init, "")
+        applied.append(f"{init}: created missing package marker")
+    return applied
+
+
+# ---------------------------------------------------------------------------
+# Dependency graph (test impact analysis)
+# ---------------------------------------------------------------------------
+
+
+def dependency_graph(ws: Workspace, files: list[str]) -> dict[str, set[str]]:
+    """Map each ``.py`` file to the workspace files it imports directly.
+
+    Importing ``a.b.c`` also runs ``a/__init__.py`` and ``a/b/__init__.py``,
+    so parent packages count as dependencies.  Modules under ``src/`` are
+    also reachable by their name without the ``src.`` prefix.
+    """
+    modules = build_symbol_tables(ws, files)
+    by_name: dict[str, str] = {}
+    for info in modules.values():
+        by_name[info.name] = info.path
+        if info.name.startswith("src."):
+            by_name.setdefault(info.name[len("src."):], info.path)
+
+    graph: dict[str, set[str]] = {}
+    for info in modules.values():
+        deps = graph.setdefault(info.path, set())
+        if info.tree is None:
+            continue
+        for node in ast.walk(info.tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom):
+                base = _resolve_relative(info, node) if node.level else (node.module or "")
+                names = [base] + [f"{base}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                parts = name.split(".")
+                for i in range(1, len(parts) + 1):
+                    path = by_name.get(".".join(parts[:i]))
+                    if path and path != info.path:
+                        deps.add(path)
+    return graph
+
+
+def impacted_files(graph: dict[str, set[str]], changed: set[str]) -> set[str]:
+    """Files in *graph* that are, or transitively import, any *changed* file."""
+    dependents: dict[str, set[str]] = {}
+    for path, deps in graph.items():
+        for dep in deps:
+            dependents.setdefault(dep, set()).add(path)
+
+    impacted = set(changed)
+    frontier = list(changed)
+    while frontier:
+        for path in dependents.get(frontier.pop(), ()):
+            if path not in impacted:
+                impacted.add(path)
+                frontier.append(path)
+    return impacted
@@ -0,0 +1,205 @@
+"""Structured pytest results from JUnit XML reports.
+
+Deciding pass/fail with regexes like ``\\d+ failed`` over (truncated)
+console text is fragile, and handing the fixer raw console output wastes
+most of its budget on PASSED lines.  Stage 5 runs pytest with
+``--junitxml`` and parses the report into per-test records — node id,
+outcome, duration, failure message and traceback frames — which drive the
+gate decision and are rendered compactly for fixer prompts.  Per-test
+durations are persisted for scheduling test runs.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+from summon.capture import clip_output
+
+# Where per-run artifacts live inside a workspace (ignored by file listings).
+REPORT_DIR = ".summon"
+DURATIONS_FILE = f"{REPORT_DIR}/test_durations.json"
+
+# "path/to/file.py:12: in func" / "path/to/file.py:12: AssertionError"
+_FRAME_RE = re.compile(r"^(?P<file>[^\s:][^:\n]*\.py):(?P<line>\d+):(?: in (?P<func>[\w<>.]+))?", re.MULTILINE)
+
+_FAILING = ("failed", "error")
+
+
+@dataclass
+class TestRecord:
+    nodeid: str
+    outcome: str  # passed, failed, error, skipped
+    duration: float = 0.0
+    message: str = ""
+    frames: list[dict[str, Any]] = field(default_factory=list)  # {file, line, function}
+    details: str = ""  # traceback text from the report
+
+    __test__ = False  # not a pytest test class
+
+    @property
+    def failing(self) -> bool:
+        return self.outcome in _FAILING
+
+
+@dataclass
+class TestReport:
+    records: list[TestRecord] = field(default_factory=list)
+
+    __test__ = False
+
+    def count(self, outcome: str) -> int:
+        return sum(1 for r in self.records if r.outcome == outcome)
+
+    @property
+    def failures(self) -> list[TestRecord]:
+        return [r for r in self.records if r.failing]
+
+    @property
+    def ok(self) -> bool:
+        """True when at least one test ran and none failed or errored."""
+        return bool(self.records) and not self.failures
+
+    @property
+    def durations(self) -> dict[str, float]:
+        return {r.nodeid: r.duration for r in self.records}
+
+    def summary_line(self) -> str:
+        parts = [f"{self.count(o)} {o}" for o in ("passed", "failed", "error", "skipped") if self.count(o)]
+        total = sum(r.duration for r in self.records)
+        return f"{', '.join(parts) or 'no tests ran'} in {total:.2f}s"
+
+    def render(self, budget: int = 4000) -> str:
+        """Render failures compactly for a fixer prompt.
+
+        Each failure gets its node id, message and frames; the remaining
+        budget is shared out for traceback details.
+        """
+        failures = self.failures
+        if not failures:
+            return self.summary_line()
+        header = f"{len(failures)} failing test(s); {self.summary_line()}"
+        blocks = []
+        for r in failures:
+            frames = " <- ".join(
+                f"{f['file']}:{f['line']}" + (f" ({f['function']})" if f.get("function") else "")
+                for f in reversed(r.frames)
+            )
+            block = f"--- {r.nodeid} [{r.outcome}] ---\n{r.message}"
+            if frames:
+                block += f"\nframes: {frames}"
+            blocks.append(block)
+        used = len(header) + sum(len(b) + 2 for b in blocks)
+        per_test = max(0, (budget - used) // len(failures))
+        if per_test > 200:
+            blocks = [
+                f"{b}\n{clip_output(r.details, per_test)}" if r.details else b
+                for b, r in zip(blocks, failures)
+            ]
+        return clip_output("\n\n".join([header, *blocks]), budget)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Compact form for graph state: counts plus failing records."""
+        return {
+            "passed": self.count("passed"),
+            "failed": self.count("failed"),
+            "errors": self.count("error"),
+            "skipped": self.count("skipped"),
+            "failures": [
+                {k: v for k, v in asdict(r).items() if k != "details"} for r in self.failures
+            ],
+        }
+
+
+def _nodeid(case: ET.Element) -> str:
+    """Rebuild the pytest node id from a (xunit1) ``<testcase>``."""
+    name = case.get("name", "")
+    classname = case.get("classname", "")
+    path = case.get("file", "")
+    if not path:
+        # xunit2 has no file attribute; best effort from the dotted classname.
+        parts = classname.split(".")
+        classes = [p for p in parts if p[:1].isupper()]
+        modules = parts[: len(parts) - len(classes)]
+        path = "/".join(modules) + ".py" if modules else ""
+        return "::".join([path, *classes, name]) if path else name
+    if not classname:
+        return path  # collection error: the module itself
+    module = path[:-3].replace("/", ".") if path.endswith(".py") else path
+    rest = classname[len(module) + 1:] if classname.startswith(module + ".") else ""
+    return "::".join([path, *(p for p in rest.split(".") if p), name])
+
+
+def parse_frames(text: str) -> list[dict[str, Any]]:
+    """Extract ``file:line`` frames (outermost first) from a short traceback."""
+    frames = []
+    for m in _FRAME_RE.finditer(text or ""):
+        frames.append({"file": m["file"], "line": int(m["line"]), "function": m["func"] or ""})
+    return frames
+
+
+def parse_junit_xml(text: str) -> TestReport:
+    """Parse a pytest JUnit XML report into a :class:`TestReport`.
+
+    Raises :class:`ValueError` if *text* is not a JUnit report.
+    """
+    try:
+        root = ET.fromstring(text)
+    except ET.ParseError as exc:
+        raise ValueError(f"invalid JUnit XML: {exc}") from exc
+
+    report = TestReport()
+    for case in root.iter("testcase"):
+        outcome, message, details = "passed", "", ""
+        for tag in ("failure", "error", "skipped"):
+            child = case.find(tag)
+            if child is not None:
+                outcome = {"failure": "failed"}.get(tag, tag)
+                message = (child.get("message") or "").strip()
+                details = (child.text or "").strip()
+                break
+        if not message and details:
+            message = details.splitlines()[-1]
+        try:
+            duration = float(case.get("time") or 0.0)
+        except ValueError:
+            duration = 0.0
+        report.records.append(TestRecord(
+            nodeid=_nodeid(case),
+            outcome=outcome,
+            duration=duration,
+            message=clip_output(message, 500),
+            frames=parse_frames(details),
+            details=details,
+        ))
+    return report
+
+
+def load_report(path: str | Path) -> TestReport | None:
+    """Parse the report at *path*, or return None if missing or unreadable."""
+    try:
+        return parse_junit_xml(Path(path).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def load_durations(workspace_path: str | Path) -> dict[str, float]:
+    """Per-test durations recorded by previous runs."""
+    try:
+        data = json.loads((Path(workspace_path) / DURATIONS_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    return {k: float(v) for k, v in data.items()} if isinstance(data, dict) else {}
+
+
+def save_durations(workspace_path: str | Path, report: TestReport) -> None:
+    """Merge *report*'s durations into the workspace's duration history."""
+    durations = load_durations(workspace_path)
+    durations.update(report.durations)
+    path = Path(workspace_path) / DURATIONS_FILE
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(durations, indent=2, sort_keys=True))
@@ -0,0 +1,192 @@
+"""Search/replace edit protocol for Stage 5 fixer agents.
+
+Fixers used to return the complete content of every file they touched, even
+for a one-line import change.  Output tokens are the slowest and most
+expensive part of a fix iteration, so fixers now return small edits instead:
+
+    {"file_path": "models.py", "edits": [{"search": "...", "replace": "..."}]}
+
+Each ``search`` block must match exactly one region of the current file.
+Matching is tried exactly first, then ignoring trailing whitespace, then
+ignoring indentation (the replacement is re-indented to fit).  A fix entry
+may still carry a full ``content`` — used for new files, large rewrites, and
+as the fallback when its edits don't apply.  Files whose edits fail without
+a fallback are left untouched and reported, so the next fixer round can be
+asked for the complete file.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from summon.workspace import Workspace, normalize_file_entry
+
+logger = logging.getLogger(__name__)
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate (~4 characters per token)."""
+    return (len(text) + 3) // 4
+
+
+@dataclass
+class FixReport:
+    """Outcome of applying one round of fixer output to the workspace."""
+    patched: list[str] = field(default_factory=list)
+    replaced: list[str] = field(default_factory=list)
+    failed: list[str] = field(default_factory=list)
+    output_tokens: int = 0
+    full_file_tokens: int = 0
+
+    @property
+    def saved_tokens(self) -> int:
+        return max(self.full_file_tokens - self.output_tokens, 0)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "patched": self.patched,
+            "replaced": self.replaced,
+            "failed": self.failed,
+            "output_tokens": self.output_tokens,
+            "full_file_tokens": self.full_file_tokens,
+            "saved_tokens": self.saved_tokens,
+        }
+
+
+def _normalize_edit(edit: Any) -> tuple[str, str] | None:
+    """Extract (search, replace) from an LLM-produced edit dict."""
+    if not isinstance(edit, dict):
+        return None
+    search = edit.get("search", edit.get("old", edit.get("find")))
+    replace = edit.get("replace", edit.get("new", edit.get("replacement", "")))
+    if search is None:
+        return None
+    return str(search), str(replace or "")
+
+
+def _indent_of(line: str) -> str:
+    return line[: len(line) - len(line.lstrip())]
+
+
+def _find_unique(lines: list[str], needle: list[str], key) -> int | None:
+    """Return the start index of the single window matching *needle*, else None."""
+    target = [key(n) for n in needle]
+    keyed = [key(line) for line in lines]
+    width = len(needle)
+    matches = [
+        i for i in range(len(lines) - width + 1)
+        if keyed[i:i + width] == target
+    ]
+    return matches[0] if len(matches) == 1 else None
+
+
+def _reindent(replace_lines: list[str], search_indent: str, actual_indent: str) -> list[str]:
+    out = []
+    for line in replace_lines:
+        if not line.strip():
+            out.append(line)
+        elif line.startswith(search_indent):
+            out.append(actual_indent + line[len(search_indent):])
+        else:
+            out.append(actual_indent + line.lstrip())
+    return out
+
+
+def apply_edit(content: str, search: str, replace: str) -> str | None:
+    """Apply one search/replace edit.  Returns the new content, or None.
+
+    An empty *search* on an empty file inserts *replace*.  Ambiguous
+    matches (the block appears more than once) never apply.
+    """
+    if not search.strip():
+        return replace if not content.strip() else None
+
+    count = content.count(search)
+    if count == 1:
+        return content.replace(search, replace, 1)
+    if count > 1:
+        return None
+
+    lines = content.splitlines()
+    needle = search.strip("\n").splitlines()
+    replace_lines = replace.strip("\n").splitlines() if replace.strip() else []
+    trailing_newline = content.endswith("\n")
+
+    start = _find_unique(lines, needle, key=str.rstrip)
+    if start is not None:
+        new_lines = lines[:start] + replace_lines + lines[start + len(needle):]
+    else:
+        start = _find_unique(lines, needle, key=str.strip)
+        if start is None:
+            return None
+        first = next((i for i, n in enumerate(needle) if n.strip()), 0)
+        replace_lines = _reindent(
+            replace_lines, _indent_of(needle[first]), _indent_of(lines[start + first]),
+        )
+        new_lines = lines[:start] + replace_lines + lines[start + len(needle):]
+
+    result = "\n".join(new_lines)
+    return result + "\n" if trailing_newline else result
+
+
+def apply_edits(content: str, edits: list[Any]) -> str | None:
+    """Apply all *edits* in order.  Returns None if any edit fails."""
+    for edit in edits:
+        pair = _normalize_edit(edit)
+        if pair is None:
+            return None
+        updated = apply_edit(content, *pair)
+        if updated is None:
+            return None
+        content = updated
+    return content
+
+
+def apply_fixes(ws: Workspace, fixes: list[Any]) -> FixReport:
+    """Apply fixer output (edits or full contents) to the workspace.
+
+    Edits for a file are applied atomically: if any edit fails, the file is
+    left as-is and either the entry's full ``content`` is written instead or
+    the file is reported in :attr:`FixReport.failed`.
+    """
+    report = FixReport()
+
+    for fix in fixes:
+        if not isinstance(fix, dict):
+            continue
+        path, content = normalize_file_entry(fix)
+        if not path:
+            continue
+        edits = fix.get("edits") or fix.get("patches") or []
+
+        if edits and isinstance(edits, list):
+            report.output_tokens += sum(
+                estimate_tokens(str(e.get("search", "")) + str(e.get("replace", "")))
+                for e in edits if isinstance(e, dict)
+            )
+            current = ws.read_file(path) if ws.file_exists(path) else ""
+            updated = apply_edits(current, edits)
+            if updated is not None:
+                ws.write_file(path, updated)
+                report.patched.append(path)
+                report.full_file_tokens += estimate_tokens(updated)
+                continue
+            logger.warning("Edits for %s did not apply cleanly.", path)
+
+        if content:
+            ws.write_file(path, content)
+            report.replaced.append(path)
+            report.output_tokens += estimate_tokens(content)
+            report.full_file_tokens += estimate_tokens(content)
+        elif edits:
+            report.failed.append(path)
+
+    logger.info(
+        "Applied fixes: %d patched, %d replaced, %d failed — ~%d output tokens "
+        "(~%d saved vs full-file output)",
+        len(report.patched), len(report.replaced), len(report.failed),
+        report.output_tokens, report.saved_tokens,
+    )
+    return report
@@ -8,6 +8,7 @@ from typing import Any
 
 from langgraph.graph import StateGraph, END, START
 
+from summon import prefetch
 from summon.config import SummonConfig
 from summon.state import SummonState
 from summon.supervisor import create_gate_node, gate_passed
@@ -59,6 +60,28 @@ def _set_stage(stage_name: str):
     return node
 
 
+def _set_stage_and_prefetch(stage_name: str, config: SummonConfig):
+    """Return a stage-mark node that also starts prefetching SDD dependencies.
+
+    Used for the stages after planning, so installation starts as soon as
+    the SDD is approved (see :mod:`summon.prefetch`).
+    """
+    mark = _set_stage(stage_name)
+
+    def node(state: dict[str, Any]) -> dict[str, Any]:
+        language = state.get("spec", {}).get("language", "python")
+        if config.prefetch_dependencies and language == "python":
+            requirements = prefetch.requirements_from_sdd(
+                state.get("sdd", {}).get("dependencies", []),
+            )
+            prefetch.schedule(
+                state.get("workspace_path", ""), requirements,
+                wheelhouse=config.get_wheelhouse(),
+            )
+        return mark(state)
+    return node
+
+
 def get_checkpointer(run_id: str | None = None):
     """Create a persistent checkpointer for pipeline state.
 
@@ -132,7 +155,10 @@ def build_pipeline(
         else:
             compiled[prefix] = create_func(config).compile()
         mark_name = f"{prefix}_mark"
-        graph.add_node(mark_name, _set_stage(stage_key))
+        if num in (3, 4):
+            graph.add_node(mark_name, _set_stage_and_prefetch(stage_key, config))
+        else:
+            graph.add_node(mark_name, _set_stage(stage_key))
         graph.add_node(prefix, compiled[prefix])
 
         if not skip_gates:
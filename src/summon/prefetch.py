@@ -0,0 +1,224 @@
+"""Background dependency installation for generated Python projects.
+
+Dependencies are known long before Stage 5: the SDD lists them in Stage 2,
+and they become concrete as soon as a Stage 4 component writes
+requirements.txt.  Instead of leaving the whole install on the critical
+path after integration, a prefetch job per workspace creates ``.venv`` and
+installs requirements in a background thread while design and code
+generation run, picking up new requirements as they are scheduled.
+
+``install_deps`` then calls :func:`finish` and only reconciles the delta
+between what was prefetched and the final requirements.txt.  Prefetching
+is best effort: failed installs are logged and left to ``install_deps``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import re
+import shutil
+import sys
+import threading
+from pathlib import Path
+
+from summon.capture import clip_output
+from summon.executor import run_command
+from summon.venv_cache import MARKER
+from summon.wheelhouse import install_args
+
+logger = logging.getLogger(__name__)
+
+# Written into a prefetched venv: JSON list of the requirements installed.
+PREFETCH_MARKER = ".summon-prefetch"
+
+# A leading requirement: name, optional extras, optional version specifiers.
+_REQUIREMENT_RE = re.compile(
+    r"^\s*([A-Za-z0-9][A-Za-z0-9._-]*)(\[[A-Za-z0-9._,\s-]*\])?"
+    r"\s*((?:(?:===|==|!=|~=|>=|<=|>|<)\s*[A-Za-z0-9.*+!_-]+\s*,?\s*)*)"
+)
+
+_NOT_PACKAGES = {"python", "python3", "pip"}
+
+
+def _canonical(name: str) -> str:
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+def requirement_name(line: str) -> str:
+    """PEP 503 name of a requirement line, or ``""`` if it has none."""
+    match = _REQUIREMENT_RE.match(line)
+    return _canonical(match.group(1)) if match else ""
+
+
+def requirements_from_sdd(dependencies: list[str]) -> list[str]:
+    """Installable requirements from the SDD's free-form dependency list.
+
+    Entries like ``"FastAPI (web framework)"`` or ``"requests>=2.31 for
+    HTTP"`` are reduced to their leading requirement; standard-library
+    modules are dropped.
+    """
+    stdlib = {_canonical(name) for name in getattr(sys, "stdlib_module_names", ())}
+    requirements: list[str] = []
+    seen: set[str] = set()
+    for entry in dependencies:
+        match = _REQUIREMENT_RE.match(str(entry))
+        if not match:
+            continue
+        name = _canonical(match.group(1))
+        if name in stdlib or name in _NOT_PACKAGES or name in seen:
+            continue
+        seen.add(name)
+        spec = re.sub(r"\s+", "", match.group(3) or "").rstrip(",")
+        requirements.append(name + (match.group(2) or "").replace(" ", "") + spec)
+    return requirements
+
+
+def requirements_from_text(text: str) -> list[str]:
+    """Plain requirement lines from requirements.txt (options and paths skipped)."""
+    lines = []
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].strip()
+        if line and not line.startswith(("#", "-", ".", "/")) and "://" not in line:
+            lines.append(line)
+    return lines
+
+
+def prefetched(venv_dir: str | Path) -> list[str] | None:
+    """Requirements installed into *venv_dir* by a prefetch job, or None."""
+    try:
+        data = json.loads((Path(venv_dir) / PREFETCH_MARKER).read_text())
+    except (OSError, ValueError):
+        return None
+    return [str(line) for line in data] if isinstance(data, list) else None
+
+
+class _Job:
+    """Installs requirements into one workspace's ``.venv`` as they arrive."""
+
+    def __init__(self, workspace_path: str, uv: str, wheelhouse: str = "") -> None:
+        self.workspace_path = workspace_path
+        self.venv_dir = Path(workspace_path) / ".venv"
+        self.uv = uv
+        self.offline = install_args(wheelhouse) if wheelhouse else []
+        self.wanted: list[str] = []
+        self.done: set[str] = set(prefetched(self.venv_dir) or [])
+        self.failed: set[str] = set()
+        self.closed = False
+        self.cond = threading.Condition()
+        self.thread = threading.Thread(
+            target=self._run, name=f"prefetch-{Path(workspace_path).name}", daemon=True,
+        )
+
+    def request(self, requirements: list[str]) -> None:
+        with self.cond:
+            new = [r for r in requirements if r not in self.wanted]
+            if new:
+                self.wanted += new
+                self.cond.notify()
+
+    def _pending(self) -> list[str]:
+        return [r for r in self.wanted if r not in self.done and r not in self.failed]
+
+    def _run(self) -> None:
+        while True:
+            with self.cond:
+                while not self.closed and not self._pending():
+                    self.cond.wait()
+                pending = self._pending()
+                if not pending:
+                    return
+            try:
+                self._install(pending)
+            except Exception:  # noqa: BLE001 — best effort, never kill the pipeline
+                logger.exception("Dependency prefetch failed")
+                with self.cond:
+                    self.failed.update(pending)
+
+    def _pip(self, requirements: list[str]) -> bool:
+        result = run_command(
+            [self.uv, "pip", "install", *self.offline, *requirements,
+             "-p", str(self.venv_dir / "bin" / "python")],
+            cwd=self.workspace_path, timeout=240,
+        )
+        if not result.success:
+            logger.info("Prefetch of %s failed:\n%s", " ".join(requirements), clip_output(result.output, 1000))
+        return result.success
+
+    def _install(self, pending: list[str]) -> None:
+        if not (self.venv_dir / "bin" / "python").exists():
+            created = run_command(
+                [self.uv, "venv", str(self.venv_dir), *self.offline[:1]],
+                cwd=self.workspace_path, timeout=60,
+            )
+            if not created.success:
+                with self.cond:
+                    self.failed.update(pending)
+                return
+            pending = [*pending, "pytest"] if "pytest" not in self.done else pending
+
+        if self._pip(pending):
+            ok, bad = pending, []
+        else:
+            # One unknown name fails the whole batch; salvage the rest.
+            ok = [r for r in pending if self._pip([r])]
+            bad = [r for r in pending if r not in ok]
+        with self.cond:
+            self.done.update(ok)
+            self.failed.update(bad)
+            (self.venv_dir / PREFETCH_MARKER).write_text(json.dumps(sorted(self.done)))
+        logger.info("Prefetched %d requirement(s) into %s", len(ok), self.venv_dir)
+
+
+_JOBS: dict[str, _Job] = {}
+_JOBS_LOCK = threading.Lock()
+
+
+def schedule(
+    workspace_path: str,
+    requirements: list[str],
+    uv: str | None = None,
+    wheelhouse: str = "",
+) -> bool:
+    """Install *requirements* into the workspace venv in the background.
+
+    Starts a job for the workspace on first use; later calls add to it.
+    With a *wheelhouse*, installs run offline from it.
+    Returns False (and does nothing) without uv, or when ``.venv`` already
+    exists and wasn't created by a prefetch job — e.g. a venv cloned from
+    :mod:`summon.venv_cache`, which must not be modified in place.
+    """
+    uv = uv or shutil.which("uv")
+    if not uv or not workspace_path or not requirements:
+        return False
+    key = str(Path(workspace_path).resolve())
+    with _JOBS_LOCK:
+        job = _JOBS.get(key)
+        if job is None or job.closed:
+            venv_dir = Path(key) / ".venv"
+            if venv_dir.exists() and ((venv_dir / MARKER).exists() or prefetched(venv_dir) is None):
+                return False
+            job = _Job(key, uv, wheelhouse)
+            _JOBS[key] = job
+            job.thread.start()
+    job.request(requirements)
+    return True
+
+
+def finish(workspace_path: str, timeout: float | None = None) -> list[str] | None:
+    """Stop accepting requirements and wait for the workspace's job.
+
+    Returns the requirements installed by prefetching (None when nothing
+    was prefetched).
+    """
+    key = str(Path(workspace_path).resolve())
+    with _JOBS_LOCK:
+        job = _JOBS.pop(key, None)
+    if job is not None:
+        with job.cond:
+            job.closed = True
+            job.cond.notify()
+        job.thread.join(timeout)
+        if job.thread.is_alive():
+            logger.warning("Dependency prefetch still running after %ss; continuing", timeout)
+    return prefetched(Path(key) / ".venv")
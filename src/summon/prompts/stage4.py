@@ -9,9 +9,13 @@ Spec:
 Component:
 {component}
 
-Full HLD context:
+HLD context (this component, its direct dependencies, shared types, entry point):
 {hld}
 
+Already-implemented dependencies (actual public signatures — code against these, \
+not the HLD descriptions):
+{dependency_interfaces}
+
 Write a detailed implementation plan covering:
 1. File-by-file breakdown with class/function signatures
 2. Concrete algorithm choices — specify which libraries to use and how
@@ -28,7 +32,16 @@ IMPORTANT CONSTRAINTS:
 - Do NOT redefine types that belong in the shared models.py — import them.
 
 Return as JSON:
-{{"lld_summary": "detailed implementation plan text"}}
+{{
+  "lld_summary": "detailed implementation plan text",
+  "files": [
+    {{"path": "filename.py", "purpose": "what this file does",
+      "signatures": ["class Name(field: type, ...)", "def func(arg: type) -> type"]}}
+  ]
+}}
+
+"files" must list EVERY file of the component with its complete public signatures: \
+the files may be written in parallel, each against this list as the contract.
 """
 
 CODER = """\
@@ -45,9 +58,15 @@ Component:
 Low-Level Design:
 {_lld_result}
 
-HLD context (for interfaces):
+HLD context (this component, its direct dependencies, shared types, entry point):
 {hld}
 
+Already-implemented dependencies (actual public signatures):
+{dependency_interfaces}
+
+Problems static checks found in your previous attempt (fix ALL of them):
+{_static_issues}
+
 Write the FULL implementation for each file in this component.
 
 CRITICAL RULES:
@@ -65,8 +84,10 @@ IMPORT AND STRUCTURE RULES:
 10. Use plain imports: "from models import MyClass", "from downloader import func".
    NEVER use "from src." or package-qualified imports.
 11. Do NOT redefine data classes/types that belong in models.py or another component. \
-    Import them instead. Check the HLD's "shared_types" and other components' interfaces.
+    Import them instead. Check the HLD's "shared_types" and its dependencies' interfaces.
 12. If the HLD says a type is in models.py, import it: "from models import TypeName".
+    When a dependency is listed under "Already-implemented dependencies", import exactly \
+    the names and call them with exactly the signatures shown there.
 13. If the HLD's interfaces list a function like "download_video(url) -> str", \
     you MUST define it as a top-level module function, NOT as a method on a class. \
     Other modules will import it by name: "from downloader import download_video".
@@ -79,6 +100,62 @@ Return as JSON:
 }}
 """
 
+FILE_CODER = """\
+You are a senior software engineer writing ONE file of a component. The component's \
+other files are being written at the same time by other engineers against the same \
+file contract below, so define exactly the signatures the contract gives this file \
+and import what it gives the other files. Write COMPLETE, WORKING code: no \
+placeholders, no stubs, no "TODO" comments, no "pass" bodies.
+
+Spec:
+{spec}
+
+Component:
+{component}
+
+Low-Level Design:
+{_lld_result}
+
+HLD context (this component, its direct dependencies, shared types, entry point):
+{hld}
+
+File contract for the whole component:
+{_file_manifest}
+
+The file you are writing:
+{_file_contract}
+
+Already-implemented dependencies (actual public signatures):
+{dependency_interfaces}
+
+Problems static checks found in the previous attempt of the component (fix those in \
+this file):
+{_static_issues}
+
+CRITICAL RULES:
+1. Every function must contain real, working logic; add type hints and meaningful error handling
+2. Include ALL imports at the top of the file
+3. Follow the spec's language: {language}
+4. Do NOT write tests — those come in Stage 5
+
+IMPORT AND STRUCTURE RULES:
+5. All files go in the project ROOT — no src/ subdirectory, no nested packages.
+6. Use plain imports: "from models import MyClass", "from downloader import func".
+   NEVER use "from src." or package-qualified imports.
+7. Do NOT redefine data classes/types that belong in models.py, another file of this \
+   component or another component. Import them instead. Check the HLD's "shared_types", \
+   its dependencies' interfaces and the file contract.
+8. If the HLD says a type is in models.py, import it: "from models import TypeName".
+    When a dependency is listed under "Already-implemented dependencies", import exactly \
+    the names and call them with exactly the signatures shown there.
+9. If the HLD's interfaces or the contract list a function like "download_video(url) -> str", \
+    you MUST define it as a top-level module function, NOT as a method on a class. \
+    Other modules will import it by name: "from downloader import download_video".
+
+Return as JSON:
+{{"path": "{_file_path}", "content": "full file content"}}
+"""
+
 CODE_REVIEWER = """\
 You are a strict senior code reviewer. Your job is to REJECT code that contains \
 placeholders, stubs, TODO comments, or incomplete implementations.
@@ -92,11 +169,15 @@ Component design:
 Implementation files:
 {_code_result}
 
+Already-implemented dependencies (actual public signatures):
+{dependency_interfaces}
+
 Review STRICTLY for:
 1. COMPLETENESS — Does every function have a real implementation? \
    Any "placeholder", "TODO", "pass", or "NotImplementedError" is an automatic FAIL.
 2. Correctness — Does it actually implement the component's requirements?
-3. Interface compliance — Does it match the HLD interfaces?
+3. Interface compliance — Does it match the HLD interfaces, and does it call its \
+   dependencies with the names and signatures they actually have?
 4. Working imports — Are all imported packages real and used correctly?
 5. Error handling — Are errors caught and reported meaningfully?
 
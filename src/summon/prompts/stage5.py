@@ -1,5 +1,34 @@
 """Prompt templates for Stage 5: Testing."""
 
+# Shared by every fixer prompt — fixers return search/replace edits rather
+# than whole files (see summon.patching).
+_EDIT_FORMAT = """\
+Return JSON with search/replace edits — NOT whole files:
+{{
+  "fixes": [
+    {{
+      "file_path": "path/to/file.py",
+      "edits": [
+        {{"search": "exact lines copied from the current file", "replace": "the new lines"}}
+      ]
+    }},
+    {{"file_path": "path/to/new_file.py", "content": "complete file content"}}
+  ],
+  "explanation": "what was wrong and how you fixed it"
+}}
+
+EDIT RULES:
+- Each "search" must be copied verbatim from the current file and match exactly ONE \
+  place in it. Include a few surrounding lines if needed to make it unique.
+- Keep search blocks small — just the lines that change plus minimal context.
+- Multiple edits to one file are applied in order.
+- Use "content" (the complete file) ONLY for new files, or for files listed below \
+  whose edits failed to apply last round.
+
+Files whose edits failed to apply last round (send complete "content" for these): \
+{patch_failures}
+"""
+
 INTEGRATOR = """\
 You are integrating independently-built components into a cohesive project.
 
@@ -99,17 +128,12 @@ Relevant source files:
 Test file:
 {test_code}
 
-Analyze each failure and produce fixes. Return JSON:
-{{
-  "fixes": [
-    {{"file_path": "path/to/file.py", "content": "complete fixed file content"}}
-  ],
-  "explanation": "what was wrong and how you fixed it"
-}}
+Analyze each failure and produce fixes.
 
 Only change what's needed to make tests pass. Don't alter test expectations \
 unless they contradict the spec.
-"""
+
+""" + _EDIT_FORMAT
 
 IMPORT_FIXER = """\
 You are a Python import debugging expert. The following project files have import errors.
@@ -133,19 +157,10 @@ Diagnose and fix every import error. Common causes:
 5. Duplicate definitions — same class/function defined in multiple files, causing conflicts
 6. Relative vs absolute imports — using "from src.foo import X" when the file is at "foo.py"
 
-For each error, identify the root cause and produce a COMPLETE fixed version of every \
-file that needs changes.
+For each error, identify the root cause and fix every file that needs changes. \
+To add a missing file (e.g. a module or __init__.py), use "content".
 
-Return JSON:
-{{
-  "fixes": [
-    {{"file_path": "path/to/file.py", "content": "complete fixed file content"}}
-  ],
-  "explanation": "what was wrong and how you fixed it"
-}}
-
-Output the COMPLETE content for every file you fix — not just the changed lines.
-"""
+""" + _EDIT_FORMAT
 
 CODE_REGENERATOR = """\
 You are a senior engineer regenerating broken source files from scratch.
@@ -200,7 +215,8 @@ Spec:
 Source code:
 {project_files}
 
-Existing unit tests (DO NOT duplicate these):
+Existing unit tests (DO NOT duplicate these; "(not available)" when they are \
+being written at the same time as yours):
 {test_code}
 
 TASK: Read every function in the source code above and write adversarial tests that \
@@ -227,7 +243,8 @@ Return JSON:
 }}
 
 RULES:
-- Use pytest. Import from the project modules exactly as the existing tests do.
+- Use pytest. Import from the project modules with plain imports \
+  ("from module import name"), exactly as the source files import each other.
 - Each test should have a clear, descriptive name (e.g. test_convert_empty_string_raises).
 - Aim for 15-30 tests. Quality over quantity.
 - Focus on bugs that would bite real users, not contrived scenarios.
@@ -262,20 +279,12 @@ Common fixes to consider:
 - Handle unicode correctly (normalize if needed, don't break multi-byte chars)
 - Validate input types at function boundaries
 
-Return JSON:
-{{
-  "fixes": [
-    {{"file_path": "path/to/file.py", "content": "complete fixed file content"}}
-  ],
-  "explanation": "what was wrong and how you fixed it"
-}}
-
 IMPORTANT:
 - Fix the SOURCE code, not the test assertions (unless a test is clearly wrong).
-- Output the COMPLETE content for every file you fix.
 - Only change what's needed to make adversarial tests pass.
 - Don't break existing unit tests while fixing edge cases.
-"""
+
+""" + _EDIT_FORMAT
 
 ACCEPTANCE_CRITERIA_GENERATOR = """\
 You are a QA engineer. Generate concrete, testable acceptance criteria for this project.
@@ -372,16 +381,8 @@ Acceptance test script:
 Analyze each ACCEPTANCE FAIL and fix the PROJECT SOURCE CODE (not the test script) \
 to make the tests pass.
 
-Return JSON:
-{{
-  "fixes": [
-    {{"file_path": "path/to/file.py", "content": "complete fixed file content"}}
-  ],
-  "explanation": "what was wrong and how you fixed it"
-}}
-
 IMPORTANT:
 - Fix the SOURCE code, not the test assertions (unless an assertion is clearly wrong).
-- Output the COMPLETE content for every file you fix.
 - Only change what's needed to make acceptance tests pass.
-"""
+
+""" + _EDIT_FORMAT
@@ -0,0 +1,340 @@
+"""Warm pytest server reused across Stage 5 fix iterations.
+
+Every ``run_tests`` iteration used to pay for interpreter startup, pytest
+and plugin loading, and importing the project's heavy third-party
+dependencies all over again.  :class:`PytestServer` starts one long-lived
+process per workspace (running :data:`_SERVER` under the workspace venv)
+that imports pytest, its plugins and the project's third-party imports
+once, then listens on a Unix socket.  Each run forks a handler, which
+forks a fresh pytest child in its own process group, enforces the timeout
+and reports the exit status.
+
+Project modules are never imported by the server itself, so every forked
+child imports the current version of each project module — whatever the
+fixer changed since the last iteration — while the dependencies stay warm.
+When the server can't be started or a request fails, callers fall back to
+a plain subprocess.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import signal
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from summon.capture import HeadTailBuffer
+from summon.executor import DEFAULT_MAX_OUTPUT, ExecResult
+from summon.import_check import third_party_imports
+
+if TYPE_CHECKING:
+    from summon.config import SandboxLimits
+
+logger = logging.getLogger(__name__)
+
+# Seconds to wait for the server to import its dependencies and listen.
+_START_TIMEOUT = 60.0
+
+_SERVER = r'''
+import importlib, json, os, signal, socket, sys, time
+
+sock_path = sys.argv[1]
+preload = json.loads(sys.argv[2])
+
+import pytest
+try:
+    from importlib.metadata import entry_points
+    for ep in entry_points(group="pytest11"):
+        try:
+            ep.load()
+        except BaseException:
+            pass
+except BaseException:
+    pass
+for name in preload:
+    try:
+        importlib.import_module(name)
+    except BaseException:
+        pass
+
+# Drop anything a preload dragged in from the workspace so children always
+# import the current project code.
+root = os.getcwd() + os.sep
+venv = os.path.join(root, ".venv") + os.sep
+for name, module in list(sys.modules.items()):
+    path = os.path.abspath(getattr(module, "__file__", None) or "")
+    if path.startswith(root) and not path.startswith(venv):
+        del sys.modules[name]
+
+signal.signal(signal.SIGCHLD, signal.SIG_IGN)  # handlers are never waited for
+
+
+def run_child(request):
+    os.setpgid(0, 0)
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    os.chdir(request["cwd"])
+    fd = os.open(request["output"], os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.dup2(fd, 1)
+    os.dup2(fd, 2)
+    null = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null, 0)
+    sys.argv = ["pytest"] + request["args"]
+    try:
+        code = int(pytest.main(request["args"]))
+    except SystemExit as exc:
+        code = exc.code if isinstance(exc.code, int) else 1
+    except BaseException:
+        import traceback
+        traceback.print_exc()
+        code = 1
+    sys.stdout.flush()
+    sys.stderr.flush()
+    os._exit(code)
+
+
+def handle(conn):
+    signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+    request = json.loads(conn.makefile("r").readline())
+    pid = os.fork()
+    if pid == 0:
+        conn.close()
+        run_child(request)
+    deadline = time.monotonic() + request["timeout"]
+    timed_out = False
+    status = None
+    while status is None:
+        done, raw = os.waitpid(pid, os.WNOHANG)
+        if done:
+            status = raw
+        elif time.monotonic() > deadline:
+            timed_out = True
+            for sig in (signal.SIGTERM, signal.SIGKILL):
+                try:
+                    os.killpg(pid, sig)
+                except OSError:
+                    pass
+                time.sleep(0.5)
+            _, status = os.waitpid(pid, 0)
+        else:
+            time.sleep(0.02)
+    try:
+        os.killpg(pid, signal.SIGKILL)  # stragglers
+    except OSError:
+        pass
+    reply = {"returncode": os.waitstatus_to_exitcode(status), "timed_out": timed_out}
+    conn.sendall((json.dumps(reply) + "\n").encode())
+    conn.close()
+
+
+server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+server.bind(sock_path)
+server.listen(16)
+while True:
+    conn, _ = server.accept()
+    if os.fork() == 0:
+        server.close()
+        try:
+            handle(conn)
+        finally:
+            os._exit(0)
+    conn.close()
+'''
+
+
+def _socket_path(workspace_path: str | Path) -> str:
+    # AF_UNIX paths are limited to ~100 bytes, so not inside the workspace.
+    digest = hashlib.sha1(str(Path(workspace_path).resolve()).encode()).hexdigest()[:12]
+    return os.path.join(tempfile.gettempdir(), f"summon-pytest-{digest}-{os.getpid()}.sock")
+
+
+def environment_key(workspace_path: str | Path, python_cmd: str, env: dict[str, str]) -> str:
+    """Identity of a server: restart when the venv, requirements or env change."""
+    root = Path(workspace_path)
+    parts = [python_cmd, json.dumps(env, sort_keys=True)]
+    for name in (".venv/pyvenv.cfg", "requirements.txt", ".venv/.summon-venv-hash"):
+        try:
+            stat = (root / name).stat()
+            parts.append(f"{name}:{stat.st_mtime_ns}:{stat.st_size}")
+        except OSError:
+            parts.append(f"{name}:-")
+    return hashlib.sha1("\n".join(parts).encode()).hexdigest()
+
+
+class PytestServer:
+    """A warm pytest process for one workspace."""
+
+    def __init__(self, workspace_path: str | Path, python_cmd: str, env: dict[str, str], key: str = ""):
+        self.workspace_path = Path(workspace_path)
+        self.python_cmd = python_cmd
+        self.env = env
+        self.key = key
+        self.socket_path = _socket_path(workspace_path)
+        self.proc: subprocess.Popen[bytes] | None = None
+        self.sandbox: SandboxLimits | None = None
+        self.rlimits: dict[str, tuple[int, int]] = {}
+
+    def start(self, sandbox: SandboxLimits | None = None) -> bool:
+        """Launch the server and wait until it accepts connections."""
+        Path(self.socket_path).unlink(missing_ok=True)
+        self.sandbox = sandbox
+        files = [
+            str(p.relative_to(self.workspace_path))
+            for p in self.workspace_path.rglob("*.py")
+            if ".venv" not in p.parts and ".summon" not in p.parts
+        ]
+        cmd: list[str] = [
+            self.python_cmd, "-c", _SERVER, self.socket_path,
+            json.dumps(third_party_imports(self.workspace_path, files)),
+        ]
+        env = self.env
+        if sandbox is not None and sandbox.enabled:
+            from summon.sandbox import rlimits_for, scrub_env, wrap_command
+
+            self.rlimits = rlimits_for(sandbox)
+            cmd = wrap_command(cmd, {"rlimits": self.rlimits, "cgroup": ""})
+            env = scrub_env(env, sandbox)
+        try:
+            self.proc = subprocess.Popen(
+                cmd, cwd=str(self.workspace_path), env=env,
+                stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                start_new_session=True,
+            )
+        except OSError as exc:
+            logger.debug("Could not start test server: %s", exc)
+            return False
+
+        deadline = time.monotonic() + _START_TIMEOUT
+        while time.monotonic() < deadline:
+            if self.proc.poll() is not None:
+                return False
+            if os.path.exists(self.socket_path):
+                return True
+            time.sleep(0.05)
+        self.stop()
+        return False
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None
+
+    def run(self, args: list[str], timeout: int = 120, max_output: int = DEFAULT_MAX_OUTPUT) -> ExecResult | None:
+        """Run pytest with *args* in a fresh fork; None if the server failed.
+
+        Like :func:`~summon.executor.run_command`, at most *max_output* bytes
+        of output are kept (head and tail).
+        """
+        if not self.alive:
+            return None
+        fd, output = tempfile.mkstemp(prefix="summon-pytest-", suffix=".out")
+        os.close(fd)
+        start = time.monotonic()
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+                conn.settimeout(timeout + 10)
+                conn.connect(self.socket_path)
+                request = {"args": args, "cwd": str(self.workspace_path), "output": output, "timeout": timeout}
+                conn.sendall((json.dumps(request) + "\n").encode())
+                reply = json.loads(conn.makefile("r").readline())
+            buffer = HeadTailBuffer(max_output)
+            with open(output, "rb") as out:
+                for chunk in iter(lambda: out.read(65536), b""):
+                    buffer.write(chunk)
+            text = buffer.getvalue()
+        except (OSError, ValueError) as exc:
+            logger.debug("Test server request failed: %s", exc)
+            return None
+        finally:
+            Path(output).unlink(missing_ok=True)
+
+        timed_out = bool(reply.get("timed_out"))
+        returncode = int(reply.get("returncode", -1))
+        limit_exceeded = ""
+        if self.sandbox is not None and self.sandbox.enabled:
+            from summon.sandbox import detect_breach
+
+            limit_exceeded = detect_breach(returncode, text, timed_out=timed_out, rlimits=self.rlimits)
+        return ExecResult(
+            returncode=-1 if timed_out else returncode,
+            stdout=text,
+            stderr=f"Command timed out after {timeout}s" if timed_out else "",
+            timed_out=timed_out,
+            wall_time=time.monotonic() - start,
+            limit_exceeded=limit_exceeded,
+        )
+
+    def stop(self) -> None:
+        if self.proc is not None:
+            try:
+                os.killpg(self.proc.pid, signal.SIGKILL)  # server and its request handlers
+            except (ProcessLookupError, PermissionError):
+                pass
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                pass
+            self.proc = None
+        Path(self.socket_path).unlink(missing_ok=True)
+
+
+_servers: dict[str, PytestServer] = {}
+_lock = threading.Lock()
+
+
+def get_server(
+    workspace_path: str | Path,
+    python_cmd: str,
+    env: dict[str, str],
+    sandbox: SandboxLimits | None = None,
+) -> PytestServer | None:
+    """Return the warm server for *workspace_path*, (re)starting it as needed.
+
+    Returns None when the platform has no ``fork``/Unix sockets or the
+    server fails to start.
+    """
+    if not hasattr(os, "fork") or not hasattr(socket, "AF_UNIX"):
+        return None
+    key = environment_key(workspace_path, python_cmd, env)
+    path = str(Path(workspace_path).resolve())
+    with _lock:
+        server = _servers.get(path)
+        if server is not None and server.key == key and server.alive:
+            return server
+        if server is not None:
+            server.stop()
+        server = PytestServer(workspace_path, python_cmd, env, key=key)
+        if not server.start(sandbox):
+            logger.info("Warm test server unavailable; running pytest in subprocesses")
+            _servers.pop(path, None)
+            return None
+        _servers[path] = server
+        return server
+
+
+def shutdown_all() -> None:
+    """Stop every warm server (registered to run at exit)."""
+    with _lock:
+        for server in _servers.values():
+            server.stop()
+        _servers.clear()
+
+
+atexit.register(shutdown_all)
+
+
+def run_many(server: PytestServer, jobs: list[dict[str, Any]]) -> list[ExecResult | None]:
+    """Run several ``{"args", "timeout"}`` jobs on *server* concurrently."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if not jobs:
+        return []
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        return list(pool.map(lambda job: server.run(**job), jobs))
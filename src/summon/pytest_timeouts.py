@@ -0,0 +1,196 @@
+"""Per-test timeouts for generated test suites, as a pytest plugin.
+
+A generated test that blocks on stdin, the network or an infinite loop used
+to eat the whole run's timeout, leaving the fixer nothing but "Command timed
+out after 120s".  This module is a pytest plugin that gives every test
+phase (setup, call, teardown) its own deadline:
+
+- at the deadline, ``SIGALRM`` raises :class:`PerTestTimeout` inside the
+  test, so it fails with a traceback pointing at the line where it was
+  blocked (plus the stacks of any other threads) and the suite carries on;
+- if the test doesn't return to the interpreter (a C-level loop), a
+  ``faulthandler`` watchdog dumps every thread's stack to the real stderr
+  and exits the process shortly after.
+
+Deadlines are adaptive: :func:`adaptive_timeouts` scales each test's
+historical duration, clamped to configured bounds.
+
+The plugin runs inside the workspace venv, where summon isn't installed,
+so this file is copied into the workspace (:func:`install_plugin`) and must
+only use the standard library and pytest.
+"""
+
+from __future__ import annotations
+
+import faulthandler
+import json
+import os
+import signal
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterator
+
+# Module name of the plugin inside the workspace (``-p summon_timeouts``).
+PLUGIN_NAME = "summon_timeouts"
+PLUGIN_DIR = ".summon/plugins"
+TIMEOUTS_FILE = ".summon/test_timeouts.json"
+
+# Seconds past a test's deadline before the watchdog gives up on it.
+_HARD_GRACE = 10.0
+
+# The real stderr, saved before pytest's capture redirects fd 2.
+try:
+    _REAL_STDERR: int | None = os.dup(2)
+except OSError:
+    _REAL_STDERR = None
+
+
+class PerTestTimeout(Exception):
+    """Raised inside a test that exceeded its deadline."""
+
+
+# ---------------------------------------------------------------------------
+# Summon side: timeout planning and installation
+# ---------------------------------------------------------------------------
+
+
+def adaptive_timeouts(
+    durations: dict[str, float],
+    default: float,
+    multiplier: float,
+    minimum: float,
+    maximum: float,
+    previous: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Per-test deadlines from historical durations.
+
+    Each known test gets ``multiplier`` times its last duration, clamped to
+    ``[minimum, maximum]``; unknown tests get *default*.  A test whose last
+    duration reached its *previous* deadline timed out — its duration says
+    nothing about how long it should take, so it keeps that deadline.
+    """
+    before = (previous or {}).get("tests", {})
+    tests = {}
+    for nodeid, duration in durations.items():
+        deadline = before.get(nodeid) or (previous or {}).get("default")
+        if deadline and duration >= 0.95 * float(deadline):
+            tests[nodeid] = float(deadline)
+        else:
+            tests[nodeid] = round(min(maximum, max(minimum, duration * multiplier)), 3)
+    return {"default": default, "tests": tests}
+
+
+def load_timeouts(workspace_path: str | Path) -> dict[str, Any]:
+    """Deadlines written for the previous run, if any."""
+    try:
+        data = json.loads((Path(workspace_path) / TIMEOUTS_FILE).read_text())
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def install_plugin(workspace_path: str | Path, timeouts: dict[str, Any]) -> None:
+    """Copy this plugin into the workspace and write its deadlines."""
+    root = Path(workspace_path)
+    target = root / PLUGIN_DIR / f"{PLUGIN_NAME}.py"
+    source = Path(__file__).read_text()
+    target.parent.mkdir(parents=True, exist_ok=True)
+    if not target.exists() or target.read_text() != source:
+        target.write_text(source)
+    (root / TIMEOUTS_FILE).write_text(json.dumps(timeouts, sort_keys=True))
+
+
+# ---------------------------------------------------------------------------
+# pytest side: hooks
+# ---------------------------------------------------------------------------
+
+try:
+    import pytest
+except ImportError:  # imported by summon itself, outside a test run
+    pytest = None  # type: ignore[assignment]
+
+
+def pytest_addoption(parser: Any) -> None:
+    parser.addoption(
+        "--summon-timeouts", default=None,
+        help="JSON file with per-test timeouts ({default, tests: {nodeid: seconds}})",
+    )
+
+
+def pytest_configure(config: Any) -> None:
+    path = config.getoption("--summon-timeouts")
+    settings: dict[str, Any] = {"default": 0, "tests": {}}
+    if path:
+        try:
+            settings.update(json.loads(Path(path).read_text()))
+        except (OSError, ValueError):
+            pass
+    config._summon_timeouts = settings
+
+
+def _timeout_for(item: Any) -> float:
+    settings = getattr(item.config, "_summon_timeouts", {})
+    return float(settings.get("tests", {}).get(item.nodeid) or settings.get("default") or 0)
+
+
+def _other_thread_stacks() -> str:
+    main = threading.main_thread().ident
+    names = {t.ident: t.name for t in threading.enumerate()}
+    stacks = []
+    for ident, frame in sys._current_frames().items():
+        if ident == main:
+            continue
+        stack = "".join(traceback.format_stack(frame))
+        stacks.append(f"Thread {names.get(ident, ident)}:\n{stack}")
+    return ("\n\nOther threads:\n" + "\n".join(stacks)) if stacks else ""
+
+
+@contextmanager
+def _deadline(item: Any, phase: str) -> Iterator[None]:
+    timeout = _timeout_for(item)
+    if (
+        timeout <= 0
+        or not hasattr(signal, "SIGALRM")
+        or threading.current_thread() is not threading.main_thread()
+    ):
+        yield
+        return
+
+    def on_alarm(signum: int, frame: Any) -> None:
+        raise PerTestTimeout(
+            f"{item.nodeid} exceeded its {timeout:g}s timeout during {phase} "
+            f"(the traceback shows where it was blocked){_other_thread_stacks()}"
+        )
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, timeout)
+    if _REAL_STDERR is not None:
+        faulthandler.dump_traceback_later(timeout + _HARD_GRACE, exit=True, file=_REAL_STDERR)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+        if _REAL_STDERR is not None:
+            faulthandler.cancel_dump_traceback_later()
+
+
+if pytest is not None:
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_setup(item: Any) -> Iterator[None]:
+        with _deadline(item, "setup"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_call(item: Any) -> Iterator[None]:
+        with _deadline(item, "call"):
+            yield
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_teardown(item: Any) -> Iterator[None]:
+        with _deadline(item, "teardown"):
+            yield
@@ -0,0 +1,161 @@
+"""AST-derived repository map for files that don't fit in the context budget.
+
+When a prompt can't carry a file in full, the LLM still needs to know what
+the file exports — otherwise it guesses at names and signatures, and the
+guesses turn into import-fix and bug-fix loops.  A repo map is a compact
+outline of each module: imports, constants, classes (with fields and method
+signatures) and top-level function signatures.
+
+Summaries are cached by content hash, so rebuilding the map between loop
+iterations only re-parses files that actually changed.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+
+# Maximum number of cached summaries kept in memory.
+_CACHE_LIMIT = 4096
+
+# content sha1 → summary lines (without the file header)
+_summary_cache: dict[str, str] = {}
+
+# Longest constant value shown before truncation.
+_MAX_VALUE_LEN = 60
+
+
+def content_hash(content: str) -> str:
+    """Return a stable hash of file content."""
+    return hashlib.sha1(content.encode("utf-8", errors="replace")).hexdigest()
+
+
+def _truncate(text: str, limit: int = _MAX_VALUE_LEN) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def _format_args(args: ast.arguments) -> str:
+    try:
+        return ast.unparse(args)
+    except Exception:
+        return "..."
+
+
+def _format_function(node: ast.FunctionDef | ast.AsyncFunctionDef) -> str:
+    prefix = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+    sig = f"{prefix} {node.name}({_format_args(node.args)})"
+    if node.returns is not None:
+        sig += f" -> {ast.unparse(node.returns)}"
+    decorators = [
+        ast.unparse(d) for d in node.decorator_list
+        if isinstance(d, (ast.Name, ast.Attribute))
+    ]
+    if decorators:
+        sig = " ".join(f"@{d}" for d in decorators) + " " + sig
+    return sig
+
+
+def _format_class(node: ast.ClassDef) -> list[str]:
+    bases = [ast.unparse(b) for b in node.bases]
+    header = f"class {node.name}"
+    if bases:
+        header += f"({', '.join(bases)})"
+    lines = [header + ":"]
+
+    for item in node.body:
+        if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+            field = f"{item.target.id}: {ast.unparse(item.annotation)}"
+            if item.value is not None:
+                field += f" = {_truncate(ast.unparse(item.value))}"
+            lines.append(f"    {field}")
+        elif isinstance(item, ast.Assign):
+            names = [t.id for t in item.targets if isinstance(t, ast.Name)]
+            if names:
+                lines.append(f"    {' = '.join(names)} = {_truncate(ast.unparse(item.value))}")
+        elif isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if item.name.startswith("_") and item.name != "__init__":
+                continue
+            lines.append(f"    {_format_function(item)}")
+    return lines
+
+
+def _is_constant_name(name: str) -> bool:
+    return name.isupper() or name == "__all__"
+
+
+def _summarize_tree(tree: ast.Module) -> list[str]:
+    imports: list[str] = []
+    body: list[str] = []
+
+    for node in tree.body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            imports.append(ast.unparse(node))
+        elif isinstance(node, ast.ClassDef):
+            body.extend(_format_class(node))
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            body.append(_format_function(node))
+        elif isinstance(node, ast.Assign):
+            names = [
+                t.id for t in node.targets
+                if isinstance(t, ast.Name) and _is_constant_name(t.id)
+            ]
+            if names:
+                body.append(f"{' = '.join(names)} = {_truncate(ast.unparse(node.value))}")
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+            if _is_constant_name(node.target.id):
+                line = f"{node.target.id}: {ast.unparse(node.annotation)}"
+                if node.value is not None:
+                    line += f" = {_truncate(ast.unparse(node.value))}"
+                body.append(line)
+
+    lines: list[str] = []
+    if imports:
+        lines.append("imports: " + "; ".join(imports))
+    lines.extend(body)
+    return lines
+
+
+def summarize_source(content: str) -> str:
+    """Return a compact outline of a Python module's public surface.
+
+    Results are cached by content hash.  Files that fail to parse get a
+    one-line note instead of an outline.
+    """
+    key = content_hash(content)
+    cached = _summary_cache.get(key)
+    if cached is not None:
+        return cached
+
+    try:
+        tree = ast.parse(content)
+        summary = "\n".join(_summarize_tree(tree)) or "(no public definitions)"
+    except SyntaxError as exc:
+        summary = f"(unparseable: {exc.msg}, line {exc.lineno})"
+
+    if len(_summary_cache) >= _CACHE_LIMIT:
+        # Drop the oldest entry — dicts preserve insertion order.
+        _summary_cache.pop(next(iter(_summary_cache)))
+    _summary_cache[key] = summary
+    return summary
+
+
+def module_name(path: str) -> str:
+    """Convert a workspace-relative file path to a dotted module name."""
+    name = path[:-3] if path.endswith(".py") else path
+    name = name.replace("/", ".")
+    if name.endswith(".__init__"):
+        name = name[: -len(".__init__")]
+    return name
+
+
+def render_map_entry(path: str, content: str) -> str:
+    """Render one repo map entry for *path*."""
+    if not path.endswith(".py"):
+        return f"--- {path} ---"
+    return f"--- {path} (module {module_name(path)}) ---\n{summarize_source(content)}"
+
+
+def clear_cache() -> None:
+    """Drop all cached summaries."""
+    _summary_cache.clear()
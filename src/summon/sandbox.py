@@ -0,0 +1,251 @@
+"""Resource-limited execution for generated code.
+
+Generated projects are untrusted: a runaway test (an allocation loop, a fork
+bomb, a file-descriptor leak) must not take down the machine running a batch
+of summon jobs.  Sandboxed commands get:
+
+- rlimits (address space, CPU seconds, open files, process count, file size),
+  applied by a tiny launcher that ``exec``s the real command — no
+  ``preexec_fn``, which is unsafe with the executor's reader threads;
+- optional cgroup v2 placement (``memory.max``, ``pids.max``) when the
+  current cgroup is delegated to us, silently skipped otherwise;
+- a scrubbed environment: only allow-listed variables survive, so API keys
+  never reach generated code.
+
+When a command dies because of a limit, :func:`detect_breach` names the
+limit so it can be reported to the fixer instead of an opaque crash.
+"""
+
+from __future__ import annotations
+
+import itertools
+import json
+import logging
+import os
+import re
+import signal
+import sys
+from pathlib import Path
+from typing import Any
+
+from summon.config import SandboxLimits
+
+logger = logging.getLogger(__name__)
+
+# Applies rlimits / cgroup placement to itself, then execs the real command.
+_LAUNCHER = """\
+import json, os, resource, sys
+spec = json.loads(sys.argv[1])
+argv = sys.argv[2:]
+if spec.get("cgroup"):
+    try:
+        with open(os.path.join(spec["cgroup"], "cgroup.procs"), "w") as f:
+            f.write(str(os.getpid()))
+    except OSError:
+        pass
+for name, (soft, hard) in spec["rlimits"].items():
+    res = getattr(resource, name, None)
+    if res is None:
+        continue
+    _, cur_hard = resource.getrlimit(res)
+    if cur_hard != resource.RLIM_INFINITY:
+        soft, hard = min(soft, cur_hard), min(hard, cur_hard)
+    try:
+        resource.setrlimit(res, (soft, hard))
+    except (ValueError, OSError):
+        pass
+os.execvp(argv[0], argv)
+"""
+
+_MB = 1024 * 1024
+_cgroup_counter = itertools.count()
+
+_BREACH_PATTERNS = [
+    # MemoryError only as the exception line of a traceback (pytest prefixes
+    # it with "E"), not wherever a test happens to mention it.
+    ("memory", re.compile(
+        r"^(?:E\s+)?MemoryError\b|Cannot allocate memory|std::bad_alloc|out of memory", re.I | re.M,
+    )),
+    ("open_files", re.compile(r"Too many open files|EMFILE")),
+    ("file_size", re.compile(r"File too large|EFBIG")),
+]
+
+# EAGAIN on its own is routine (non-blocking sockets, locks); only a failed
+# fork/spawn under RLIMIT_NPROC is a process-limit breach.
+_FORK_FAILED_RE = re.compile(
+    r"fork: (?:retry: )?Resource temporarily unavailable|can't fork|cannot fork"
+    r"|can't start new thread|pthread_create\b.*(?:failed|EAGAIN)",
+    re.I,
+)
+_SPAWN_FRAME_RE = re.compile(r"\b(?:os\.fork|forkpty|fork_exec|_execute_child|posix_spawnp?|Popen|spawnv\w*)\b")
+_EAGAIN_ERROR_RE = re.compile(r"^\s*(?:BlockingIOError|OSError|RuntimeError): \[Errno 11\]")
+
+
+def _user_process_count() -> int:
+    """Count processes owned by the current user (0 if /proc is unavailable)."""
+    uid = os.getuid()
+    count = 0
+    try:
+        for entry in os.scandir("/proc"):
+            if entry.name.isdigit():
+                try:
+                    if entry.stat().st_uid == uid:
+                        count += 1
+                except OSError:
+                    continue
+    except OSError:
+        return 0
+    return count
+
+
+def rlimits_for(limits: SandboxLimits) -> dict[str, tuple[int, int]]:
+    """Translate :class:`SandboxLimits` into ``{RLIMIT_NAME: (soft, hard)}``."""
+    rlimits: dict[str, tuple[int, int]] = {}
+    if limits.address_space_mb:
+        value = limits.address_space_mb * _MB
+        rlimits["RLIMIT_AS"] = (value, value)
+    if limits.cpu_seconds:
+        # Soft limit sends SIGXCPU; the hard limit is the SIGKILL backstop.
+        rlimits["RLIMIT_CPU"] = (limits.cpu_seconds, limits.cpu_seconds + 5)
+    if limits.open_files:
+        rlimits["RLIMIT_NOFILE"] = (limits.open_files, limits.open_files)
+    if limits.processes:
+        # RLIMIT_NPROC counts every process of the user, not just ours.
+        value = _user_process_count() + limits.processes
+        rlimits["RLIMIT_NPROC"] = (value, value)
+    if limits.file_size_mb:
+        value = limits.file_size_mb * _MB
+        rlimits["RLIMIT_FSIZE"] = (value, value)
+    return rlimits
+
+
+# Toolchain settings that jest and `go test` need behind proxies or with
+# private modules.
+_TOOLCHAIN_ENV = {
+    "PYTHONPATH", "NODE_PATH", "GOPATH", "GOCACHE", "GOMODCACHE", "VIRTUAL_ENV",
+    "GOFLAGS", "GOPROXY", "GOPRIVATE", "GONOPROXY", "GONOSUMDB", "GOSUMDB", "GOINSECURE",
+}
+_TOOLCHAIN_ENV_PREFIXES = ("npm_config_", "NPM_CONFIG_")
+
+
+def scrub_env(env: dict[str, str] | None, limits: SandboxLimits) -> dict[str, str]:
+    """Keep only allow-listed variables plus toolchain settings from *env*."""
+    source = os.environ if env is None else env
+    keep = set(limits.env_passthrough) | _TOOLCHAIN_ENV
+    scrubbed = {k: v for k, v in source.items() if k in keep or k.startswith(_TOOLCHAIN_ENV_PREFIXES)}
+    scrubbed.setdefault("PATH", os.defpath)
+    scrubbed["PYTHONDONTWRITEBYTECODE"] = "1"
+    return scrubbed
+
+
+def wrap_command(cmd: str | list[str], spec: dict[str, Any]) -> list[str]:
+    """Wrap *cmd* in the rlimit launcher."""
+    argv = ["/bin/sh", "-c", cmd] if isinstance(cmd, str) else list(cmd)
+    return [sys.executable, "-c", _LAUNCHER, json.dumps(spec), *argv]
+
+
+class Cgroup:
+    """A transient cgroup v2 child of the current cgroup, if we may create one."""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    @classmethod
+    def create(cls, limits: SandboxLimits) -> Cgroup | None:
+        try:
+            line = Path("/proc/self/cgroup").read_text().strip().splitlines()[0]
+        except (OSError, IndexError):
+            return None
+        if not line.startswith("0::"):
+            return None  # cgroup v1 or hybrid
+        parent = Path("/sys/fs/cgroup") / line[3:].lstrip("/")
+        if not os.access(parent, os.W_OK):
+            return None
+
+        path = parent / f"summon-{os.getpid()}-{next(_cgroup_counter)}"
+        try:
+            path.mkdir()
+        except OSError:
+            return None
+        group = cls(path)
+        try:
+            if limits.address_space_mb:
+                (path / "memory.max").write_text(str(limits.address_space_mb * _MB))
+            if limits.processes:
+                (path / "pids.max").write_text(str(limits.processes))
+        except OSError:
+            # Controllers not delegated to this subtree — don't half-apply.
+            group.remove()
+            return None
+        return group
+
+    def events(self) -> dict[str, int]:
+        """Return breach counters: ``oom_kill`` and ``pids_max``."""
+        counters: dict[str, int] = {}
+        for filename, key, name in (
+            ("memory.events", "oom_kill", "oom_kill"),
+            ("pids.events", "max", "pids_max"),
+        ):
+            try:
+                for line in (self.path / filename).read_text().splitlines():
+                    field, _, value = line.partition(" ")
+                    if field == key:
+                        counters[name] = int(value)
+            except (OSError, ValueError):
+                continue
+        return counters
+
+    def remove(self) -> None:
+        try:
+            self.path.rmdir()
+        except OSError as exc:
+            logger.debug("Could not remove cgroup %s: %s", self.path, exc)
+
+
+def _fork_failed(output: str) -> bool:
+    """True if *output* shows a fork, spawn or thread start failing with EAGAIN."""
+    if _FORK_FAILED_RE.search(output):
+        return True
+    lines = output.splitlines()
+    for i, line in enumerate(lines):
+        # The traceback frames just above the error name the failing call.
+        if _EAGAIN_ERROR_RE.match(line) and any(_SPAWN_FRAME_RE.search(f) for f in lines[max(0, i - 4):i]):
+            return True
+    return False
+
+
+def detect_breach(
+    returncode: int,
+    output: str,
+    timed_out: bool = False,
+    cgroup_events: dict[str, int] | None = None,
+    rlimits: dict[str, tuple[int, int]] | None = None,
+) -> str:
+    """Name the limit a sandboxed command ran into, or return ``""``.
+
+    A process-limit breach is only reported from the cgroup's ``pids.max``
+    event, or from a failed fork/spawn when *rlimits* set ``RLIMIT_NPROC``;
+    a SIGKILL counts as ``cpu_time`` only when they set ``RLIMIT_CPU``.
+    """
+    events = cgroup_events or {}
+    if events.get("oom_kill"):
+        return "memory"
+    if events.get("pids_max"):
+        return "processes"
+    if timed_out:
+        return "wall_time"
+    if returncode == 0:
+        return ""
+    if returncode in (-signal.SIGXCPU, 128 + signal.SIGXCPU):
+        return "cpu_time"
+    if returncode in (-signal.SIGKILL, 128 + signal.SIGKILL) and rlimits and "RLIMIT_CPU" in rlimits:
+        # The hard RLIMIT_CPU kills a process that ignored SIGXCPU.
+        return "cpu_time"
+    if returncode in (-signal.SIGXFSZ, 128 + signal.SIGXFSZ):
+        return "file_size"
+    for name, pattern in _BREACH_PATTERNS:
+        if pattern.search(output):
+            return name
+    if rlimits and "RLIMIT_NPROC" in rlimits and _fork_failed(output):
+        return "processes"
+    return ""
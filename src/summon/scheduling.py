@@ -0,0 +1,191 @@
+"""Dependency-aware scheduling of Stage 4 components.
+
+Sending every component at once meant a component coding against a
+dependency only ever saw the HLD's one-line description of it, never the
+real code — the main source of Stage 5 import-fix and integration loops.
+Components are instead grouped into waves by ``ComponentDesign.dependencies``:
+a wave starts once every component it depends on has been generated, and
+each component is given the actual public signatures of its direct
+dependencies (:func:`dependency_context`).  Components within a wave still
+run fully in parallel.
+
+Dependency cycles can't be ordered; each cycle is collapsed into a single
+wave (its members see each other only through the HLD) and reported.
+
+Within a wave, components are sent largest first (:func:`estimate_size`),
+so that under ``max_parallel_components`` the longest jobs start earliest.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from summon.repomap import render_map_entry
+from summon.workspace import normalize_file_entry
+
+logger = logging.getLogger(__name__)
+
+# Character budget for the dependency signatures given to one component.
+DEFAULT_CONTEXT_BUDGET = 12_000
+
+
+def component_id(component: dict[str, Any], index: int = 0) -> str:
+    return str(component.get("id") or component.get("name") or f"component-{index}")
+
+
+@dataclass
+class WavePlan:
+    waves: list[list[str]]
+    dependencies: dict[str, list[str]]  # component id → known dependency ids
+    cycles: list[list[str]] = field(default_factory=list)
+
+
+def resolve_dependencies(components: list[dict[str, Any]]) -> dict[str, list[str]]:
+    """Map each component id to the ids of the components it depends on.
+
+    Dependencies may name a component by id or by name (case-insensitive);
+    unknown names and self-references are dropped.
+    """
+    lookup: dict[str, str] = {}
+    for index, comp in enumerate(components):
+        cid = component_id(comp, index)
+        lookup[cid.lower()] = cid
+        if comp.get("name"):
+            lookup.setdefault(str(comp["name"]).lower(), cid)
+
+    graph: dict[str, list[str]] = {}
+    for index, comp in enumerate(components):
+        cid = component_id(comp, index)
+        deps = []
+        for dep in comp.get("dependencies") or []:
+            target = lookup.get(str(dep).lower())
+            if target and target != cid and target not in deps:
+                deps.append(target)
+        graph[cid] = deps
+    return graph
+
+
+def strongly_connected(graph: dict[str, list[str]]) -> list[list[str]]:
+    """Strongly connected components (iterative Tarjan), dependencies first."""
+    index: dict[str, int] = {}
+    low: dict[str, int] = {}
+    on_stack: set[str] = set()
+    stack: list[str] = []
+    result: list[list[str]] = []
+    counter = 0
+
+    for root in graph:
+        if root in index:
+            continue
+        work = [(root, iter(graph[root]))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, children = work[-1]
+            child = next(children, None)
+            if child is not None:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(graph.get(child, []))))
+                elif child in on_stack:
+                    low[node] = min(low[node], index[child])
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                scc = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    scc.append(member)
+                    if member == node:
+                        break
+                result.append(sorted(scc))
+    return result
+
+
+def plan_waves(components: list[dict[str, Any]]) -> WavePlan:
+    """Group components into waves in dependency order.
+
+    A component's wave is one more than the latest wave of anything it
+    depends on, so every wave is as wide as the dependencies allow.
+    """
+    graph = resolve_dependencies(components)
+    sccs = strongly_connected(graph)
+    cycles = [scc for scc in sccs if len(scc) > 1]
+    for cycle in cycles:
+        logger.warning("Component dependency cycle: %s (scheduled together)", " ↔ ".join(cycle))
+
+    group_of = {cid: i for i, scc in enumerate(sccs) for cid in scc}
+    level: dict[int, int] = {}
+    for i, scc in enumerate(sccs):  # Tarjan emits dependencies before dependents
+        deps = {group_of[d] for cid in scc for d in graph[cid]} - {i}
+        level[i] = 1 + max((level[d] for d in deps), default=-1)
+
+    order = {cid: n for n, cid in enumerate(graph)}
+    waves: list[list[str]] = [[] for _ in range(max(level.values(), default=-1) + 1)]
+    for i, scc in enumerate(sccs):
+        waves[level[i]].extend(scc)
+    for wave in waves:
+        wave.sort(key=order.__getitem__)
+    return WavePlan(waves=waves, dependencies=graph, cycles=cycles)
+
+
+def estimate_size(component: dict[str, Any], lld: str = "") -> float:
+    """Rough generation cost of a component, for longest-job-first ordering.
+
+    Files dominate (each is a chunk of output tokens), then interfaces;
+    the description — or the LLD from an earlier attempt, when known —
+    breaks ties.
+    """
+    files = len(component.get("files") or [])
+    interfaces = len(component.get("interfaces") or [])
+    text = len(lld) if lld else len(str(component.get("description", ""))) * 4
+    return files * 10 + interfaces * 3 + text / 500
+
+
+def dependency_context(
+    dependencies: list[str],
+    results: list[dict[str, Any]],
+    workspace_path: str = "",
+    budget: int = DEFAULT_CONTEXT_BUDGET,
+) -> str:
+    """Public signatures of the generated files of *dependencies*.
+
+    Python files are rendered as repo-map outlines; other files are listed
+    by path.  Results that carry only a manifest are read back from
+    *workspace_path*.  The latest result per component wins (a gate retry
+    appends new results), and output is capped at *budget* characters.
+    """
+    latest = {r.get("component_id"): r for r in results}
+    sections = []
+    for dep in dependencies:
+        result = latest.get(dep)
+        if result is None:
+            continue
+        entries = []
+        for f in result.get("files", []):
+            path, content = normalize_file_entry(f)
+            if path and not content and workspace_path:
+                try:
+                    content = (Path(workspace_path) / path).read_text()
+                except (OSError, UnicodeDecodeError):
+                    content = ""
+            if path:
+                entries.append(render_map_entry(path, content or ""))
+        if entries:
+            sections.append(f"## {dep}\n" + "\n".join(entries))
+    text = "\n\n".join(sections)
+    if len(text) > budget:
+        text = text[:budget].rsplit("\n", 1)[0] + "\n... (truncated)"
+    return text
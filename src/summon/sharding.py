@@ -0,0 +1,105 @@
+"""Parallel test sharding for generated Python projects.
+
+Running a generated suite serially in one pytest process makes larger
+projects hit the test timeout purely from serial execution, which the
+fixer then tries to "fix".  Stage 5 instead splits test files (or explicit
+test ids) into shards, one pytest process per shard, run concurrently via
+:func:`summon.executor.run_commands`.  Shards are balanced with longest-
+processing-time-first scheduling using per-test durations from previous
+runs (:func:`summon.junit.load_durations`); each shard writes its own JUnit
+report and the results are merged back into one.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+from statistics import median
+
+from summon.executor import ExecResult
+from summon.junit import TestReport
+
+# pytest's exit code when a run collected no tests.
+NO_TESTS_COLLECTED = 5
+
+
+def default_workers(requested: int = 0) -> int:
+    """Worker count: *requested* if positive, else the usable CPU count."""
+    if requested > 0:
+        return requested
+    try:
+        return max(1, len(os.sched_getaffinity(0)))
+    except (AttributeError, OSError):
+        return max(1, os.cpu_count() or 1)
+
+
+def unit_duration(unit: str, durations: dict[str, float]) -> float | None:
+    """Known duration of a test file or test id, or None if never seen."""
+    if unit in durations:
+        return durations[unit]
+    prefix = unit + "::"
+    matched = [d for nodeid, d in durations.items() if nodeid.startswith(prefix)]
+    return sum(matched) if matched else None
+
+
+def plan_shards(
+    units: list[str], durations: dict[str, float], workers: int,
+) -> list[list[str]]:
+    """Split *units* into at most *workers* shards of similar total duration.
+
+    Longest units are placed first, each onto the currently lightest shard.
+    Units with no recorded duration are assumed to take the median of the
+    known ones.  Empty shards are dropped; unit order within a shard follows
+    the input order so runs stay reproducible.
+    """
+    if not units:
+        return []
+    workers = max(1, min(workers, len(units)))
+    known = [d for d in (unit_duration(u, durations) for u in units) if d is not None]
+    fallback = median(known) if known else 1.0
+    costs = {u: (unit_duration(u, durations) or fallback) for u in units}
+
+    heap = [(0.0, i) for i in range(workers)]
+    assigned: dict[str, int] = {}
+    for unit in sorted(units, key=lambda u: costs[u], reverse=True):
+        load, shard = heapq.heappop(heap)
+        assigned[unit] = shard
+        heapq.heappush(heap, (load + costs[unit], shard))
+
+    shards: list[list[str]] = [[] for _ in range(workers)]
+    for unit in units:
+        shards[assigned[unit]].append(unit)
+    return [s for s in shards if s]
+
+
+def merge_reports(reports: list[TestReport | None]) -> TestReport | None:
+    """Concatenate shard reports; None if any shard produced no report."""
+    if any(r is None for r in reports):
+        return None
+    return TestReport(records=[rec for r in reports for rec in r.records])
+
+
+def merge_results(results: list[ExecResult]) -> ExecResult:
+    """Combine shard results into one, as if a single command had run.
+
+    A shard that collected no tests (pytest exit code 5, e.g. a file of
+    fixtures only) doesn't fail the run unless no shard collected any.
+    """
+    if len(results) == 1:
+        return results[0]
+    ran = [r for r in results if r.returncode != NO_TESTS_COLLECTED] or results
+    returncode = next((r.returncode for r in ran if r.returncode != 0), 0)
+    return ExecResult(
+        returncode=returncode,
+        stdout="\n".join(
+            f"===== shard {i + 1}/{len(results)} =====\n{r.stdout.strip()}"
+            for i, r in enumerate(results)
+        ),
+        stderr="\n".join(r.stderr.strip() for r in results if r.stderr.strip()),
+        timed_out=any(r.timed_out for r in results),
+        wall_time=max(r.wall_time for r in results),
+        cpu_time=sum(r.cpu_time for r in results),
+        max_rss_kb=max(r.max_rss_kb for r in results),
+        truncated=any(r.truncated for r in results),
+        limit_exceeded=next((r.limit_exceeded for r in results if r.limit_exceeded), ""),
+    )
@@ -1,23 +1,35 @@
-"""Stage 4: Implementation — Send fan-out: LLD → Code → Review per component."""
+"""Stage 4: Implementation — Send fan-out: LLD → Code → Checks → Review per component."""
 
 from __future__ import annotations
 
+import hashlib
 import json
+import logging
 import operator
+from concurrent.futures import ThreadPoolExecutor
 from typing import Annotated, Any, TypedDict
 
 from langgraph.graph import StateGraph, END, START
 from langgraph.types import Send
 
 from summon.agents.lld import create_lld_node
-from summon.agents.coder import create_coder_node
+from summon.agents.coder import create_coder_node, create_file_coder_node
 from summon.agents.code_reviewer import create_code_reviewer_node
+from summon.prompts.stage4 import CODE_REVIEWER, CODER, FILE_CODER, LLD_WRITER
+from summon import component_cache, prefetch
+from summon.concurrency import limiter
 from summon.config import SummonConfig
+from summon.context_slice import hld_slice, slice_report, spec_slice
+from summon.degeneracy import check_file
+from summon.scheduling import component_id, dependency_context, estimate_size, plan_waves
+from summon.static_checks import check_component
 from summon.state import SummonState
 
+logger = logging.getLogger(__name__)
+
 
 class ComponentOutput(TypedDict, total=False):
-    """Output schema — ONLY component_results flows back to parent."""
+    """Output schema — ONLY component_results (manifests) flows back to parent."""
     component_results: Annotated[list[dict[str, Any]], operator.add]
 
 
@@ -25,15 +37,25 @@ class ComponentState(TypedDict, total=False):
     """Isolated state for per-component subgraph."""
     # Input context
     spec: dict[str, Any]
-    hld: dict[str, Any]
+    hld: dict[str, Any]  # this component's slice (see summon.context_slice)
     component: dict[str, Any]
     language: str
+    workspace_path: str
+    dependency_interfaces: str  # real signatures of already-generated dependencies
+    dependency_ids: list[str]
+    _priority: float  # estimated size; larger components get slots first
+    _cache_key: str  # component_cache key; "" when caching is off
+    _cache_lookup: bool  # False on implementation-gate retries
 
     # Internal working state
     _lld_result: dict[str, Any]
     _code_result: dict[str, Any]
     _review_result: dict[str, Any]
     _review_retries: int
+    _static_issues: str  # diagnostics from the deterministic pre-review checks
+    _static_clean: bool
+    _static_retries: int
+    _skip_review: bool
 
     # Output — aggregated by parent
     component_results: Annotated[list[dict[str, Any]], operator.add]
@@ -44,9 +66,134 @@ def _prepare_component(state: dict[str, Any]) -> dict[str, Any]:
     return {
         "language": state.get("spec", {}).get("language", "python"),
         "_review_retries": 0,
+        "_static_issues": _NO_STATIC_ISSUES,
+        "_static_retries": 0,
     }
 
 
+_NO_STATIC_ISSUES = "(none)"
+
+
+def file_manifest(lld_result: Any) -> list[dict[str, Any]]:
+    """The LLD's per-file contract: ``[{path, purpose, signatures}, ...]``."""
+    if not isinstance(lld_result, dict):
+        return []
+    manifest: list[dict[str, Any]] = []
+    seen: set[str] = set()
+    for entry in lld_result.get("files") or []:
+        path = str(entry.get("path", "")).strip() if isinstance(entry, dict) else ""
+        if path and path not in seen:
+            seen.add(path)
+            manifest.append(entry)
+    return manifest
+
+
+def create_code_node(config: SummonConfig):
+    """Write a component's files: one coder call, or one call per file.
+
+    When the LLD's file contract lists at least ``per_file_min_files``
+    files, every file is generated by its own LLM call, all in parallel
+    (still within the shared ``llm`` limiter), each against the full
+    contract.  Output-token-bound generation then takes as long as the
+    largest file rather than the sum of all of them, and no single response
+    has to fit the whole component.  If any file comes back empty the
+    component falls back to a single coder call.
+    """
+    coder = create_coder_node(config)
+    file_coder = create_file_coder_node(config)
+
+    def code(state: dict[str, Any]) -> dict[str, Any]:
+        manifest = file_manifest(state.get("_lld_result"))
+        if config.per_file_min_files <= 0 or len(manifest) < config.per_file_min_files:
+            return coder(state)
+
+        contract = json.dumps(manifest, indent=2)
+
+        def write_file(entry: dict[str, Any]) -> dict[str, Any]:
+            return file_coder({
+                **state,
+                "_file_manifest": contract,
+                "_file_contract": entry,
+                "_file_path": entry["path"],
+            }).get("_file_result") or {}
+
+        with ThreadPoolExecutor(max_workers=len(manifest)) as pool:
+            outputs = list(pool.map(write_file, manifest))
+
+        files = []
+        for entry, output in zip(manifest, outputs):
+            content = output.get("content", "") if isinstance(output, dict) else ""
+            if not content:
+                logger.warning(
+                    "%s: no content for %s, falling back to a single coder call",
+                    component_id(state.get("component", {})), entry["path"],
+                )
+                return coder(state)
+            files.append({"path": entry["path"], "content": content})
+        return {"_code_result": {"files": files}}
+    return code
+
+# Bounces back to the coder for static-check failures before going to review anyway.
+_MAX_STATIC_RETRIES = 2
+
+
+def create_static_check_node(config: SummonConfig):
+    """Deterministic checks between ``code`` and ``review``.
+
+    See :mod:`summon.static_checks`.  Clean Python components of at most
+    ``review_skip_max_lines`` lines that haven't been LLM-reviewed yet
+    skip the review.
+    """
+    from summon.workspace import normalize_file_entry
+
+    def static_check(state: dict[str, Any]) -> dict[str, Any]:
+        files = [normalize_file_entry(f) for f in state.get("_code_result", {}).get("files", [])]
+        files = [(path, content) for path, content in files if path]
+        if state.get("language", "python") != "python" or not files:
+            return {"_static_issues": _NO_STATIC_ISSUES, "_static_clean": False, "_skip_review": False}
+
+        diagnostics = check_component(files, state.get("component", {}).get("interfaces", []))
+        lines = sum(content.count("\n") + 1 for _, content in files)
+        clean = not diagnostics
+        skip = (
+            clean
+            and lines <= config.review_skip_max_lines
+            and not state.get("_review_result")
+        )
+        if diagnostics:
+            logger.info(
+                "%s: %d static issue(s) before review",
+                component_id(state.get("component", {})), len(diagnostics),
+            )
+        return {
+            "_static_issues": "\n".join(str(d) for d in diagnostics) or _NO_STATIC_ISSUES,
+            "_static_clean": clean,
+            "_skip_review": skip,
+        }
+    return static_check
+
+
+def _static_decision(state: dict[str, Any]) -> str:
+    """Bounce broken code to the coder, skip review for small clean code."""
+    if not state.get("_static_clean", False) and state.get("_static_issues", _NO_STATIC_ISSUES) != _NO_STATIC_ISSUES:
+        if state.get("_static_retries", 0) < _MAX_STATIC_RETRIES:
+            return "fix"
+    if state.get("_skip_review", False):
+        return "skip_review"
+    return "review"
+
+
+def _increment_static_retries(state: dict[str, Any]) -> dict[str, Any]:
+    return {"_static_retries": state.get("_static_retries", 0) + 1}
+
+
+def _approve_without_review(state: dict[str, Any]) -> dict[str, Any]:
+    return {"_review_result": {
+        "approved": True, "issues": [], "suggestions": [],
+        "skipped": "small component passed static checks",
+    }}
+
+
 def _review_decision(state: dict[str, Any]) -> str:
     """Route based on review approval."""
     review = state.get("_review_result", {})
@@ -62,24 +209,159 @@ def _increment_review_retries(state: dict[str, Any]) -> dict[str, Any]:
     return {"_review_retries": state.get("_review_retries", 0) + 1}
 
 
+def _prefetch_requirements(state: dict[str, Any], config: SummonConfig) -> None:
+    """Hand a component's requirements.txt to the background prefetch job."""
+    from summon.workspace import normalize_file_entry
+
+    if not config.prefetch_dependencies or state.get("language", "python") != "python":
+        return
+    for f in state.get("_code_result", {}).get("files", []):
+        path, content = normalize_file_entry(f)
+        if path and path.lstrip("./") == "requirements.txt" and content:
+            prefetch.schedule(
+                state.get("workspace_path", ""),
+                prefetch.requirements_from_text(content),
+                wheelhouse=config.get_wheelhouse(),
+            )
+
+
+def _stream_files(
+    workspace_path: str, files: list[dict[str, Any]],
+) -> tuple[list[dict[str, Any]], list[dict[str, str]]]:
+    """Write a component's files now; return (manifest, degeneracy issues)."""
+    from summon.repomap import content_hash
+    from summon.workspace import Workspace, normalize_file_entry
+
+    ws = Workspace(workspace_path)
+    manifest: list[dict[str, Any]] = []
+    issues: list[dict[str, str]] = []
+    for f in files:
+        path, content = normalize_file_entry(f)
+        if not (path and content):
+            continue
+        ws.write_file(path, content)
+        manifest.append({"path": path, "sha1": content_hash(content), "lines": content.count("\n") + 1})
+        issue = check_file(path, content)
+        if issue is not None:
+            issues.append(issue)
+    return manifest, issues
+
+
 def _collect_result(state: dict[str, Any]) -> dict[str, Any]:
-    """Package component result for aggregation."""
+    """Write the component's files and package its manifest for aggregation.
+
+    Files go to the workspace as soon as the component is done, so only a
+    manifest (path, hash, line count) is merged into ``component_results``
+    and checkpointed.  Each file also gets the deterministic degeneracy
+    checks right away.
+    """
     component = state.get("component", {})
     code_result = state.get("_code_result", {})
     review = state.get("_review_result", {})
     lld = state.get("_lld_result", {})
+    cid = component_id(component)
+
+    files = code_result.get("files", [])
+    issues: list[dict[str, str]] = []
+    workspace_path = state.get("workspace_path", "")
+    if workspace_path:
+        files, issues = _stream_files(workspace_path, files)
+        for issue in issues:
+            logger.warning("%s: %s in %s — %s", cid, issue["issue"], issue["file"], issue["detail"])
 
     result = {
-        "component_id": component.get("id", "unknown"),
-        "files": code_result.get("files", []),
+        "component_id": cid,
+        "files": files,
         "review_feedback": review,
         "lld_summary": lld.get("lld_summary", "") if isinstance(lld, dict) else str(lld),
+        "issues": issues,
     }
+    if state.get("_cache_key"):
+        result["cache_key"] = state["_cache_key"]
     return {"component_results": [result]}
 
 
+def _store_in_cache(state: dict[str, Any]) -> None:
+    """Store an approved component result under its ``_cache_key``."""
+    from summon.workspace import normalize_file_entry
+
+    key = state.get("_cache_key", "")
+    review = state.get("_review_result", {})
+    if not key or not review.get("approved", False):
+        return
+    files = [normalize_file_entry(f) for f in state.get("_code_result", {}).get("files", [])]
+    files = [{"path": path, "content": content} for path, content in files if path and content]
+    if files:
+        component_cache.store(key, state.get("_lld_result", {}), files, review)
+
+
+def create_collect_node(config: SummonConfig):
+    """Collect node that also refreshes the dependency prefetch and the result cache."""
+    def collect(state: dict[str, Any]) -> dict[str, Any]:
+        _prefetch_requirements(state, config)
+        _store_in_cache(state)
+        return _collect_result(state)
+    return collect
+
+
+# Prompt templates are part of every cache key: editing one invalidates all entries.
+_PROMPTS_HASH = hashlib.sha256((LLD_WRITER + CODER + FILE_CODER + CODE_REVIEWER).encode()).hexdigest()
+
+
+def _component_cache_key(state: dict[str, Any], config: SummonConfig) -> str:
+    """Key of the inputs that determine a component's result.
+
+    Hashes the values the prompts are formatted with — the component's spec
+    and HLD slices among them, so an edit elsewhere in the spec doesn't
+    invalidate it; see :mod:`summon.component_cache` for what goes in.
+    """
+    spec = state.get("spec", {})
+    return component_cache.component_key(
+        component=state.get("component", {}),
+        hld=state.get("hld", {}),
+        spec=spec,
+        dependency_interfaces=state.get("dependency_interfaces", ""),
+        language=spec.get("language", "python"),
+        models={role: config.get_model(role) for role in ("lld", "coder", "code_reviewer")},
+        prompts=_PROMPTS_HASH,
+    )
+
+
+def create_implement_node(config: SummonConfig, component_subgraph: Any):
+    """Run a component subgraph within the shared ``components`` limiter.
+
+    At most ``max_parallel_components`` subgraphs run at once; waiting
+    components are admitted largest first (see :mod:`summon.concurrency`).
+    With ``component_cache`` on, a component whose inputs match an earlier
+    approved result replays it instead (no LLM calls, no slot).
+    """
+    slots = limiter("components", config.max_parallel_components)
+    collect = create_collect_node(config)
+
+    def implement_component(state: dict[str, Any]) -> dict[str, Any]:
+        key = _component_cache_key(state, config) if config.component_cache else ""
+        if key and state.get("_cache_lookup", True) and not config.regenerate_components:
+            entry = component_cache.load(key)
+            if entry is not None:
+                logger.info("%s: unchanged inputs, reusing cached result", component_id(state.get("component", {})))
+                output = collect({
+                    **state,
+                    "language": state.get("spec", {}).get("language", "python"),
+                    "_lld_result": entry.get("lld", {}),
+                    "_code_result": {"files": entry["files"]},
+                    "_review_result": entry.get("review", {}),
+                })
+                for result in output["component_results"]:
+                    result["cached"] = True
+                    result["cache_key"] = key
+                return output
+        with slots.slot(state.get("_priority", 0.0)):
+            return component_subgraph.invoke({**state, "_cache_key": key})
+    return implement_component
+
+
 def create_component_graph(config: SummonConfig) -> StateGraph:
-    """Build the per-component subgraph: LLD → Code → Review loop.
+    """Build the per-component subgraph: LLD → Code → static checks → Review loop.
 
     Uses ComponentState (not SummonState) to avoid key conflicts when
     multiple Send branches merge back into the parent graph.
@@ -88,15 +370,29 @@ def create_component_graph(config: SummonConfig) -> StateGraph:
 
     graph.add_node("prepare", _prepare_component)
     graph.add_node("lld", create_lld_node(config))
-    graph.add_node("code", create_coder_node(config))
+    graph.add_node("code", create_code_node(config))
+    graph.add_node("static_check", create_static_check_node(config))
+    graph.add_node("increment_static_retries", _increment_static_retries)
+    graph.add_node("approve_without_review", _approve_without_review)
     graph.add_node("review", create_code_reviewer_node(config))
     graph.add_node("increment_retries", _increment_review_retries)
-    graph.add_node("collect", _collect_result)
+    graph.add_node("collect", create_collect_node(config))
 
     graph.set_entry_point("prepare")
     graph.add_edge("prepare", "lld")
     graph.add_edge("lld", "code")
-    graph.add_edge("code", "review")
+    graph.add_edge("code", "static_check")
+    graph.add_conditional_edges(
+        "static_check",
+        _static_decision,
+        {
+            "fix": "increment_static_retries",
+            "skip_review": "approve_without_review",
+            "review": "review",
+        }
+    )
+    graph.add_edge("increment_static_retries", "code")
+    graph.add_edge("approve_without_review", "collect")
     graph.add_conditional_edges(
         "review",
         _review_decision,
@@ -111,37 +407,113 @@ def create_component_graph(config: SummonConfig) -> StateGraph:
     return graph
 
 
-def fan_out_components(state: dict[str, Any]) -> list[Send]:
-    """Fan out to one subgraph per component using Send API.
+_SINGLE_COMPONENT = {
+    "id": "single", "name": "main",
+    "description": "entire project",
+    "files": [], "dependencies": [], "interfaces": [],
+}
+
+_NO_DEPENDENCIES = "(none — this component does not depend on other components)"
+
 
-    Only sends the keys defined in ComponentState — no extra SummonState keys.
+def _plan_waves(state: dict[str, Any]) -> dict[str, Any]:
+    """Order components into dependency waves (see :mod:`summon.scheduling`).
+
+    Also makes sure there is a workspace for components to write into, and
+    on an implementation-gate retry evicts the cached results the rejected
+    attempt produced or replayed.
     """
-    components = state.get("components", [])
-    spec = state.get("spec", {})
-    hld = state.get("hld", {})
+    from summon.workspace import Workspace
+
+    if _gate_retry(state):
+        for result in state.get("component_results", []):
+            if result.get("cache_key"):
+                component_cache.evict(result["cache_key"])
+
+    workspace_path = state.get("workspace_path") or str(Workspace().path)
+    components = state.get("components") or [_SINGLE_COMPONENT]
+    plan = plan_waves(components)
+    if len(plan.waves) > 1:
+        logger.info(
+            "Implementing %d components in %d waves: %s",
+            len(components), len(plan.waves), " → ".join(str(len(w)) for w in plan.waves),
+        )
+    report = slice_report(state.get("hld", {}), components, plan.dependencies)
+    logger.info(
+        "HLD context per prompt: ~%d tokens full, ~%d on average sliced (%.1f%% saved)",
+        report["full_tokens"], report["sliced_total"] // max(len(components), 1), report["saved_pct"],
+    )
+    return {
+        "_waves": plan.waves,
+        "_wave_index": 0,
+        "_component_dependencies": plan.dependencies,
+        "workspace_path": workspace_path,
+        "hld_context_report": report,
+    }
+
+
+def _gate_retry(state: dict[str, Any]) -> bool:
+    """Whether Stage 4 is re-running after the implementation gate rejected it."""
+    return state.get("stage_retries", {}).get("implementation", 0) > 0
+
 
+def _next_wave(state: dict[str, Any]) -> dict[str, Any]:
+    return {"_wave_index": state.get("_wave_index", 0) + 1}
+
+
+def fan_out_components(state: dict[str, Any]) -> list[Send] | str:
+    """Fan out the current wave, one subgraph per component, using Send API.
+
+    Only sends the keys defined in ComponentState — no extra SummonState
+    keys.  Each component gets its own HLD slice (see
+    :mod:`summon.context_slice`) and the generated signatures of its direct
+    dependencies from earlier waves; the largest components are sent first.
+    Once every wave is done, routes to ``write_files``.
+    """
+    components = state.get("components") or [_SINGLE_COMPONENT]
+    waves = state.get("_waves") or [[component_id(c, i) for i, c in enumerate(components)]]
+    wave_index = state.get("_wave_index", 0)
+    if wave_index >= len(waves):
+        return "write_files"
+
+    by_id = {component_id(c, i): c for i, c in enumerate(components)}
+    dependencies = state.get("_component_dependencies") or {}
+    results = state.get("component_results", [])
+    hld = state.get("hld", {})
+    spec = state.get("spec", {})
     base_context = {
-        "spec": spec,
-        "hld": hld,
+        "workspace_path": state.get("workspace_path", ""),
         "component_results": [],
+        "_cache_lookup": not _gate_retry(state),
     }
 
-    if not components:
-        component = {
-            "id": "single", "name": "main",
-            "description": "entire project",
-            "files": [], "dependencies": [], "interfaces": [],
-        }
-        return [Send("implement_component", {**base_context, "component": component})]
-
-    return [
-        Send("implement_component", {**base_context, "component": comp})
-        for comp in components
+    previous_lld = {r.get("component_id"): r.get("lld_summary", "") for r in results}
+    sized = [
+        (estimate_size(by_id[cid], previous_lld.get(cid, "")), cid)
+        for cid in waves[wave_index] if cid in by_id
     ]
+    sends = []
+    for size, cid in sorted(sized, key=lambda item: -item[0]):
+        context = dependency_context(dependencies.get(cid, []), results, base_context["workspace_path"])
+        sends.append(Send("implement_component", {
+            **base_context,
+            "spec": spec_slice(spec, by_id[cid], components),
+            "hld": hld_slice(hld, by_id[cid], dependencies.get(cid, [])),
+            "component": by_id[cid],
+            "dependency_interfaces": context or _NO_DEPENDENCIES,
+            "dependency_ids": dependencies.get(cid, []),
+            "_priority": size,
+        }))
+    return sends or "write_files"
 
 
 def _write_files_to_workspace(state: dict[str, Any]) -> dict[str, Any]:
-    """Write all component files to the workspace directory."""
+    """Write any component files not already streamed to the workspace.
+
+    Components write their own files as they finish (see
+    :func:`_collect_result`); this only handles results that still carry
+    file contents.
+    """
     from summon.workspace import Workspace, normalize_file_entry
 
     workspace_path = state.get("workspace_path", "")
@@ -163,20 +535,29 @@ def _write_files_to_workspace(state: dict[str, Any]) -> dict[str, Any]:
 
 
 def create_stage4_graph(config: SummonConfig) -> StateGraph:
-    """Build the Stage 4 graph with Send-based fan-out."""
+    """Build the Stage 4 graph: Send-based fan-out, one dependency wave at a time."""
     component_subgraph = create_component_graph(config).compile()
 
     graph = StateGraph(SummonState)
 
-    graph.add_node("implement_component", component_subgraph)
+    graph.add_node("plan_waves", _plan_waves)
+    graph.add_node("implement_component", create_implement_node(config, component_subgraph))
+    graph.add_node("next_wave", _next_wave)
     graph.add_node("write_files", _write_files_to_workspace)
 
+    graph.add_edge(START, "plan_waves")
+    graph.add_conditional_edges(
+        "plan_waves",
+        fan_out_components,
+        ["implement_component", "write_files"],
+    )
+    # All Send branches of a wave join before next_wave runs.
+    graph.add_edge("implement_component", "next_wave")
     graph.add_conditional_edges(
-        START,
+        "next_wave",
         fan_out_components,
-        ["implement_component"],
+        ["implement_component", "write_files"],
     )
-    graph.add_edge("implement_component", "write_files")
     graph.add_edge("write_files", END)
 
     return graph
@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-import ast
 import json
-from collections import Counter
+import logging
 from pathlib import Path
 from typing import Any
 
@@ -20,31 +19,78 @@ from summon.agents.acceptance_test_gen import create_acceptance_test_gen_node
 from summon.agents.acceptance_fixer import create_acceptance_fixer_node
 from summon.agents.adversarial_tester import create_adversarial_tester_node
 from summon.agents.adversarial_fixer import create_adversarial_fixer_node
-from summon.config import SummonConfig
-from summon.executor import run_command
+from summon.capture import clip_output, summarize_test_output
+from summon.config import SandboxLimits, SummonConfig
+from summon.degeneracy import check_file
+from summon.executor import ExecResult, run_command, run_commands
+from summon.import_check import validate_modules
+from summon.import_graph import (
+    analyze_imports,
+    apply_rewrites,
+    dependency_graph,
+    impacted_files,
+    installed_top_levels,
+)
+from summon.junit import REPORT_DIR, TestReport, load_durations, load_report, save_durations
+from summon.patching import apply_fixes
+from summon import prefetch
+from summon.pytest_server import get_server, run_many
+from summon import pytest_timeouts
+from summon.sharding import default_workers, merge_reports, merge_results, plan_shards
 from summon.state import SummonState
+from summon.toolchain_cache import (
+    NODE_SOURCE_SUFFIXES,
+    ensure_node_modules,
+    go_affected_packages,
+    jest_cache_dir,
+    toolchain_env,
+)
+from summon.wheelhouse import install_args, missing_requirements
 from summon.workspace import Workspace, collect_file_contents
 
+logger = logging.getLogger(__name__)
+
 
 # ---------------------------------------------------------------------------
 # Existing nodes (integration, deps, unit tests)
 # ---------------------------------------------------------------------------
 
 
+def _with_config(node, config: SummonConfig):
+    """Bind *config* to a node function that takes ``(state, config)``.
+
+    LangGraph injects its own RunnableConfig into a node parameter named
+    ``config``, so nodes that need the SummonConfig are wrapped instead.
+    """
+    def bound(state: dict[str, Any]) -> dict[str, Any]:
+        return node(state, config)
+    bound.__name__ = getattr(node, "__name__", "node")
+    return bound
+
+
+def _sandbox_limits(config: SummonConfig | None) -> SandboxLimits:
+    """Sandbox limits for running generated code (defaults when no config)."""
+    return (config or SummonConfig()).sandbox
+
+
+
 def _build_integration_context(state: dict[str, Any]) -> dict[str, Any]:
     """Strip component_results to only files for the integrator prompt.
 
     The raw component_results include review_feedback and lld_summary which
     are large and unnecessary for integration. Keeping only the files
-    dramatically reduces prompt size.
+    dramatically reduces prompt size.  Stage 4 results are manifests, so
+    contents are read back from the workspace; the latest result per
+    component wins.
     """
-    component_results = state.get("component_results", [])
-    slim = []
-    for comp in component_results:
-        slim.append({
-            "component_id": comp.get("component_id", ""),
-            "files": comp.get("files", []),
-        })
+    from summon.workspace import expand_component_results
+
+    slim = [
+        {"component_id": comp.get("component_id", ""), "files": comp["files"]}
+        for comp in expand_component_results(
+            state.get("component_results", []), state.get("workspace_path", ""),
+        )
+    ]
     return {"component_results": slim}
 
 
@@ -96,10 +142,153 @@ def _process_integration(state: dict[str, Any]) -> dict[str, Any]:
     return {"integration_code": str(files_written) + " integration files written"}
 
 
-def _install_deps(state: dict[str, Any]) -> dict[str, Any]:
+def _uv_python(uv: str) -> str:
+    """Interpreter ``uv venv`` would pick, identified by path and version."""
+    found = run_command([uv, "python", "find"], cwd=".", timeout=30)
+    path = found.stdout.strip().splitlines()[-1] if found.success and found.stdout.strip() else ""
+    if not path:
+        return ""
+    version = run_command([path, "-c", "import sys; print(sys.version)"], cwd=".", timeout=30)
+    return f"{path}\n{version.stdout.strip()}" if version.success else ""
+
+
+def _install_cached_venv(uv: str, workspace_path: str, wheelhouse: str = "") -> bool:
+    """Clone the workspace venv from the content-addressed cache.
+
+    Returns False when the requirements can't be cached (local paths,
+    nested requirement files) or building the venv failed, so the caller
+    falls back to installing in place.
+    """
+    from summon.venv_cache import cached, ensure_venv, venv_key
+
+    ws = Workspace(workspace_path)
+    requirements = ws.read_file("requirements.txt") if ws.file_exists("requirements.txt") else ""
+    python_id = _uv_python(uv)
+    extra = ("pytest", f"wheelhouse={wheelhouse}") if wheelhouse else ("pytest",)
+    key = venv_key(python_id, requirements, extra=extra) if python_id else None
+    offline = install_args(wheelhouse) if wheelhouse else []
+    if (key is None or not cached(key)) and prefetch.prefetched(Path(workspace_path) / ".venv") is not None:
+        # Nothing to clone, but the prefetch job already installed most of it.
+        return _reconcile_prefetched(uv, workspace_path, requirements, offline)
+    if key is None:
+        return False
+
+    python_path = python_id.splitlines()[0]
+
+    def build(target: Path) -> bool:
+        created = run_command(
+            [uv, "venv", str(target), "--python", python_path, *offline[:1]],
+            cwd=workspace_path, timeout=60,
+        )
+        if not created.success:
+            return False
+        packages = ["-r", "requirements.txt"] if requirements.strip() else []
+        installed = run_command(
+            [uv, "pip", "install", *offline, *packages, "pytest", "-p", str(target / "bin" / "python")],
+            cwd=workspace_path,
+            timeout=240,
+        )
+        if not installed.success:
+            logger.warning("Dependency install failed:\n%s", clip_output(installed.output, 2000))
+        return installed.success
+
+    status = ensure_venv(Path(workspace_path) / ".venv", key, build)
+    return status != "failed"
+
+
+def _reconcile_prefetched(
+    uv: str, workspace_path: str, requirements: str, offline: list[str],
+) -> bool:
+    """Bring a prefetched venv in line with the final requirements.txt.
+
+    Packages the SDD promised but the code never required are removed, and
+    only requirements the prefetch job didn't already install are fetched.
+    """
+    venv_dir = Path(workspace_path) / ".venv"
+    venv_python = str(venv_dir / "bin" / "python")
+    wanted = prefetch.requirements_from_text(requirements)
+    names = {prefetch.requirement_name(line) for line in wanted} | {"pytest"}
+    unused = sorted(
+        {prefetch.requirement_name(line) for line in prefetch.prefetched(venv_dir) or []} - names - {""}
+    )
+    if unused:
+        run_command([uv, "pip", "uninstall", *unused, "-p", venv_python], cwd=workspace_path, timeout=60)
+    packages = ["-r", "requirements.txt"] if requirements.strip() else []
+    installed = run_command(
+        [uv, "pip", "install", *offline, *packages, "pytest", "-p", venv_python],
+        cwd=workspace_path,
+        timeout=240,
+    )
+    if not installed.success:
+        logger.warning("Dependency install failed:\n%s", clip_output(installed.output, 2000))
+        return False
+    (venv_dir / prefetch.PREFETCH_MARKER).write_text(json.dumps(sorted({*wanted, "pytest"})))
+    logger.info("Reconciled prefetched venv (removed %d unused)", len(unused))
+    return True
+
+
+def _wheelhouse_requirements(workspace_path: str) -> list[str]:
+    """Requirement lines (plus pytest) to check against the wheelhouse."""
+    from summon.venv_cache import normalize_requirements
+
+    ws = Workspace(workspace_path)
+    text = ws.read_file("requirements.txt") if ws.file_exists("requirements.txt") else ""
+    requirements = normalize_requirements(text)
+    if requirements is None:
+        # Local paths / nested files: check the plain requirement lines only.
+        requirements = [
+            line.strip() for line in text.splitlines()
+            if line.strip() and not line.strip().startswith(("#", "-", ".", "/"))
+        ]
+    return [*requirements, "pytest"]
+
+
+def _check_wheelhouse(workspace_path: str, wheelhouse: str) -> list[str]:
+    """Requirements (and pytest) the offline wheelhouse can't satisfy."""
+    return missing_requirements(_wheelhouse_requirements(workspace_path), wheelhouse)
+
+
+def _install_available(workspace_path: str, wheelhouse: str, uv: str | None) -> None:
+    """Install the requirements the wheelhouse can satisfy (incomplete wheelhouse).
+
+    The venv still gets pytest and every requirement whose wheels are
+    present, so test runs fail on the missing packages only.
+    """
+    available = [
+        line for line in _wheelhouse_requirements(workspace_path)
+        if not missing_requirements([line], wheelhouse)
+    ]
+    offline = install_args(wheelhouse, uv=bool(uv))
+    venv_dir = Path(workspace_path) / ".venv"
+    if uv:
+        if not venv_dir.exists():
+            run_command([uv, "venv", str(venv_dir), *offline[:1]], cwd=workspace_path, timeout=30)
+        command = [uv, "pip", "install", *offline, *available, "-p", str(venv_dir / "bin" / "python")]
+    else:
+        command = ["python", "-m", "pip", "install", *offline, *available]
+    if available:
+        result = run_command(command, cwd=workspace_path, timeout=180)
+        if not result.success:
+            logger.warning("Dependency install failed:\n%s", clip_output(result.output, 2000))
+
+
+def _install_deps(
+    state: dict[str, Any], config: SummonConfig | None = None,
+) -> dict[str, Any]:
     """Install project dependencies in the workspace before running tests.
 
-    Creates a venv via uv and installs requirements into it.
+    With uv, the venv is cloned from a cache keyed by the interpreter and
+    the normalized requirements (see :mod:`summon.venv_cache`), and nothing
+    is installed while requirements.txt is unchanged.  Otherwise creates a
+    venv via uv (or uses pip) and installs requirements into it.
+
+    A venv prefetched in the background during Stage 4 (see
+    :mod:`summon.prefetch`) is reconciled with requirements.txt instead of
+    being rebuilt when the cache has no matching entry.
+
+    With a ``wheelhouse`` configured, installs run offline from it.
+    Requirements it can't satisfy are reported up front; only the rest
+    (and pytest) are installed, without touching the venv cache.
     """
     import shutil
 
@@ -111,38 +300,68 @@ def _install_deps(state: dict[str, Any]) -> dict[str, Any]:
     language = state.get("spec", {}).get("language", "python")
 
     if language == "python":
-        # Create a venv if one doesn't exist
+        # Wait for the Stage 4 prefetch job; only the delta is left to install.
+        prefetch.finish(workspace_path)
+        wheelhouse = config.get_wheelhouse() if config else ""
+        missing = _check_wheelhouse(workspace_path, wheelhouse) if wheelhouse else []
+        if missing:
+            logger.warning(
+                "Offline wheelhouse %s is missing: %s", wheelhouse, ", ".join(missing),
+            )
+
         venv_dir = str(Path(workspace_path) / ".venv")
         uv = shutil.which("uv")
+        if wheelhouse and missing:
+            _install_available(workspace_path, wheelhouse, uv)
+            return {"missing_wheels": missing}
+        if uv and _install_cached_venv(uv, workspace_path, wheelhouse):
+            return {"missing_wheels": []}
+
+        offline = install_args(wheelhouse, uv=bool(uv)) if wheelhouse else []
+        # Create a venv if one doesn't exist
         if uv and not Path(venv_dir).exists():
-            run_command(f"{uv} venv {venv_dir} 2>&1", cwd=workspace_path, timeout=30)
+            run_command([uv, "venv", venv_dir, *offline[:1]], cwd=workspace_path, timeout=30)
 
         if ws.file_exists("requirements.txt"):
             if uv:
                 venv_python = str(Path(venv_dir) / "bin" / "python")
                 run_command(
-                    f"{uv} pip install -r requirements.txt -p {venv_python} 2>&1",
+                    [uv, "pip", "install", *offline, "-r", "requirements.txt", "-p", venv_python],
                     cwd=workspace_path,
                     timeout=180,
                 )
                 run_command(
-                    f"{uv} pip install pytest -p {venv_python} 2>&1",
+                    [uv, "pip", "install", *offline, "pytest", "-p", venv_python],
                     cwd=workspace_path,
                     timeout=60,
                 )
             else:
                 run_command(
-                    "python -m pip install -r requirements.txt 2>&1",
+                    ["python", "-m", "pip", "install", *offline, "-r", "requirements.txt"],
                     cwd=workspace_path,
                     timeout=180,
                 )
-                run_command("python -m pip install pytest 2>&1", cwd=workspace_path, timeout=60)
+                run_command(
+                    ["python", "-m", "pip", "install", *offline, "pytest"],
+                    cwd=workspace_path,
+                    timeout=60,
+                )
+        return {"missing_wheels": []}
     elif language == "typescript":
         if ws.file_exists("package.json"):
-            run_command("npm install 2>&1", cwd=workspace_path, timeout=180)
+            node = run_command(["node", "--version"], cwd=workspace_path, timeout=30)
+            node_id = node.stdout.strip() if node.success else ""
+            if not (node_id and ensure_node_modules(workspace_path, node_id)):
+                run_command(
+                    "npm install 2>&1", cwd=workspace_path, timeout=180,
+                    env=_toolchain_env(workspace_path, language),
+                )
     elif language == "go":
         if ws.file_exists("go.mod"):
-            run_command("go mod tidy 2>&1", cwd=workspace_path, timeout=120)
+            run_command(
+                "go mod tidy 2>&1", cwd=workspace_path, timeout=120,
+                env=_toolchain_env(workspace_path, language),
+            )
 
     return {}
 
@@ -155,7 +374,7 @@ def _build_project_files_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if not f.startswith(".venv/")
         and not f.startswith("__pycache__/")
         and "__pycache__/" not in f
@@ -178,60 +397,343 @@ def _process_tests(state: dict[str, Any]) -> dict[str, Any]:
     return {"test_code": test_code}
 
 
-def _run_tests(state: dict[str, Any]) -> dict[str, Any]:
-    """Actually run the tests in the workspace."""
-    import os
+_FAIL_PATTERNS = [
+    r'\d+ failed',           # pytest: "1 failed"
+    r'^FAILED ',             # pytest: "FAILED tests/..."
+    r'^ERRORS$',             # pytest collection errors (standalone line)
+    r'failures=\d*[1-9]',    # unittest: "failures=1"
+    r'Tests:\s+\d+ failed',  # jest: "Tests:  1 failed"
+]
 
-    workspace_path = state.get("workspace_path", "")
-    if not workspace_path:
-        return {"test_results": "No workspace", "tests_passing": False}
 
-    language = state.get("spec", {}).get("language", "python")
+def _console_failed(output: str) -> bool:
+    """Fallback failure detection over console text (no structured report)."""
+    import re
 
-    if language == "python":
-        # Use venv python if available
-        venv_python = os.path.join(workspace_path, ".venv", "bin", "python")
-        if os.path.exists(venv_python):
-            cmd = f"{venv_python} -m pytest tests/ -v --tb=short 2>&1"
-        else:
-            cmd = "python -m pytest tests/ -v --tb=short 2>&1"
-    elif language == "typescript":
-        cmd = "npx jest --verbose 2>&1"
-    elif language == "go":
-        cmd = "go test ./... -v 2>&1"
-    else:
-        cmd = "echo 'Unknown language for testing'"
+    return any(re.search(p, output, re.MULTILINE) for p in _FAIL_PATTERNS)
+
+
+def _test_env(workspace_path: str) -> dict[str, str]:
+    """Environment with PYTHONPATH set so the project root and src/ resolve."""
+    import os
 
-    # Set PYTHONPATH so imports from the project root and src/ resolve
     env = os.environ.copy()
     pypath_parts = [workspace_path]
     src_dir = os.path.join(workspace_path, "src")
     if os.path.isdir(src_dir):
         pypath_parts.append(src_dir)
+    # Where the per-test timeout plugin is installed.
+    pypath_parts.append(os.path.join(workspace_path, pytest_timeouts.PLUGIN_DIR))
     env["PYTHONPATH"] = os.pathsep.join(pypath_parts)
+    return env
 
-    result = run_command(cmd, cwd=workspace_path, timeout=120, env=env)
-    output = result.output[:4000]
 
-    # Detect pass/fail primarily from exit code.
-    passing = result.success
-    if passing:
-        import re
-        fail_patterns = [
-            r'\d+ failed',           # pytest: "1 failed"
-            r'^FAILED ',             # pytest: "FAILED tests/..."
-            r'^ERRORS$',             # pytest collection errors (standalone line)
-            r'failures=\d*[1-9]',    # unittest: "failures=1"
-            r'Tests:\s+\d+ failed',  # jest: "Tests:  1 failed"
+def _toolchain_env(workspace_path: str, language: str) -> dict[str, str]:
+    """Test environment plus the shared npm / Go caches."""
+    return {**_test_env(workspace_path), **toolchain_env(language)}
+
+
+def _is_test_file(path: str) -> bool:
+    name = Path(path).name
+    return path.startswith("tests/") and (name.startswith("test_") or name.endswith("_test.py"))
+
+
+def _python_cmd(workspace_path: str) -> str:
+    """The workspace venv's python if it exists, else ``python``."""
+    import os
+
+    venv_python = os.path.join(workspace_path, ".venv", "bin", "python")
+    return venv_python if os.path.exists(venv_python) else "python"
+
+
+def _pytest_args(targets: list[str], report_rel: str, extra: tuple[str, ...] = ()) -> list[str]:
+    return [
+        *targets, "-v", "--tb=short", *extra,
+        "-o", "junit_family=xunit1", f"--junitxml={report_rel}",
+    ]
+
+
+def _execute_pytest(
+    workspace_path: str, arg_lists: list[list[str]], config: SummonConfig | None,
+) -> list[ExecResult]:
+    """Run one pytest invocation per argument list, concurrently.
+
+    Runs go to the workspace's warm pytest server (see
+    :mod:`summon.pytest_server`) when enabled; anything it can't serve
+    falls back to a subprocess.
+    """
+    python_cmd = _python_cmd(workspace_path)
+    env = _test_env(workspace_path)
+    sandbox = _sandbox_limits(config)
+
+    results: list[ExecResult | None] = [None] * len(arg_lists)
+    if config is None or config.warm_test_server:
+        server = get_server(workspace_path, python_cmd, env, sandbox)
+        if server is not None:
+            results = run_many(server, [{"args": args, "timeout": 120} for args in arg_lists])
+
+    missing = [i for i, r in enumerate(results) if r is None]
+    if missing:
+        fallback = run_commands([
+            {
+                "cmd": [python_cmd, "-m", "pytest", *arg_lists[i]],
+                "cwd": workspace_path, "timeout": 120, "env": env, "sandbox": sandbox,
+            }
+            for i in missing
+        ])
+        for i, result in zip(missing, fallback):
+            results[i] = result
+    return results
+
+
+def _run_pytest(
+    workspace_path: str, targets: list[str], report_name: str, config: SummonConfig | None,
+) -> tuple[ExecResult, TestReport | None]:
+    """Run pytest on *targets* with a JUnit XML report.
+
+    A ``tests/`` target is expanded to its test files.  With several files
+    (or test ids) the run is sharded across worker processes sized to the
+    available cores: through pytest-xdist when the workspace has it,
+    otherwise one pytest process per shard balanced by recorded durations
+    (see :mod:`summon.sharding`), with the shard reports merged.
+
+    Each test gets its own deadline (see :mod:`summon.pytest_timeouts`), so
+    a hung test fails with a stack dump while the rest of the suite runs.
+
+    Returns the command result and the parsed report (None if pytest died
+    before writing one, e.g. on timeout).  Durations are recorded for
+    scheduling later runs.
+    """
+    report_dir = Path(workspace_path) / REPORT_DIR
+    report_dir.mkdir(parents=True, exist_ok=True)
+    for stale in report_dir.glob(f"{report_name}*.xml"):
+        stale.unlink(missing_ok=True)
+
+    units: list[str] = []
+    for target in targets:
+        if target.rstrip("/") == "tests":
+            units += [f for f in Workspace(workspace_path).list_project_files() if _is_test_file(f)]
+        else:
+            units.append(target)
+    units = units or targets
+
+    requested = config.test_workers if config is not None else 0
+    workers = min(default_workers(requested), len(units))
+
+    extra: tuple[str, ...] = ()
+    timeouts = (config or SummonConfig()).test_timeouts
+    if timeouts.enabled:
+        pytest_timeouts.install_plugin(workspace_path, pytest_timeouts.adaptive_timeouts(
+            load_durations(workspace_path),
+            default=timeouts.default_seconds,
+            multiplier=timeouts.multiplier,
+            minimum=timeouts.min_seconds,
+            maximum=timeouts.max_seconds,
+            previous=pytest_timeouts.load_timeouts(workspace_path),
+        ))
+        extra = (
+            "-p", pytest_timeouts.PLUGIN_NAME,
+            f"--summon-timeouts={pytest_timeouts.TIMEOUTS_FILE}",
+        )
+
+    if workers > 1 and "xdist" in (installed_top_levels(workspace_path) or set()):
+        report_rel = f"{REPORT_DIR}/{report_name}.xml"
+        [result] = _execute_pytest(
+            workspace_path, [_pytest_args(targets, report_rel, (*extra, "-n", str(workers)))], config,
+        )
+        report = load_report(Path(workspace_path) / report_rel)
+    else:
+        shards = plan_shards(units, load_durations(workspace_path), workers) if workers > 1 else [targets]
+        if len(shards) > 1:
+            logger.info("Running %d test targets in %d shards", len(units), len(shards))
+        report_rels = [
+            f"{REPORT_DIR}/{report_name}.xml" if len(shards) == 1
+            else f"{REPORT_DIR}/{report_name}-{i}.xml"
+            for i in range(len(shards))
         ]
-        for pattern in fail_patterns:
-            if re.search(pattern, output, re.MULTILINE):
-                passing = False
-                break
+        results = _execute_pytest(
+            workspace_path,
+            [_pytest_args(shard, rel, extra) for shard, rel in zip(shards, report_rels)],
+            config,
+        )
+        result = merge_results(results)
+        report = merge_reports([load_report(Path(workspace_path) / rel) for rel in report_rels])
+
+    if report is not None:
+        save_durations(workspace_path, report)
+    return result, report
+
+
+def _pytest_outcome(
+    result: ExecResult, report: TestReport | None, previous: dict[str, Any] | None = None,
+) -> tuple[bool, str, dict[str, Any]]:
+    """Gate decision, fixer-facing text and state summary for a pytest run.
+
+    The structured report decides when available; console patterns are the
+    fallback when pytest died before writing one.  Given the *previous*
+    run's summary, tests that newly fail after a fix are called out as
+    regressions.
+    """
+    full_output = result.output
+    if report is None:
+        passing = result.success and not _console_failed(full_output)
+        return passing, summarize_test_output(full_output), {}
+
+    passing = result.success and report.ok
+    if report.failures:
+        output = report.render()
+    elif passing:
+        output = report.summary_line()
+    else:
+        # Nothing failed per the report, yet pytest did (no tests, internal error).
+        output = summarize_test_output(full_output)
+    if result.limit_exceeded:
+        output += f"\nRESOURCE LIMIT EXCEEDED: {result.limit_exceeded}"
+
+    summary = report.as_dict()
+    before = {f["nodeid"] for f in (previous or {}).get("failures", [])}
+    if before:
+        regressions = [f["nodeid"] for f in summary["failures"] if f["nodeid"] not in before]
+        if regressions:
+            output = (
+                "Newly failing since the last fix (regressions):\n  "
+                + "\n  ".join(regressions) + "\n\n" + output
+            )
+    return passing, output, summary
+
+
+def _select_tests(state: dict[str, Any], workspace_path: str) -> list[str] | None:
+    """Test ids for an incremental re-run inside the fix loop.
+
+    Returns the previously failing tests plus every test file that imports
+    (transitively) a file the fixer changed, or None when the full suite
+    should run: first run, nothing known to be failing, a change to a
+    non-module file or ``conftest.py``, or the last attempt before the loop
+    gives up.
+    """
+    failing = [f["nodeid"] for f in (state.get("test_report") or {}).get("failures", [])]
+    changed = set(state.get("changed_files") or [])
+    if not failing or not changed:
+        return None
+    if state.get("stage_retries", {}).get("test_fix", 0) >= 3:
+        return None
+    if any(not f.endswith(".py") or Path(f).name == "conftest.py" for f in changed):
+        return None
+
+    ws = Workspace(workspace_path)
+    files = [f for f in ws.list_project_files() if f.endswith(".py")]
+    affected = sorted(f for f in impacted_files(dependency_graph(ws, files), changed) if _is_test_file(f))
+    return failing + [
+        t for t in affected if not any(n == t or n.startswith(t + "::") for n in failing)
+    ]
+
+
+def _toolchain_test_cmd(language: str, targets: list[str] | None = None) -> str | list[str]:
+    """Test command for TypeScript / Go, optionally limited to *targets*."""
+    if language == "typescript":
+        cmd = ["npx", "jest", "--verbose", "--ci", f"--cacheDirectory={jest_cache_dir()}"]
+        return [*cmd, "--findRelatedTests", *targets] if targets else cmd
+    if language == "go":
+        return ["go", "test", "-v", *(targets or ["./..."])]
+    return "echo 'Unknown language for testing'"
+
+
+def _select_toolchain_tests(
+    state: dict[str, Any], workspace_path: str, language: str, env: dict[str, str],
+) -> list[str] | None:
+    """Targets for an incremental TypeScript / Go re-run inside the fix loop.
+
+    Jest gets the changed source files (``--findRelatedTests`` finds the
+    tests that import them); Go gets the packages that contain or import
+    them.  Returns None for a full run under the same conditions as
+    :func:`_select_tests`.
+    """
+    changed = list(state.get("changed_files") or [])
+    if state.get("tests_passing", True) or not state.get("test_results") or not changed:
+        return None
+    if state.get("stage_retries", {}).get("test_fix", 0) >= 3:
+        return None
+    suffixes = NODE_SOURCE_SUFFIXES if language == "typescript" else (".go",)
+    if any(not f.endswith(suffixes) for f in changed):
+        return None
+    if language == "typescript":
+        return changed
+    if language == "go":
+        return go_affected_packages(workspace_path, changed, env=env) or None
+    return None
+
+
+def _run_tests(
+    state: dict[str, Any], config: SummonConfig | None = None,
+) -> dict[str, Any]:
+    """Actually run the tests in the workspace.
+
+    Inside the fix loop, projects first re-run only the failing and
+    affected tests (see :func:`_select_tests` and
+    :func:`_select_toolchain_tests`); the full suite runs to confirm once
+    those pass.
+    """
+    workspace_path = state.get("workspace_path", "")
+    if not workspace_path:
+        return {"test_results": "No workspace", "tests_passing": False}
+
+    language = state.get("spec", {}).get("language", "python")
 
+    if language == "python":
+        previous = state.get("test_report")
+        selected = _select_tests(state, workspace_path)
+        if selected is not None:
+            logger.info("Re-running %d failing/affected test target(s)", len(selected))
+            result, report = _run_pytest(workspace_path, selected, "unit", config)
+            # Only trust the subset run when it pins down concrete failures;
+            # anything else (all green, stale ids) gets a full run.
+            if report is not None and report.failures:
+                passing, output, summary = _pytest_outcome(result, report, previous)
+                return {
+                    "test_results": output,
+                    "tests_passing": passing,
+                    "test_report": summary,
+                    "changed_files": [],
+                }
+            logger.info("Affected tests pass; confirming with the full suite")
+
+        result, report = _run_pytest(workspace_path, ["tests/"], "unit", config)
+        passing, output, summary = _pytest_outcome(result, report, previous)
+        return {
+            "test_results": output,
+            "tests_passing": passing,
+            "test_report": summary,
+            "changed_files": [],
+        }
+
+    env = _toolchain_env(workspace_path, language)
+    selected = _select_toolchain_tests(state, workspace_path, language, env)
+    if selected:
+        logger.info("Re-running tests for %d changed target(s)", len(selected))
+        result = run_command(
+            _toolchain_test_cmd(language, selected), cwd=workspace_path, timeout=120,
+            env=env, sandbox=_sandbox_limits(config),
+        )
+        if not result.success or _console_failed(result.output):
+            return {
+                "test_results": summarize_test_output(result.output),
+                "tests_passing": False,
+                "changed_files": [],
+            }
+        logger.info("Affected tests pass; confirming with the full suite")
+
+    result = run_command(
+        _toolchain_test_cmd(language), cwd=workspace_path, timeout=120, env=env,
+        sandbox=_sandbox_limits(config),
+    )
+    full_output = result.output
+
+    # Detect pass/fail primarily from exit code.
+    passing = result.success and not _console_failed(full_output)
     return {
-        "test_results": output,
+        "test_results": summarize_test_output(full_output),
         "tests_passing": passing,
+        "changed_files": [],
     }
 
 
@@ -245,24 +747,37 @@ def _test_decision(state: dict[str, Any]) -> str:
     return "failing"
 
 
-def _process_fixes(state: dict[str, Any]) -> dict[str, Any]:
-    """Apply bug fixes to workspace."""
-    from summon.workspace import normalize_file_entry
+def _apply_fix_result(state: dict[str, Any], result_key: str, retry_key: str) -> dict[str, Any]:
+    """Apply a fixer's edits to the workspace and bump its retry counter.
 
-    result = state.get("_fix_result", {})
+    Records a per-iteration patch report (files patched/replaced/failed and
+    estimated output-token savings) and the files whose edits did not apply,
+    so the next fixer round is asked for their complete content.  The
+    failures are reset on every call: all fixer loops share the key, so a
+    stale value would leak into another loop's prompt.
+    """
+    result = state.get(result_key, {})
     fixes = result.get("fixes", [])
     workspace_path = state.get("workspace_path", "")
 
+    updates: dict[str, Any] = {"patch_failures": "none"}
     if workspace_path and fixes:
-        ws = Workspace(workspace_path)
-        for fix in fixes:
-            path, content = normalize_file_entry(fix)
-            if path and content:
-                ws.write_file(path, content)
+        report = apply_fixes(Workspace(workspace_path), fixes)
+        updates["patch_failures"] = ", ".join(report.failed) or "none"
+        updates["patch_reports"] = list(state.get("patch_reports", [])) + [
+            {"loop": retry_key, **report.as_dict()}
+        ]
+        updates["changed_files"] = report.patched + report.replaced
 
     retries = dict(state.get("stage_retries", {}))
-    retries["test_fix"] = retries.get("test_fix", 0) + 1
-    return {"stage_retries": retries}
+    retries[retry_key] = retries.get(retry_key, 0) + 1
+    updates["stage_retries"] = retries
+    return updates
+
+
+def _process_fixes(state: dict[str, Any]) -> dict[str, Any]:
+    """Apply bug fixes to workspace."""
+    return _apply_fix_result(state, "_fix_result", "test_fix")
 
 
 def _build_fix_context(state: dict[str, Any]) -> dict[str, Any]:
@@ -272,7 +787,7 @@ def _build_fix_context(state: dict[str, Any]) -> dict[str, Any]:
         return {"source_files": "(no source files)"}
 
     ws = Workspace(workspace_path)
-    files = [f for f in ws.list_files() if not f.startswith("tests/")]
+    files = [f for f in ws.list_project_files() if not f.startswith("tests/")]
     return {"source_files": collect_file_contents(ws, files)}
 
 
@@ -284,10 +799,8 @@ def _build_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 def _check_degeneracy(state: dict[str, Any]) -> dict[str, Any]:
     """Deterministic scan for catastrophically degenerate .py files.
 
-    Checks for:
-    1. Repetition: >30% of non-blank lines are duplicates of a single line
-    2. Syntax errors: compile() fails (truncation, unclosed brackets, etc.)
-    3. Stub-only: all function/method bodies are just pass/Ellipsis/raise NotImplementedError
+    See :func:`summon.degeneracy.check_file` for the checks (repetition,
+    syntax errors, stub-only bodies).
     """
     workspace_path = state.get("workspace_path", "")
     if not workspace_path:
@@ -295,7 +808,7 @@ def _check_degeneracy(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     py_files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if f.endswith(".py")
         and not f.startswith("tests/")
         and not f.startswith(".venv/")
@@ -310,64 +823,9 @@ def _check_degeneracy(state: dict[str, Any]) -> dict[str, Any]:
             content = ws.read_file(py_file)
         except Exception:
             continue
-
-        if not content.strip():
-            continue
-
-        # Check 1: Repetition — >30% of non-blank lines are the same line
-        lines = [line for line in content.splitlines() if line.strip()]
-        if len(lines) > 10:
-            counts = Counter(lines)
-            top_line, top_count = counts.most_common(1)[0]
-            if top_count / len(lines) > 0.30:
-                issues.append({
-                    "file": py_file,
-                    "issue": "repetition",
-                    "detail": f"{top_count}/{len(lines)} lines ({top_count*100//len(lines)}%) are: {top_line[:80]}",
-                })
-                continue  # no need to check further
-
-        # Check 2: Syntax errors via compile()
-        try:
-            compile(content, py_file, "exec")
-        except SyntaxError as exc:
-            issues.append({
-                "file": py_file,
-                "issue": "syntax_error",
-                "detail": f"{exc.msg} (line {exc.lineno})",
-            })
-            continue
-
-        # Check 3: Stub-only bodies — all function/method bodies are pass/Ellipsis/raise
-        try:
-            tree = ast.parse(content)
-        except SyntaxError:
-            continue  # already caught above but just in case
-
-        func_defs = [
-            node for node in ast.walk(tree)
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef))
-        ]
-        if len(func_defs) >= 2:
-            stub_count = 0
-            for func in func_defs:
-                body = func.body
-                # Filter out docstrings
-                stmts = [
-                    s for s in body
-                    if not (isinstance(s, ast.Expr) and isinstance(s.value, (ast.Constant, ast.Str)))
-                ]
-                if not stmts:
-                    stub_count += 1
-                    continue
-                if all(_is_stub_stmt(s) for s in stmts):
-                    stub_count += 1
-            if stub_count == len(func_defs):
-                issues.append({
-                    "file": py_file,
-                    "issue": "stub_only",
-                    "detail": f"All {len(func_defs)} functions have stub-only bodies (pass/Ellipsis/raise NotImplementedError)",
-                })
+        issue = check_file(py_file, content)
+        if issue is not None:
+            issues.append(issue)
 
     return {
         "degenerate_files": json.dumps(issues, indent=2),
@@ -375,26 +833,6 @@ def _check_degeneracy(state: dict[str, Any]) -> dict[str, Any]:
     }
 
 
-def _is_stub_stmt(node: ast.stmt) -> bool:
-    """Return True if a statement is a stub: pass, Ellipsis, or raise NotImplementedError."""
-    if isinstance(node, ast.Pass):
-        return True
-    if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
-        if node.value.value is ...:
-            return True
-    if isinstance(node, ast.Raise):
-        exc = node.exc
-        if exc is not None:
-            # raise NotImplementedError or raise NotImplementedError(...)
-            if isinstance(exc, ast.Name) and exc.id == "NotImplementedError":
-                return True
-            if isinstance(exc, ast.Call):
-                func = exc.func
-                if isinstance(func, ast.Name) and func.id == "NotImplementedError":
-                    return True
-    return False
-
-
 def _degeneracy_decision(state: dict[str, Any]) -> str:
     """Route based on degeneracy check results."""
     if not state.get("degeneracy_detected", False):
@@ -420,7 +858,7 @@ def _build_regen_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     all_files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if f.endswith(".py")
         and not f.startswith("tests/")
         and not f.startswith(".venv/")
@@ -459,8 +897,19 @@ def _process_regen(state: dict[str, Any]) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 
-def _validate_imports(state: dict[str, Any]) -> dict[str, Any]:
-    """Run 'python -c \"import X\"' for every .py file in the workspace."""
+def _validate_imports(
+    state: dict[str, Any], config: SummonConfig | None = None,
+) -> dict[str, Any]:
+    """Fix imports statically, then import every module.
+
+    :mod:`summon.import_graph` applies deterministic rewrites (``src.``
+    prefixes, names imported from the wrong sibling, missing ``__init__``)
+    and reports unresolved names without starting an interpreter.  Every
+    other module is still imported for real, via :mod:`summon.import_check`
+    — one warm interpreter forks a child per module instead of starting a
+    fresh interpreter for each — since circular imports and module-level
+    runtime errors only show up on import.
+    """
     import os
 
     workspace_path = state.get("workspace_path", "")
@@ -472,38 +921,67 @@ def _validate_imports(state: dict[str, Any]) -> dict[str, Any]:
         return {"import_errors": "", "import_validation_passing": True}
 
     ws = Workspace(workspace_path)
+    project_files = [f for f in ws.list_project_files() if f.endswith(".py")]
     py_files = [
-        f for f in ws.list_files()
-        if f.endswith(".py")
-        and not f.startswith("tests/")
-        and not f.startswith(".venv/")
+        f for f in project_files
+        if not f.startswith("tests/")
         and f != "acceptance_test.py"
         and f != "setup.py"
         and not f.endswith("__init__.py")
     ]
 
-    venv_python = os.path.join(workspace_path, ".venv", "bin", "python")
-    python_cmd = venv_python if os.path.exists(venv_python) else "python"
-
-    env = os.environ.copy()
-    env["PYTHONPATH"] = workspace_path
+    analysis = analyze_imports(ws, project_files, targets=py_files)
+    rewrites: list[str] = []
+    if analysis.has_fixes:
+        rewrites = apply_rewrites(ws, analysis)
+        logger.info("Applied %d deterministic import fix(es)", len(rewrites))
+        project_files = [f for f in ws.list_project_files() if f.endswith(".py")]
+        analysis = analyze_imports(ws, project_files, targets=py_files)
 
     errors = []
-    for py_file in py_files:
-        module_name = py_file.replace("/", ".").replace(".py", "")
-        result = run_command(
-            f'{python_cmd} -c "import {module_name}" 2>&1',
-            cwd=workspace_path,
-            timeout=30,
-            env=env,
+    missing_wheels = state.get("missing_wheels") or []
+    if missing_wheels:
+        errors.append(
+            "--- requirements.txt ---\nNot installable offline (missing from the wheelhouse): "
+            + ", ".join(missing_wheels)
+            + "\nUse the standard library or a dependency that is available instead."
+        )
+    unresolved_files = set()
+    for entry in analysis.unresolved:
+        unresolved_files.add(entry["file"])
+        errors.append(f"--- {entry['file']}:{entry['line']} ---\n{entry['reason']}")
+
+    # Modules with unresolved imports already have their error.
+    dynamic_files = [f for f in py_files if f not in unresolved_files]
+    results: list[dict[str, Any]] = []
+    if dynamic_files:
+        venv_python = os.path.join(workspace_path, ".venv", "bin", "python")
+        python_cmd = venv_python if os.path.exists(venv_python) else "python"
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = workspace_path
+
+        results = validate_modules(
+            python_cmd, workspace_path, dynamic_files, env=env, sandbox=_sandbox_limits(config),
+        )
+    logger.info(
+        "Import check: %d module(s) imported, %d statically ambiguous",
+        len(dynamic_files), len(analysis.ambiguous & set(dynamic_files)),
+    )
+    for entry in results:
+        if entry.get("ok"):
+            continue
+        detail = entry.get("traceback") or entry.get("error", "")
+        errors.append(
+            f"--- {entry['file']} (import {entry['module']}) ---\n{clip_output(detail, 1500)}"
         )
-        if not result.success:
-            errors.append(f"--- {py_file} (import {module_name}) ---\n{result.output}")
 
     error_text = "\n\n".join(errors) if errors else ""
     return {
         "import_errors": error_text,
         "import_validation_passing": len(errors) == 0,
+        "import_results": results,
+        "import_rewrites": rewrites,
     }
 
 
@@ -525,7 +1003,7 @@ def _build_import_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if (f.endswith(".py") or f == "requirements.txt")
         and not f.startswith(".venv/")
         and f != "acceptance_test.py"
@@ -535,22 +1013,7 @@ def _build_import_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
 def _process_import_fixes(state: dict[str, Any]) -> dict[str, Any]:
     """Apply import fixes to workspace."""
-    from summon.workspace import normalize_file_entry
-
-    result = state.get("_import_fix_result", {})
-    fixes = result.get("fixes", [])
-    workspace_path = state.get("workspace_path", "")
-
-    if workspace_path and fixes:
-        ws = Workspace(workspace_path)
-        for fix in fixes:
-            path, content = normalize_file_entry(fix)
-            if path and content:
-                ws.write_file(path, content)
-
-    retries = dict(state.get("stage_retries", {}))
-    retries["import_fix"] = retries.get("import_fix", 0) + 1
-    return {"stage_retries": retries}
+    return _apply_fix_result(state, "_import_fix_result", "import_fix")
 
 
 # ---------------------------------------------------------------------------
@@ -558,13 +1021,17 @@ def _process_import_fixes(state: dict[str, Any]) -> dict[str, Any]:
 # ---------------------------------------------------------------------------
 
 
-def _build_adversarial_context(state: dict[str, Any]) -> dict[str, Any]:
-    """Build project files context for adversarial test writer."""
-    return _build_project_files_context(state)
+def _unit_tests_done(state: dict[str, Any]) -> dict[str, Any]:
+    """End of the unit-test loop; joins the test-generation branches."""
+    return {}
 
 
 def _process_adversarial_tests(state: dict[str, Any]) -> dict[str, Any]:
-    """Write adversarial test file to workspace."""
+    """Write adversarial test file to workspace.
+
+    The tests are generated alongside the unit tests but only written once
+    the unit-test loop is done, so that loop never runs them.
+    """
     result = state.get("_adversarial_test_result", {})
     test_code = result.get("test_code", "")
     test_path = result.get("test_file_path", "tests/test_adversarial.py")
@@ -577,48 +1044,24 @@ def _process_adversarial_tests(state: dict[str, Any]) -> dict[str, Any]:
     return {"adversarial_test_code": test_code}
 
 
-def _run_adversarial_tests(state: dict[str, Any]) -> dict[str, Any]:
+def _run_adversarial_tests(
+    state: dict[str, Any], config: SummonConfig | None = None,
+) -> dict[str, Any]:
     """Run only the adversarial tests (not the full suite)."""
-    import os
-
     workspace_path = state.get("workspace_path", "")
     if not workspace_path:
         return {"adversarial_test_results": "No workspace", "adversarial_tests_passing": False}
 
-    venv_python = os.path.join(workspace_path, ".venv", "bin", "python")
-    if os.path.exists(venv_python):
-        cmd = f"{venv_python} -m pytest tests/test_adversarial.py -v --tb=short 2>&1"
-    else:
-        cmd = "python -m pytest tests/test_adversarial.py -v --tb=short 2>&1"
-
-    env = os.environ.copy()
-    pypath_parts = [workspace_path]
-    src_dir = os.path.join(workspace_path, "src")
-    if os.path.isdir(src_dir):
-        pypath_parts.append(src_dir)
-    env["PYTHONPATH"] = os.pathsep.join(pypath_parts)
-
-    result = run_command(cmd, cwd=workspace_path, timeout=120, env=env)
-    output = result.output[:4000]
-
-    passing = result.success
-    if passing:
-        import re
-        fail_patterns = [
-            r'\d+ failed',
-            r'^FAILED ',
-            r'^ERRORS$',
-            r'failures=\d*[1-9]',
-            r'Tests:\s+\d+ failed',
-        ]
-        for pattern in fail_patterns:
-            if re.search(pattern, output, re.MULTILINE):
-                passing = False
-                break
-
+    result, report = _run_pytest(
+        workspace_path, ["tests/test_adversarial.py"], "adversarial", config,
+    )
+    passing, output, summary = _pytest_outcome(
+        result, report, state.get("adversarial_test_report"),
+    )
     return {
         "adversarial_test_results": output,
         "adversarial_tests_passing": passing,
+        "adversarial_test_report": summary,
     }
 
 
@@ -640,7 +1083,7 @@ def _build_adversarial_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if f.endswith(".py")
         and not f.startswith("tests/")
         and not f.startswith(".venv/")
@@ -651,22 +1094,7 @@ def _build_adversarial_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
 def _process_adversarial_fixes(state: dict[str, Any]) -> dict[str, Any]:
     """Apply adversarial bug fixes to workspace and bump retry counter."""
-    from summon.workspace import normalize_file_entry
-
-    result = state.get("_adversarial_fix_result", {})
-    fixes = result.get("fixes", [])
-    workspace_path = state.get("workspace_path", "")
-
-    if workspace_path and fixes:
-        ws = Workspace(workspace_path)
-        for fix in fixes:
-            path, content = normalize_file_entry(fix)
-            if path and content:
-                ws.write_file(path, content)
-
-    retries = dict(state.get("stage_retries", {}))
-    retries["adversarial_fix"] = retries.get("adversarial_fix", 0) + 1
-    return {"stage_retries": retries}
+    return _apply_fix_result(state, "_adversarial_fix_result", "adversarial_fix")
 
 
 # ---------------------------------------------------------------------------
@@ -686,7 +1114,7 @@ def _rebuild_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if not f.startswith(".venv/")
         and not f.startswith("__pycache__/")
         and "__pycache__/" not in f
@@ -718,7 +1146,9 @@ def _process_acceptance_tests(state: dict[str, Any]) -> dict[str, Any]:
     return {"acceptance_test_script": script}
 
 
-def _run_acceptance_tests(state: dict[str, Any]) -> dict[str, Any]:
+def _run_acceptance_tests(
+    state: dict[str, Any], config: SummonConfig | None = None,
+) -> dict[str, Any]:
     """Run the acceptance test script."""
     import os
 
@@ -747,12 +1177,14 @@ def _run_acceptance_tests(state: dict[str, Any]) -> dict[str, Any]:
         cwd=workspace_path,
         timeout=300,
         env=env,
+        sandbox=_sandbox_limits(config),
     )
-    output = result.output[:4000]
+    full_output = result.output
+    output = summarize_test_output(full_output)
 
     # Parse results: look for "ACCEPTANCE RESULTS: X passed, Y failed"
     passing = result.success
-    if "ACCEPTANCE FAIL:" in output:
+    if "ACCEPTANCE FAIL:" in full_output:
         passing = False
 
     return {
@@ -779,7 +1211,7 @@ def _build_acceptance_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
     ws = Workspace(workspace_path)
     files = [
-        f for f in ws.list_files()
+        f for f in ws.list_project_files()
         if f.endswith(".py")
         and not f.startswith("tests/")
         and not f.startswith(".venv/")
@@ -790,22 +1222,7 @@ def _build_acceptance_fix_context(state: dict[str, Any]) -> dict[str, Any]:
 
 def _process_acceptance_fixes(state: dict[str, Any]) -> dict[str, Any]:
     """Apply acceptance test fixes to workspace."""
-    from summon.workspace import normalize_file_entry
-
-    result = state.get("_acceptance_fix_result", {})
-    fixes = result.get("fixes", [])
-    workspace_path = state.get("workspace_path", "")
-
-    if workspace_path and fixes:
-        ws = Workspace(workspace_path)
-        for fix in fixes:
-            path, content = normalize_file_entry(fix)
-            if path and content:
-                ws.write_file(path, content)
-
-    retries = dict(state.get("stage_retries", {}))
-    retries["acceptance_fix"] = retries.get("acceptance_fix", 0) + 1
-    return {"stage_retries": retries}
+    return _apply_fix_result(state, "_acceptance_fix_result", "acceptance_fix")
 
 
 # ---------------------------------------------------------------------------
@@ -822,14 +1239,22 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
         ├─ degenerate → build_regen_context → regenerate → process_regen → install_deps
         └─ force_pass (2 retries) → validate_imports
       → validate_imports ←── (import fix loop, 3 retries)
-      → build_context → write_tests → process_tests
-      → run_tests ←── (unit test fix loop, 3 retries)
-      → build_adversarial_context → write_adversarial_tests → process_adversarial_tests
+      → build_context ─┬─ write_tests → process_tests
+                       │    → run_tests ←── (unit test fix loop, 3 retries)
+                       │    → unit_tests_done ─────────────────┐
+                       ├─ write_adversarial_tests ─────────────┤ (join)
+                       └─ generate_acceptance_criteria         │
+                            → process_criteria ────────────────┤
+      → process_adversarial_tests ←────────────────────────────┘
       → run_adversarial_tests ←── (adversarial fix loop, 3 retries)
-      → rebuild_context → generate_acceptance_criteria → process_criteria
-      → generate_acceptance_tests → process_acceptance_tests
+      → rebuild_context → generate_acceptance_tests → process_acceptance_tests
       → run_acceptance_tests ←── (acceptance fix loop, 2 retries)
       → END
+
+    Adversarial tests and acceptance criteria only need the spec and the
+    source, so they are generated concurrently with the unit tests and
+    joined once the unit-test loop is done — taking both LLM calls off the
+    critical path.
     """
     graph = StateGraph(SummonState)
 
@@ -837,7 +1262,7 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_node("build_integration_context", _build_integration_context)
     graph.add_node("integrate", create_integrator_node(config))
     graph.add_node("process_integration", _process_integration)
-    graph.add_node("install_deps", _install_deps)
+    graph.add_node("install_deps", _with_config(_install_deps, config))
 
     # --- Degeneracy detection & regeneration ---
     graph.add_node("check_degeneracy", _check_degeneracy)
@@ -846,7 +1271,7 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_node("process_regen", _process_regen)
 
     # --- Import validation loop ---
-    graph.add_node("validate_imports", _validate_imports)
+    graph.add_node("validate_imports", _with_config(_validate_imports, config))
     graph.add_node("build_import_fix_context", _build_import_fix_context)
     graph.add_node("fix_imports", create_import_fixer_node(config))
     graph.add_node("process_import_fixes", _process_import_fixes)
@@ -855,16 +1280,16 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_node("build_context", _build_project_files_context)
     graph.add_node("write_tests", create_test_writer_node(config))
     graph.add_node("process_tests", _process_tests)
-    graph.add_node("run_tests", _run_tests)
+    graph.add_node("run_tests", _with_config(_run_tests, config))
     graph.add_node("build_fix_context", _build_fix_context)
     graph.add_node("fix_bugs", create_bug_fixer_node(config))
     graph.add_node("process_fixes", _process_fixes)
+    graph.add_node("unit_tests_done", _unit_tests_done)
 
     # --- Adversarial test loop ---
-    graph.add_node("build_adversarial_context", _build_adversarial_context)
     graph.add_node("write_adversarial_tests", create_adversarial_tester_node(config))
     graph.add_node("process_adversarial_tests", _process_adversarial_tests)
-    graph.add_node("run_adversarial_tests", _run_adversarial_tests)
+    graph.add_node("run_adversarial_tests", _with_config(_run_adversarial_tests, config))
     graph.add_node("build_adversarial_fix_context", _build_adversarial_fix_context)
     graph.add_node("fix_adversarial_bugs", create_adversarial_fixer_node(config))
     graph.add_node("process_adversarial_fixes", _process_adversarial_fixes)
@@ -875,7 +1300,7 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_node("process_criteria", _process_acceptance_criteria)
     graph.add_node("generate_acceptance_tests", create_acceptance_test_gen_node(config))
     graph.add_node("process_acceptance_tests", _process_acceptance_tests)
-    graph.add_node("run_acceptance_tests", _run_acceptance_tests)
+    graph.add_node("run_acceptance_tests", _with_config(_run_acceptance_tests, config))
     graph.add_node("build_acceptance_fix_context", _build_acceptance_fix_context)
     graph.add_node("fix_acceptance", create_acceptance_fixer_node(config))
     graph.add_node("process_acceptance_fixes", _process_acceptance_fixes)
@@ -917,26 +1342,35 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_edge("fix_imports", "process_import_fixes")
     graph.add_edge("process_import_fixes", "install_deps")
 
-    # Unit test loop
+    # Unit tests, adversarial tests and acceptance criteria are generated concurrently
     graph.add_edge("build_context", "write_tests")
+    graph.add_edge("build_context", "write_adversarial_tests")
+    graph.add_edge("build_context", "generate_acceptance_criteria")
+    graph.add_edge("generate_acceptance_criteria", "process_criteria")
+
+    # Unit test loop
     graph.add_edge("write_tests", "process_tests")
     graph.add_edge("process_tests", "run_tests")
     graph.add_conditional_edges(
         "run_tests",
         _test_decision,
         {
-            "passing": "build_adversarial_context",
+            "passing": "unit_tests_done",
             "failing": "build_fix_context",
-            "force_pass": "build_adversarial_context",
+            "force_pass": "unit_tests_done",
         }
     )
     graph.add_edge("build_fix_context", "fix_bugs")
     graph.add_edge("fix_bugs", "process_fixes")
     graph.add_edge("process_fixes", "run_tests")
 
+    # Join: wait for the unit-test loop and both generation branches
+    graph.add_edge(
+        ["unit_tests_done", "write_adversarial_tests", "process_criteria"],
+        "process_adversarial_tests",
+    )
+
     # Adversarial test loop
-    graph.add_edge("build_adversarial_context", "write_adversarial_tests")
-    graph.add_edge("write_adversarial_tests", "process_adversarial_tests")
     graph.add_edge("process_adversarial_tests", "run_adversarial_tests")
     graph.add_conditional_edges(
         "run_adversarial_tests",
@@ -951,10 +1385,8 @@ def create_stage5_graph(config: SummonConfig) -> StateGraph:
     graph.add_edge("fix_adversarial_bugs", "process_adversarial_fixes")
     graph.add_edge("process_adversarial_fixes", "run_adversarial_tests")
 
-    # Acceptance test loop
-    graph.add_edge("rebuild_context", "generate_acceptance_criteria")
-    graph.add_edge("generate_acceptance_criteria", "process_criteria")
-    graph.add_edge("process_criteria", "generate_acceptance_tests")
+    # Acceptance test loop (criteria were generated with the unit tests)
+    graph.add_edge("rebuild_context", "generate_acceptance_tests")
     graph.add_edge("generate_acceptance_tests", "process_acceptance_tests")
     graph.add_edge("process_acceptance_tests", "run_acceptance_tests")
     graph.add_conditional_edges(
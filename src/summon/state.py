@@ -41,6 +41,10 @@ class SummonState(TypedDict, total=False):
     _code_result: dict[str, Any]
     _review_result: dict[str, Any]
     _review_retries: int
+    _waves: list[list[str]]  # component ids per dependency wave (see summon.scheduling)
+    _wave_index: int
+    _component_dependencies: dict[str, list[str]]
+    hld_context_report: dict[str, Any]  # HLD prompt tokens, full vs sliced (see summon.context_slice)
 
     # Stage 5: Testing
     _integration_result: dict[str, Any]
@@ -50,21 +54,31 @@ class SummonState(TypedDict, total=False):
     test_results: str
     bugs: list[str]
     tests_passing: bool
+    test_report: dict[str, Any]  # counts + failing records (see summon.junit)
     _fix_result: dict[str, Any]
     project_files: str
     source_files: str
 
+    # Stage 5: Fixer edit protocol (see summon.patching)
+    patch_failures: str  # files whose edits failed to apply last round
+    patch_reports: list[dict[str, Any]]
+    changed_files: list[str]  # files the last fixer round touched
+
     # Stage 5: Adversarial testing
     _adversarial_test_result: dict[str, Any]
     adversarial_test_code: str
     adversarial_test_results: str
     adversarial_tests_passing: bool
+    adversarial_test_report: dict[str, Any]
 
     # Stage 5: Import validation
     import_errors: str
     import_validation_passing: bool
     _import_fix_result: dict[str, Any]
     import_fix_source_files: str
+    import_results: list[dict[str, Any]]  # per-module {module, file, ok, error, traceback}
+    import_rewrites: list[str]  # deterministic import fixes applied before validation
+    missing_wheels: list[str]  # requirements the offline wheelhouse can't satisfy
 
     # Stage 5: Degeneracy detection & regeneration
     degenerate_files: str  # JSON list of {file, issue, detail}
@@ -0,0 +1,233 @@
+"""Deterministic pre-review checks for Stage 4 coder output.
+
+Many LLM code-review rejections are about things a machine finds
+instantly.  Between ``code`` and ``review`` the component subgraph runs
+:func:`check_component`; mechanically broken output goes straight back to
+the coder with precise diagnostics, and small components that come out
+clean skip the LLM review entirely.
+
+Checks (Python files only):
+
+- syntax errors;
+- stub functions (``...`` / ``raise NotImplementedError`` bodies), except
+  dunders, abstract methods, overloads, Protocol members and methods of
+  subclasses (likely overrides); ``pass`` bodies only count when every
+  function in the file is a stub, as in :func:`summon.degeneracy.check_file`;
+- ``from src.`` / ``import src.`` imports;
+- names that are used but never bound anywhere in the module;
+- HLD interfaces (``func(...)``, ``class Name``) not defined at the top
+  level of any of the component's files.
+"""
+
+from __future__ import annotations
+
+import ast
+import builtins
+import re
+from dataclasses import dataclass
+
+from summon.degeneracy import check_file, is_stub_stmt
+
+_BUILTINS = frozenset(dir(builtins)) | {"__file__", "__name__", "__doc__", "__spec__", "__path__", "__builtins__"}
+
+# "def name(", "class Name", "name(...)" or "Name.method(...)" at the start;
+# a bare name only counts when "(" follows it directly ("Returns (x, y)" is prose).
+_INTERFACE_RE = re.compile(
+    r"^\s*(?:async\s+)?(?:(def|class)\s+)?([A-Za-z_]\w*)(?:\.[A-Za-z_]\w*)?(\()?"
+)
+# Signatures whose first parameter is self/cls describe methods.
+_METHOD_PARAMS_RE = re.compile(r"^\s*\(?\s*(?:self|cls)\b")
+
+_STUB_EXEMPT_DECORATORS = {"abstractmethod", "overload", "abc.abstractmethod", "typing.overload"}
+
+
+@dataclass
+class Diagnostic:
+    path: str
+    line: int
+    code: str  # syntax, stub, src-import, undefined-name, missing-interface
+    message: str
+
+    def __str__(self) -> str:
+        where = f"{self.path}:{self.line}" if self.line else self.path
+        return f"{where}: [{self.code}] {self.message}"
+
+
+def _decorator_names(node: ast.FunctionDef | ast.AsyncFunctionDef | ast.ClassDef) -> set[str]:
+    names = set()
+    for dec in node.decorator_list:
+        target = dec.func if isinstance(dec, ast.Call) else dec
+        try:
+            names.add(ast.unparse(target))
+        except Exception:
+            continue
+    return names
+
+
+def _is_placeholder_body(body: list[ast.stmt]) -> bool:
+    """A body (docstring aside) of only ``...`` / ``raise NotImplementedError``.
+
+    ``pass`` and docstring-only bodies are legitimate no-ops (``emit``,
+    ``__exit__``, hooks) and don't count.
+    """
+    stmts = [
+        s for s in body
+        if not (isinstance(s, ast.Expr) and isinstance(s.value, ast.Constant) and isinstance(s.value.value, str))
+    ]
+    return bool(stmts) and all(is_stub_stmt(s) and not isinstance(s, ast.Pass) for s in stmts)
+
+
+def _stub_functions(tree: ast.Module, path: str, content: str) -> list[Diagnostic]:
+    issue = check_file(path, content)
+    if issue is not None and issue["issue"] == "stub_only":
+        return [Diagnostic(path, 0, "stub", f"{issue['detail']}; write the real implementations")]
+
+    found = []
+
+    def visit(body: list[ast.stmt], exempt: bool) -> None:
+        for node in body:
+            if isinstance(node, ast.ClassDef):
+                bases = {ast.unparse(b) for b in node.bases} - {"object"}
+                # Methods of subclasses may be overrides that are no-ops on purpose.
+                visit(node.body, exempt or bool(bases))
+            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                dunder = node.name.startswith("__") and node.name.endswith("__")
+                if exempt or dunder or _decorator_names(node) & _STUB_EXEMPT_DECORATORS:
+                    continue
+                if _is_placeholder_body(node.body):
+                    found.append(Diagnostic(
+                        path, node.lineno, "stub",
+                        f"`{node.name}` has a stub body; write the real implementation",
+                    ))
+
+    visit(tree.body, False)
+    return found
+
+
+def _src_imports(tree: ast.Module, path: str) -> list[Diagnostic]:
+    found = []
+    for node in ast.walk(tree):
+        modules: list[str] = []
+        if isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+            modules = [node.module]
+        elif isinstance(node, ast.Import):
+            modules = [alias.name for alias in node.names]
+        for module in modules:
+            if module == "src" or module.startswith("src."):
+                found.append(Diagnostic(
+                    path, node.lineno, "src-import",
+                    f"import of `{module}`: files live in the project root, import `{module[4:] or '...'}` directly",
+                ))
+    return found
+
+
+def _bound_names(tree: ast.Module) -> set[str]:
+    """Every name bound anywhere in the module, regardless of scope."""
+    bound: set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, (ast.Store, ast.Del)):
+            bound.add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            bound.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                bound.add((alias.asname or alias.name).split(".")[0])
+        elif isinstance(node, ast.arg):
+            bound.add(node.arg)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            bound.update(node.names)
+        elif isinstance(node, (ast.MatchAs, ast.MatchStar)) and node.name:
+            bound.add(node.name)
+        elif isinstance(node, ast.MatchMapping) and node.rest:
+            bound.add(node.rest)
+    return bound
+
+
+def _undefined_names(tree: ast.Module, path: str) -> list[Diagnostic]:
+    """Names loaded but never bound in the module.
+
+    Deliberately coarse (no per-scope analysis) so it never flags valid
+    code; modules with star imports or a module ``__getattr__`` are skipped.
+    """
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and any(a.name == "*" for a in node.names):
+            return []
+    bound = _bound_names(tree)
+    if "__getattr__" in bound:
+        return []
+    found: dict[str, int] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Load):
+            if node.id not in bound and node.id not in _BUILTINS and node.id not in found:
+                found[node.id] = node.lineno
+    return [
+        Diagnostic(path, line, "undefined-name", f"`{name}` is used but never defined or imported")
+        for name, line in found.items()
+    ]
+
+
+def _top_level_names(tree: ast.Module) -> set[str]:
+    names = set()
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+            targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+            names.update(t.id for t in targets if isinstance(t, ast.Name))
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update((a.asname or a.name).split(".")[0] for a in node.names)
+    return names
+
+
+def interface_names(interfaces: list[str]) -> list[str]:
+    """Names the HLD interfaces promise as top-level definitions.
+
+    Only entries that look like code (``name(...)``, ``def name``,
+    ``class Name``, ``Name.method(...)``) count; prose and method
+    signatures (first parameter ``self`` / ``cls``) are ignored.
+    """
+    names = []
+    for entry in interfaces:
+        entry = str(entry)
+        match = _INTERFACE_RE.match(entry)
+        if not match or not (match.group(1) or match.group(3)):
+            continue
+        if match.group(1) != "class" and _METHOD_PARAMS_RE.match(entry[match.end():]):
+            continue
+        if match.group(2) not in names:
+            names.append(match.group(2))
+    return names
+
+
+def check_component(
+    files: list[tuple[str, str]], interfaces: list[str] | None = None,
+) -> list[Diagnostic]:
+    """Run the deterministic checks over a component's (path, content) files."""
+    diagnostics: list[Diagnostic] = []
+    defined: set[str] = set()
+    parsed_any = False
+    for path, content in files:
+        if not path.endswith(".py"):
+            continue
+        try:
+            tree = ast.parse(content)
+        except SyntaxError as exc:
+            diagnostics.append(Diagnostic(path, exc.lineno or 0, "syntax", exc.msg))
+            continue
+        parsed_any = True
+        defined |= _top_level_names(tree)
+        diagnostics += _src_imports(tree, path)
+        diagnostics += _stub_functions(tree, path, content)
+        diagnostics += _undefined_names(tree, path)
+
+    if parsed_any and not any(d.code == "syntax" for d in diagnostics):
+        for name in interface_names(interfaces or []):
+            if name not in defined:
+                diagnostics.append(Diagnostic(
+                    "(component)", 0, "missing-interface",
+                    f"HLD interface `{name}` is not defined at the top level of any file "
+                    "(define it as a module-level function/class so others can import it)",
+                ))
+    return diagnostics
@@ -10,10 +10,12 @@ from typing import Any
 from langchain_core.messages import HumanMessage, SystemMessage
 
 from summon.agents.base import _extract_json
+from summon.concurrency import limiter
 from summon.config import SummonConfig
 from summon.models import get_llm
 from summon.prompts.supervisor import GATE_EVALUATION
 from summon.schemas.quality import GateResult
+from summon.workspace import expand_component_results
 
 logger = logging.getLogger(__name__)
 
@@ -27,10 +29,14 @@ def create_gate_node(config: SummonConfig, stage_name: str, stage_key: str):
         stage_key: The state key containing the stage's output to evaluate
     """
     threshold = config.get_threshold(stage_name)
+    llm_slots = limiter("llm", config.max_concurrent_llm_calls)
 
     def gate_node(state: dict[str, Any]) -> dict[str, Any]:
         spec = state.get("spec", {})
         stage_output = state.get(stage_key, {})
+        if stage_key == "component_results":
+            # Stage 4 results are manifests; the gate has to see the code.
+            stage_output = expand_component_results(stage_output, state.get("workspace_path", ""))
 
         # Get previous feedback if this is a retry
         gate_results = state.get("gate_results", [])
@@ -64,7 +70,8 @@ def create_gate_node(config: SummonConfig, stage_name: str, stage_key: str):
             if attempt > 1:
                 time.sleep(min(2 ** (attempt - 1), 30))
             try:
-                response = llm.invoke(messages)
+                with llm_slots.slot(state.get("_priority", 0.0)):
+                    response = llm.invoke(messages)
                 result = _extract_json(response.content)
                 break
             except Exception as exc:
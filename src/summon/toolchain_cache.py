@@ -0,0 +1,180 @@
+"""Shared caches for TypeScript and Go generated projects.
+
+Python projects clone their venv from :mod:`summon.venv_cache`; without
+this module, TypeScript projects ran a full ``npm install`` and Go projects
+downloaded and compiled every module from scratch on each loop.  Now:
+
+- ``node_modules`` is built once per lockfile (or, without one, per
+  dependency set in package.json) under ``~/.summon/toolchains/node_modules``
+  and cloned into the workspace, using the same clone-and-marker scheme as
+  venvs.  npm itself runs with a shared download cache and
+  ``--prefer-offline``, and jest with a shared transform cache.
+- Go gets shared ``GOMODCACHE`` and ``GOCACHE`` directories, so module
+  downloads, compiled packages and passing test results carry over between
+  loops and runs.
+
+For incremental runs inside the fix loop, :func:`go_affected_packages`
+maps changed files to the packages that contain or import them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from pathlib import Path
+
+from summon.capture import clip_output
+from summon.executor import run_command
+from summon.venv_cache import ensure_venv
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".summon" / "toolchains"
+
+NODE_SOURCE_SUFFIXES = (".ts", ".tsx", ".js", ".jsx", ".mjs", ".cjs")
+
+
+def toolchain_env(language: str, cache_dir: str | Path | None = None) -> dict[str, str]:
+    """Environment variables pointing npm or Go at the shared caches."""
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    if language == "typescript":
+        return {
+            "npm_config_cache": str(root / "npm"),
+            "npm_config_prefer_offline": "true",
+            "npm_config_audit": "false",
+            "npm_config_fund": "false",
+        }
+    if language == "go":
+        return {
+            "GOMODCACHE": str(root / "go" / "mod"),
+            "GOCACHE": str(root / "go" / "build"),
+            # Module cache files are read-only by default, which breaks cleanup.
+            "GOFLAGS": " ".join(filter(None, [os.environ.get("GOFLAGS", ""), "-modcacherw"])),
+        }
+    return {}
+
+
+def jest_cache_dir(cache_dir: str | Path | None = None) -> str:
+    root = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return str(root / "jest")
+
+
+# ---------------------------------------------------------------------------
+# node_modules
+# ---------------------------------------------------------------------------
+
+
+def node_modules_key(workspace_path: str | Path, node_id: str) -> str | None:
+    """Cache key for the workspace's dependencies, or None if uncacheable.
+
+    Keyed by package-lock.json when present; otherwise by the dependency
+    sections of package.json.  Local (``file:``/``link:``) dependencies
+    depend on files outside the key, so they aren't cached.
+    """
+    root = Path(workspace_path)
+    try:
+        package = json.loads((root / "package.json").read_text())
+    except (OSError, ValueError):
+        return None
+    sections = {
+        name: package.get(name) or {}
+        for name in ("dependencies", "devDependencies", "optionalDependencies")
+    }
+    specs = [str(v) for section in sections.values() if isinstance(section, dict) for v in section.values()]
+    if any(spec.startswith(("file:", "link:", ".", "/")) for spec in specs):
+        return None
+    lock = root / "package-lock.json"
+    payload = lock.read_text() if lock.exists() else json.dumps(sections, sort_keys=True)
+    digest = hashlib.sha256(f"{node_id}\n{payload}".encode()).hexdigest()
+    return digest[:24]
+
+
+def ensure_node_modules(
+    workspace_path: str | Path,
+    node_id: str,
+    cache_dir: str | Path | None = None,
+) -> bool:
+    """Clone ``node_modules`` from the cache, installing once on a miss.
+
+    The install runs in a scratch copy of package.json (and the lockfile)
+    so a failed install leaves the workspace untouched.  Returns False when
+    the dependencies can't be cached or the install failed; the caller
+    falls back to ``npm install`` in the workspace.
+    """
+    root = Path(workspace_path)
+    key = node_modules_key(root, node_id)
+    if key is None:
+        return False
+    base = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    env = {**os.environ, **toolchain_env("typescript", base)}
+    has_lock = (root / "package-lock.json").exists()
+
+    def build(target: Path) -> bool:
+        with tempfile.TemporaryDirectory(prefix="summon-npm-") as scratch:
+            for name in ("package.json", "package-lock.json", ".npmrc"):
+                if (root / name).exists():
+                    shutil.copy2(root / name, Path(scratch) / name)
+            result = run_command(
+                ["npm", "ci" if has_lock else "install"], cwd=scratch, env=env, timeout=300,
+            )
+            if not result.success:
+                logger.warning("npm install failed:\n%s", clip_output(result.output, 2000))
+                return False
+            modules = Path(scratch) / "node_modules"
+            if not modules.exists():
+                modules.mkdir()  # no dependencies at all
+            shutil.move(str(modules), str(target))
+        return True
+
+    status = ensure_venv(root / "node_modules", key, build, cache_dir=base / "node_modules")
+    logger.info("node_modules %s (%s)", status, key)
+    return status != "failed"
+
+
+# ---------------------------------------------------------------------------
+# Go packages
+# ---------------------------------------------------------------------------
+
+
+def go_affected_packages(
+    workspace_path: str | Path, changed: list[str], env: dict[str, str] | None = None,
+) -> list[str] | None:
+    """Package patterns (``./pkg``) containing or importing *changed* files.
+
+    Includes packages whose tests import a changed package.  Returns None
+    when ``go list`` fails, so the caller runs everything.
+    """
+    root = Path(workspace_path).resolve()
+    result = run_command(
+        ["go", "list", "-e", "-f",
+         "{{.ImportPath}}\t{{.Dir}}\t{{join .Deps \" \"}} {{join .TestImports \" \"}} {{join .XTestImports \" \"}}",
+         "./..."],
+        cwd=root, env=env, timeout=120,
+    )
+    if not result.success:
+        return None
+
+    packages: dict[str, tuple[Path, set[str]]] = {}
+    for line in result.stdout.splitlines():
+        parts = line.split("\t")
+        if len(parts) == 3:
+            packages[parts[0]] = (Path(parts[1]), set(parts[2].split()))
+
+    changed_dirs = {(root / f).parent.resolve() for f in changed}
+    touched = {path for path, (pkg_dir, _) in packages.items() if pkg_dir in changed_dirs}
+    affected = sorted(
+        pkg_dir for path, (pkg_dir, deps) in packages.items()
+        if path in touched or deps & touched
+    )
+    patterns = []
+    for pkg_dir in affected:
+        try:
+            rel = pkg_dir.relative_to(root).as_posix()
+        except ValueError:
+            continue
+        patterns.append("." if rel == "." else f"./{rel}")
+    return patterns
@@ -0,0 +1,192 @@
+"""Content-addressed virtualenv cache for generated Python projects.
+
+``install_deps`` used to create a fresh ``.venv`` and install requirements
+after every regeneration and import-fix loop, even when requirements.txt
+hadn't changed — 30–180 s each time.  Venvs are now keyed by a hash of the
+interpreter and the normalized requirements and built once under
+``~/.summon/venvs/<hash>``.  A workspace gets a clone (reflinks where the
+filesystem supports them, otherwise hardlinks, otherwise a copy) with a
+marker recording the hash, and installation is skipped entirely while the
+marker matches.
+
+Hardlinked files are shared with the cache, so clones are only ever
+modified by replacing files, never by writing into them — which is also
+how pip, uv and Python's bytecode cache update files.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import shutil
+import subprocess
+from pathlib import Path
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_DIR = Path.home() / ".summon" / "venvs"
+
+# Written into a workspace venv with the hash it was cloned from.
+MARKER = ".summon-venv-hash"
+
+# Requirement lines whose meaning depends on files outside the hash.
+_UNCACHEABLE = re.compile(r"^(-e|--editable|-r|--requirement|-c|--constraint)\b|^(\.{1,2}/|/|file:)")
+
+_NAME_RE = re.compile(r"^([A-Za-z0-9][A-Za-z0-9._-]*)(.*)$")
+
+
+def normalize_requirements(text: str) -> list[str] | None:
+    """Sorted, de-duplicated requirement lines with PEP 503 names.
+
+    Comments, blank lines and whitespace are dropped.  Returns None if a
+    line refers to local files or other requirement files, whose contents
+    the hash can't see.
+    """
+    lines: set[str] = set()
+    for raw in text.splitlines():
+        line = raw.split(" #", 1)[0].strip()
+        if not line or line.startswith("#"):
+            continue
+        if _UNCACHEABLE.match(line):
+            return None
+        match = _NAME_RE.match(line)
+        if match:
+            name = re.sub(r"[-_.]+", "-", match.group(1)).lower()
+            line = name + re.sub(r"\s+", "", match.group(2))
+        lines.add(line)
+    return sorted(lines)
+
+
+def venv_key(python_id: str, requirements: str, extra: tuple[str, ...] = ("pytest",)) -> str | None:
+    """Cache key for (interpreter, requirements + *extra*), or None if uncacheable."""
+    normalized = normalize_requirements(requirements)
+    if normalized is None:
+        return None
+    payload = "\n".join([python_id, *normalized, "--", *sorted(extra)])
+    return hashlib.sha256(payload.encode()).hexdigest()[:24]
+
+
+def read_marker(venv_dir: str | Path) -> str:
+    try:
+        return (Path(venv_dir) / MARKER).read_text().strip()
+    except OSError:
+        return ""
+
+
+def cached(key: str, cache_dir: str | Path | None = None) -> bool:
+    """Whether the cache already holds a venv for *key*."""
+    cache = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    return (cache / key / MARKER).exists()
+
+
+def _reflink_tree(src: Path, dst: Path) -> bool:
+    try:
+        proc = subprocess.run(
+            ["cp", "-a", "--reflink=always", str(src), str(dst)],
+            capture_output=True, timeout=300,
+        )
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    if proc.returncode != 0:
+        shutil.rmtree(dst, ignore_errors=True)
+        return False
+    return True
+
+
+def _hardlink_tree(src: Path, dst: Path) -> None:
+    for root, dirs, files in os.walk(src):
+        rel = Path(root).relative_to(src)
+        target_dir = dst / rel
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for name in dirs + files:
+            source = Path(root) / name
+            target = target_dir / name
+            if source.is_symlink():
+                target.symlink_to(os.readlink(source))
+                if name in dirs:
+                    dirs.remove(name)  # don't walk into symlinked dirs
+            elif name in files:
+                os.link(source, target)
+
+
+def clone_tree(src: str | Path, dst: str | Path) -> str:
+    """Clone *src* to *dst*; returns the method used: reflink, hardlink or copy."""
+    src, dst = Path(src), Path(dst)
+    if _reflink_tree(src, dst):
+        return "reflink"
+    try:
+        _hardlink_tree(src, dst)
+        return "hardlink"
+    except OSError:
+        shutil.rmtree(dst, ignore_errors=True)  # e.g. cross-device
+    shutil.copytree(src, dst, symlinks=True)
+    return "copy"
+
+
+def _relocate(venv_dir: Path, old: Path) -> None:
+    """Point scripts in ``bin/`` at *venv_dir* instead of the cache entry.
+
+    Files are replaced rather than rewritten so hardlinked cache files are
+    never modified.
+    """
+    old_bytes, new_bytes = str(old).encode(), str(venv_dir).encode()
+    for path in [*(venv_dir / "bin").glob("*"), venv_dir / "pyvenv.cfg"]:
+        if path.is_symlink() or not path.is_file():
+            continue
+        try:
+            content = path.read_bytes()
+        except OSError:
+            continue
+        if old_bytes not in content:
+            continue
+        mode = path.stat().st_mode
+        path.unlink()
+        path.write_bytes(content.replace(old_bytes, new_bytes))
+        path.chmod(mode)
+
+
+def ensure_venv(
+    venv_dir: str | Path,
+    key: str,
+    build: Callable[[Path], bool],
+    cache_dir: str | Path | None = None,
+) -> str:
+    """Make *venv_dir* a clone of the cached venv for *key*.
+
+    ``build(path)`` creates and populates a venv at *path* on a cache miss
+    and returns whether it succeeded.  Returns ``"current"`` (marker already
+    matches), ``"cloned"`` (cache hit), ``"built"`` (cache miss) or
+    ``"failed"`` (build failed; *venv_dir* untouched).
+    """
+    venv_dir = Path(venv_dir)
+    if read_marker(venv_dir) == key:
+        return "current"
+
+    cache = Path(cache_dir) if cache_dir is not None else DEFAULT_CACHE_DIR
+    entry = cache / key
+    status = "cloned"
+    if not cached(key, cache):
+        status = "built"
+        cache.mkdir(parents=True, exist_ok=True)
+        staging = cache / f"{key}.tmp-{os.getpid()}"
+        shutil.rmtree(staging, ignore_errors=True)
+        if not build(staging):
+            shutil.rmtree(staging, ignore_errors=True)
+            return "failed"
+        (staging / MARKER).write_text(key)
+        try:
+            staging.rename(entry)
+        except OSError:
+            # Another process published the same entry first.
+            shutil.rmtree(staging, ignore_errors=True)
+        else:
+            _relocate(entry, staging)
+
+    shutil.rmtree(venv_dir, ignore_errors=True)
+    method = clone_tree(entry, venv_dir)
+    _relocate(venv_dir, entry)
+    logger.info("Venv %s from cache %s (%s)", status, key, method)
+    return status
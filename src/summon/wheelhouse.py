@@ -0,0 +1,197 @@
+"""Local wheelhouse for offline dependency installation.
+
+Build farms without outbound network can't install a generated project's
+requirements from PyPI.  A wheelhouse is a plain directory of wheels (and
+sdists) populated ahead of time with ``summon wheelhouse add``; when
+``wheelhouse`` is set in summon.yaml, Stage 5 installs with
+``--offline --no-index --find-links <dir>``.
+
+Before installing, :func:`missing_requirements` checks the requirements —
+and, through each wheel's ``Requires-Dist`` metadata, their dependencies —
+against the directory, so missing wheels are reported up front instead of
+surfacing as a resolver error halfway through an install.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import shutil
+import subprocess
+import sys
+import zipfile
+from dataclasses import dataclass
+from email.parser import Parser
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+_SDIST_SUFFIXES = (".tar.gz", ".zip", ".tar.bz2")
+
+
+def canonical_name(name: str) -> str:
+    """PEP 503 normalized project name."""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+
+@dataclass
+class Distribution:
+    name: str
+    version: str
+    path: Path
+
+    @property
+    def is_wheel(self) -> bool:
+        return self.path.suffix == ".whl"
+
+
+def scan(wheelhouse: str | Path) -> dict[str, list[Distribution]]:
+    """Index the wheelhouse by canonical project name."""
+    index: dict[str, list[Distribution]] = {}
+    root = Path(wheelhouse)
+    if not root.is_dir():
+        return index
+    for path in sorted(root.iterdir()):
+        name = path.name
+        if name.endswith(".whl"):
+            parts = name[:-4].split("-")
+            if len(parts) < 5:
+                continue
+            project, version = parts[0], parts[1]
+        else:
+            suffix = next((s for s in _SDIST_SUFFIXES if name.endswith(s)), None)
+            if suffix is None or "-" not in name:
+                continue
+            project, _, version = name[: -len(suffix)].rpartition("-")
+        index.setdefault(canonical_name(project), []).append(Distribution(project, version, path))
+    return index
+
+
+def _parse_requirement(line: str) -> tuple[str, str, str] | None:
+    """Split a requirement into (canonical name, specifier, marker).
+
+    Uses :mod:`packaging` when available; otherwise only the name is
+    checked.
+    """
+    try:
+        from packaging.requirements import InvalidRequirement, Requirement
+    except ImportError:
+        match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", line)
+        if not match:
+            return None
+        marker = line.split(";", 1)[1].strip() if ";" in line else ""
+        return canonical_name(match.group(1)), "", marker
+    try:
+        req = Requirement(line)
+    except InvalidRequirement:
+        return None
+    return canonical_name(req.name), str(req.specifier), str(req.marker or "")
+
+
+def _marker_applies(marker: str) -> bool:
+    """Evaluate an environment marker for this interpreter (extras are off)."""
+    if not marker:
+        return True
+    try:
+        from packaging.markers import InvalidMarker, Marker, UndefinedComparison
+    except ImportError:
+        return "extra" not in marker
+    try:
+        return Marker(marker).evaluate({"extra": ""})
+    except (InvalidMarker, UndefinedComparison):
+        return True
+
+
+def _satisfies(dist: Distribution, specifier: str) -> bool:
+    if not specifier:
+        return True
+    try:
+        from packaging.specifiers import SpecifierSet
+        from packaging.version import InvalidVersion, Version
+    except ImportError:
+        return True
+    try:
+        return SpecifierSet(specifier).contains(Version(dist.version), prereleases=True)
+    except InvalidVersion:
+        return True
+
+
+def _wheel_requires(path: Path) -> list[str]:
+    """``Requires-Dist`` entries from a wheel's METADATA."""
+    try:
+        with zipfile.ZipFile(path) as whl:
+            meta_name = next(
+                (n for n in whl.namelist() if n.endswith(".dist-info/METADATA")), None,
+            )
+            if meta_name is None:
+                return []
+            metadata = Parser().parsestr(whl.read(meta_name).decode("utf-8", "replace"))
+    except (OSError, zipfile.BadZipFile):
+        return []
+    return metadata.get_all("Requires-Dist") or []
+
+
+def missing_requirements(requirements: list[str], wheelhouse: str | Path) -> list[str]:
+    """Requirements (including transitive ones) with no matching distribution.
+
+    Dependencies are followed through wheel metadata; sdists are accepted
+    as-is since their dependencies are only known after a build.
+    """
+    index = scan(wheelhouse)
+    missing: list[str] = []
+    seen: set[str] = set()
+    queue = [(line, "") for line in requirements]
+    while queue:
+        line, parent = queue.pop(0)
+        parsed = _parse_requirement(line)
+        if parsed is None:
+            continue
+        name, specifier, marker = parsed
+        if not _marker_applies(marker) or (name, specifier) in seen:
+            continue
+        seen.add((name, specifier))
+        matches = [d for d in index.get(name, []) if _satisfies(d, specifier)]
+        if not matches:
+            missing.append(f"{name}{specifier}" + (f" (required by {parent})" if parent else ""))
+            continue
+        wheel = next((d for d in reversed(matches) if d.is_wheel), None)
+        if wheel is not None:
+            queue += [(dep, name) for dep in _wheel_requires(wheel.path)]
+    return missing
+
+
+def install_args(wheelhouse: str | Path, uv: bool = True) -> list[str]:
+    """Installer flags for an offline install from *wheelhouse*."""
+    args = ["--no-index", "--find-links", str(Path(wheelhouse).resolve())]
+    return ["--offline", *args] if uv else args
+
+
+def add(
+    wheelhouse: str | Path,
+    packages: list[str],
+    requirement_files: list[str] | None = None,
+    python: str = sys.executable,
+) -> subprocess.CompletedProcess[str] | None:
+    """Add distributions to the wheelhouse (run on a connected machine).
+
+    Local ``.whl`` / sdist files are copied in; everything else, plus the
+    contents of *requirement_files*, is fetched with ``pip download``
+    together with its dependencies.
+    """
+    root = Path(wheelhouse)
+    root.mkdir(parents=True, exist_ok=True)
+    to_download: list[str] = []
+    for package in packages:
+        path = Path(package)
+        if path.is_file() and (path.suffix == ".whl" or path.name.endswith(_SDIST_SUFFIXES)):
+            shutil.copy2(path, root / path.name)
+        else:
+            to_download.append(package)
+    for req_file in requirement_files or []:
+        to_download += ["-r", req_file]
+    if not to_download:
+        return None
+    return subprocess.run(
+        [python, "-m", "pip", "download", "--dest", str(root), *to_download],
+        capture_output=True, text=True,
+    )
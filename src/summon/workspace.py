@@ -4,9 +4,11 @@ from __future__ import annotations
 
 import atexit
 import logging
+import os
 import shutil
 import tempfile
 from pathlib import Path
+from typing import Any
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +28,12 @@ def _cleanup_temp_dirs() -> None:
 
 atexit.register(_cleanup_temp_dirs)
 
+# Directories that never hold project sources — skipped when walking the tree.
+_IGNORED_DIRS = frozenset({
+    ".venv", "venv", "__pycache__", ".git", "node_modules",
+    ".pytest_cache", ".mypy_cache", ".ruff_cache", ".summon",
+})
+
 
 class Workspace:
     """Manages a temporary directory for generated project files."""
@@ -45,6 +53,7 @@ class Workspace:
         full_path = self.path / relative_path
         full_path.parent.mkdir(parents=True, exist_ok=True)
         full_path.write_text(content, errors="replace")
+        _read_cache.pop(str(full_path), None)
         return full_path
 
     def read_file(self, relative_path: str) -> str:
@@ -63,6 +72,22 @@ class Workspace:
             if p.is_file()
         ]
 
+    def list_project_files(self) -> list[str]:
+        """List project files in sorted order, pruning venvs, caches and VCS dirs.
+
+        Unlike :meth:`list_files`, this never descends into ``.venv`` or
+        ``node_modules``, so it stays cheap once dependencies are installed.
+        """
+        found: list[str] = []
+        for root, dirs, names in os.walk(self.path):
+            dirs[:] = [d for d in dirs if d not in _IGNORED_DIRS]
+            rel_root = Path(root).relative_to(self.path)
+            for name in names:
+                if name.endswith((".pyc", ".pyo")):
+                    continue
+                found.append((rel_root / name).as_posix())
+        return sorted(found)
+
     def cleanup(self) -> None:
         """Remove the workspace directory."""
         if self._temp_dir and Path(self._temp_dir).exists():
@@ -76,43 +101,113 @@ class Workspace:
 DEFAULT_CONTEXT_BUDGET = 100_000
 
 
+# Per-file cache: absolute path → ((mtime_ns, size), content hash, content,
+# rendered entry, entry size in bytes).  Entries are also dropped by
+# Workspace.write_file.
+_read_cache: dict[str, tuple[tuple[int, int], str, str, str, int]] = {}
+
+# Assembled contexts keyed by ((path, content hash), ...), budget, map budget.
+_context_cache: dict[tuple, str] = {}
+_CONTEXT_CACHE_LIMIT = 64
+
+
+def _read_cached(ws: Workspace, relative_path: str) -> tuple[str, str, str, int]:
+    """Return (content hash, content, rendered entry, entry size).
+
+    The file is re-read and re-rendered only when its stat signature changed.
+    """
+    from summon.repomap import content_hash
+
+    full_path = ws.path / relative_path
+    st = full_path.stat()
+    signature = (st.st_mtime_ns, st.st_size)
+    key = str(full_path)
+    cached = _read_cache.get(key)
+    if cached is not None and cached[0] == signature:
+        return cached[1:]
+
+    content = full_path.read_text()
+    digest = content_hash(content)
+    entry = f"=== {relative_path} ===\n{content}\n"
+    entry_size = len(entry.encode("utf-8", errors="replace"))
+    _read_cache[key] = (signature, digest, content, entry, entry_size)
+    return digest, content, entry, entry_size
+
+
 def collect_file_contents(
     ws: Workspace,
     files: list[str],
     budget: int = DEFAULT_CONTEXT_BUDGET,
+    map_budget: int | None = None,
 ) -> str:
     """Concatenate file contents with a byte budget.
 
     Reads files in order.  Once the cumulative size would exceed *budget*,
-    remaining files are listed by name only (not content).
+    remaining files are summarized in a repo map instead (module outline:
+    imports, constants, classes, function signatures — see
+    :mod:`summon.repomap`).  The map has its own budget, *map_budget*
+    (default: a quarter of *budget*); files past it are listed by name only.
+
+    Results are memoized on (file content hashes, budgets): when nothing in
+    *files* changed since the last call, the previously assembled string is
+    returned as-is, and each file's section is rendered identically across
+    calls so provider-side prompt caches keep hitting.
     """
-    parts: list[str] = []
-    used = 0
-    skipped: list[str] = []
+    from summon.repomap import render_map_entry
 
+    if map_budget is None:
+        map_budget = budget // 4
+
+    loaded: list[tuple[str, str, str, str, int]] = []
     for f in files:
         try:
-            content = ws.read_file(f)
+            loaded.append((f, *_read_cached(ws, f)))
         except Exception:
             continue
 
-        entry = f"=== {f} ===\n{content}\n"
-        entry_size = len(entry.encode("utf-8", errors="replace"))
+    cache_key = (tuple((f, d) for f, d, *_ in loaded), budget, map_budget)
+    cached = _context_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    parts: list[str] = []
+    used = 0
+    skipped: list[tuple[str, str]] = []
 
+    for f, _digest, content, entry, entry_size in loaded:
         if used + entry_size > budget and used > 0:
-            skipped.append(f)
+            skipped.append((f, content))
             continue
 
         parts.append(entry)
         used += entry_size
 
     if skipped:
+        map_entries: list[str] = []
+        unmapped: list[str] = []
+        map_used = 0
+        for f, content in skipped:
+            map_entry = render_map_entry(f, content)
+            map_size = len(map_entry.encode("utf-8", errors="replace"))
+            if map_used + map_size > map_budget:
+                unmapped.append(f)
+                continue
+            map_entries.append(map_entry)
+            map_used += map_size
+
         parts.append(
-            f"\n(Omitted {len(skipped)} files due to context budget: "
-            + ", ".join(skipped) + ")"
+            f"\n(Omitted {len(skipped)} files due to context budget. "
+            "Repository map of omitted files — signatures only, bodies not shown:)\n"
+            + "\n".join(map_entries)
         )
+        if unmapped:
+            parts.append("(Not mapped: " + ", ".join(unmapped) + ")")
 
-    return "\n".join(parts) or "(no files)"
+    result = "\n".join(parts) or "(no files)"
+    if len(_context_cache) >= _CONTEXT_CACHE_LIMIT:
+        _context_cache.pop(next(iter(_context_cache)))
+    _context_cache[cache_key] = result
+    return result
 
 
 def normalize_file_entry(entry: dict) -> tuple[str, str]:
@@ -138,3 +233,26 @@ def normalize_file_entry(entry: dict) -> tuple[str, str]:
         or ""
     )
     return str(path).strip(), str(content)
+
+
+def expand_component_results(
+    results: list[dict[str, Any]], workspace_path: str = "",
+) -> list[dict[str, Any]]:
+    """Latest result per component, with file contents filled in.
+
+    Stage 4 results carry file manifests (path, hash, line count); the
+    contents are read back from *workspace_path*.
+    """
+    ws = Workspace(workspace_path) if workspace_path else None
+    latest = {r.get("component_id", ""): r for r in results}
+    expanded = []
+    for result in latest.values():
+        files = []
+        for f in result.get("files", []):
+            path, content = normalize_file_entry(f)
+            if path and not content and ws is not None and ws.file_exists(path):
+                content = ws.read_file(path)
+            if path:
+                files.append({"path": path, "content": content})
+        expanded.append({**result, "files": files})
+    return expanded
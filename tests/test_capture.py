@@ -0,0 +1,77 @@
+"""Tests for bounded capture and test-output summaries."""
+
+from summon.capture import HeadTailBuffer, clip_output, summarize_test_output
+
+
+def _pytest_output(passed: int = 300) -> str:
+    lines = ["============================= test session starts =============================="]
+    lines += [f"tests/test_main.py::test_ok_{i} PASSED" for i in range(passed)]
+    lines += [
+        "=================================== FAILURES ===================================",
+        "_________________________________ test_parse __________________________________",
+        "tests/test_main.py:10: in test_parse",
+        "    assert parse('a') == ['a']",
+        "E   AssertionError: assert ['b'] == ['a']",
+        "_________________________________ test_render _________________________________",
+        "tests/test_main.py:20: in test_render",
+        "E   TypeError: render() missing 1 required positional argument",
+        "=========================== short test summary info ============================",
+        "FAILED tests/test_main.py::test_parse - AssertionError: assert ['b'] == ['a']",
+        "FAILED tests/test_main.py::test_render - TypeError: render() missing 1 required",
+        f"======================== 2 failed, {passed} passed in 1.23s ========================",
+    ]
+    return "\n".join(lines)
+
+
+def test_head_tail_buffer_keeps_both_ends():
+    buf = HeadTailBuffer(100, head=20)
+    for i in range(1000):
+        buf.write(f"{i}\n".encode())
+    value = buf.getvalue()
+    assert value.startswith("0\n1\n2\n")
+    assert value.endswith("998\n999\n")
+    assert buf.dropped > 0
+    assert "bytes truncated" in value
+
+
+def test_head_tail_buffer_small_input_untouched():
+    buf = HeadTailBuffer(100)
+    buf.write(b"hello ")
+    buf.write(b"world")
+    assert buf.getvalue() == "hello world"
+    assert buf.dropped == 0
+
+
+def test_clip_output_prefers_tail():
+    text = "".join(f"line {i}\n" for i in range(1000))
+    clipped = clip_output(text, 400)
+    assert len(clipped) <= 400
+    assert clipped.startswith("line 0\n")
+    assert "line 999" in clipped
+
+
+def test_summarize_keeps_failures_not_passed_lines():
+    output = _pytest_output()
+    assert len(output) > 4000
+    summary = summarize_test_output(output)
+    assert len(summary) <= 4000
+    assert "2 failed, 300 passed" in summary
+    assert "E   AssertionError: assert ['b'] == ['a']" in summary
+    assert "E   TypeError" in summary
+    assert "FAILED tests/test_main.py::test_render" in summary
+    assert "PASSED" not in summary
+
+
+def test_summarize_short_output_unchanged():
+    output = _pytest_output(passed=2)
+    assert summarize_test_output(output) == output
+
+
+def test_summarize_acceptance_output():
+    lines = [f"ACCEPTANCE PASS: AC-{i:03d} — ok" for i in range(200)]
+    lines.insert(5, "ACCEPTANCE FAIL: AC-900 — export: file not created")
+    lines.append("ACCEPTANCE RESULTS: 200 passed, 1 failed, 0 skipped out of 201")
+    summary = summarize_test_output("\n".join(lines), budget=1000)
+    assert len(summary) <= 1000
+    assert "ACCEPTANCE FAIL: AC-900" in summary
+    assert "ACCEPTANCE RESULTS: 200 passed, 1 failed" in summary
@@ -0,0 +1,167 @@
+"""Tests for cross-run Stage 4 component memoization."""
+
+from summon import component_cache
+from summon.config import SummonConfig
+from summon.context_slice import hld_slice, spec_slice
+from summon.stages import stage4_implement
+
+
+def test_component_key_is_stable_and_sensitive():
+    a = component_cache.component_key(component={"id": "a", "files": ["a.py"]}, language="python")
+    b = component_cache.component_key(language="python", component={"files": ["a.py"], "id": "a"})
+    c = component_cache.component_key(component={"id": "a", "files": ["b.py"]}, language="python")
+    assert a == b
+    assert a != c
+
+
+def test_store_and_load(tmp_path):
+    assert component_cache.load("ab" * 16, tmp_path) is None
+    files = [{"path": "a.py", "content": "x = 1\n"}]
+    component_cache.store("ab" * 16, {"lld_summary": "s"}, files, {"approved": True}, tmp_path)
+    entry = component_cache.load("ab" * 16, tmp_path)
+    assert entry["files"] == files
+    assert entry["review"] == {"approved": True}
+    assert not list(tmp_path.rglob("*.tmp-*"))
+    component_cache.evict("ab" * 16, tmp_path)
+    assert component_cache.load("ab" * 16, tmp_path) is None
+    component_cache.evict("ab" * 16, tmp_path)
+
+
+def test_hld_slice_keeps_own_entry_and_dependency_interfaces():
+    hld = {
+        "project_name": "p", "entry_point": "cli.py", "shared_types": ["User"],
+        "components": [
+            {"id": "models", "name": "models", "files": ["models.py"], "interfaces": ["class User"],
+             "description": "long text"},
+            {"id": "cli", "name": "cli", "files": ["cli.py"], "dependencies": ["models"]},
+            {"id": "other", "name": "other", "files": ["other.py"]},
+        ],
+    }
+    sliced = hld_slice(hld, {"id": "cli"}, ["models"])
+    assert sliced["component"]["files"] == ["cli.py"]
+    assert sliced["dependencies"] == [
+        {"id": "models", "name": "models", "files": ["models.py"], "interfaces": ["class User"]},
+    ]
+    assert "other" not in str(sliced)
+
+
+def test_spec_slice_keeps_relevant_and_unclaimed_requirements():
+    spec = {
+        "project_name": "p", "language": "python", "constraints": ["stdlib only"],
+        "functional_requirements": [
+            {"id": "FR-1", "description": "Parse the config file"},
+            {"id": "FR-2", "description": "Render the report as HTML"},
+            {"id": "FR-3", "description": "Retry failed uploads"},
+            {"id": "FR-4", "description": "Exit non-zero on errors"},
+        ],
+    }
+    renderer = {"name": "renderer", "files": ["report.py"], "description": "Implements FR-3"}
+    parser = {"name": "parser", "files": ["config.py"]}
+    sliced = spec_slice(spec, renderer, [renderer, parser])
+    assert [r["id"] for r in sliced["functional_requirements"]] == ["FR-2", "FR-3", "FR-4"]
+    assert sliced["constraints"] == ["stdlib only"]
+    assert [r["id"] for r in spec_slice(spec, parser, [renderer, parser])["functional_requirements"]] == [
+        "FR-1", "FR-4",
+    ]
+
+
+def test_stage4_rerun_reuses_cached_components(monkeypatch, tmp_path):
+    monkeypatch.setattr(component_cache, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    coder_calls: list[str] = []
+
+    def fake_coder(config):
+        def node(state):
+            cid = state["component"]["id"]
+            coder_calls.append(cid)
+            return {"_code_result": {"files": [
+                {"path": f"{cid}.py", "content": f"def {cid}_api(x: int) -> int:\n    return x\n"},
+            ]}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", lambda c: lambda s: {"_lld_result": {}})
+    monkeypatch.setattr(stage4_implement, "create_coder_node", fake_coder)
+    monkeypatch.setattr(
+        stage4_implement, "create_code_reviewer_node", lambda c: lambda s: {"_review_result": {"approved": True}},
+    )
+
+    def run(config, workspace, components, spec=None):
+        return stage4_implement.create_stage4_graph(config).compile().invoke({
+            "spec": spec or {"language": "python"}, "hld": {}, "components": components,
+            "component_results": [], "workspace_path": str(workspace),
+        })
+
+    components = [
+        {"id": "app", "name": "app", "files": ["app.py"], "dependencies": ["core"]},
+        {"id": "core", "name": "core", "files": ["core.py"]},
+    ]
+    config = SummonConfig(prefetch_dependencies=False)
+    run(config, tmp_path / "first", components)
+    assert coder_calls == ["core", "app"]
+
+    coder_calls.clear()
+    result = run(config, tmp_path / "second", components)
+    assert coder_calls == []
+    assert all(r["cached"] for r in result["component_results"])
+    assert (tmp_path / "second" / "app.py").read_text().startswith("def app_api")
+
+    # A changed component is regenerated; its unchanged dependency is not.
+    changed = [{**components[0], "description": "now with logging"}, components[1]]
+    run(config, tmp_path / "third", changed)
+    assert coder_calls == ["app"]
+
+    coder_calls.clear()
+    run(SummonConfig(prefetch_dependencies=False, regenerate_components=True), tmp_path / "fourth", components)
+    assert coder_calls == ["core", "app"]
+
+    # Each component's prompts only see its spec slice: editing a requirement
+    # regenerates the component it concerns, not the others.
+    def spec(app_requirement):
+        return {"language": "python", "functional_requirements": [
+            {"id": "FR-1", "description": "core validates input"},
+            {"id": "FR-2", "description": app_requirement},
+        ]}
+
+    run(config, tmp_path / "fifth", components, spec=spec("app prints a table"))
+    coder_calls.clear()
+    run(config, tmp_path / "sixth", components, spec=spec("app prints JSON"))
+    assert coder_calls == ["app"]
+
+    # A project-wide change reaches every component's prompts.
+    coder_calls.clear()
+    run(config, tmp_path / "seventh", components, spec={**spec("app prints JSON"), "constraints": ["no deps"]})
+    assert coder_calls == ["core", "app"]
+
+
+def test_gate_retry_skips_and_evicts_cached_results(monkeypatch, tmp_path):
+    monkeypatch.setattr(component_cache, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    coder_calls: list[str] = []
+
+    def fake_coder(config):
+        def node(state):
+            coder_calls.append(state["component"]["id"])
+            return {"_code_result": {"files": [{"path": "core.py", "content": "X = 1\n"}]}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", lambda c: lambda s: {"_lld_result": {}})
+    monkeypatch.setattr(stage4_implement, "create_coder_node", fake_coder)
+    monkeypatch.setattr(
+        stage4_implement, "create_code_reviewer_node", lambda c: lambda s: {"_review_result": {"approved": True}},
+    )
+    graph = stage4_implement.create_stage4_graph(SummonConfig(prefetch_dependencies=False)).compile()
+    components = [{"id": "core", "name": "core", "files": ["core.py"]}]
+
+    first = graph.invoke({
+        "spec": {"language": "python"}, "hld": {}, "components": components,
+        "component_results": [], "workspace_path": str(tmp_path / "ws"),
+    })
+    key = first["component_results"][0]["cache_key"]
+    assert component_cache.load(key) is not None
+
+    # The gate rejected the first attempt: the retry regenerates instead of replaying.
+    calls_before = len(coder_calls)
+    graph.invoke({
+        "spec": {"language": "python"}, "hld": {}, "components": components,
+        "component_results": first["component_results"], "workspace_path": str(tmp_path / "ws"),
+        "stage_retries": {"implementation": 1},
+    })
+    assert len(coder_calls) == calls_before + 1
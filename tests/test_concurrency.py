@@ -0,0 +1,42 @@
+"""Tests for the shared priority limiters."""
+
+import threading
+import time
+
+from summon.concurrency import PrioritySemaphore, limiter
+
+
+def test_priority_semaphore_bounds_and_orders():
+    sem = PrioritySemaphore(1)
+    order: list[int] = []
+    sem.acquire()  # hold the only slot while waiters queue up
+
+    def worker(priority: int) -> None:
+        with sem.slot(priority):
+            order.append(priority)
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(p,)) for p in (1, 5, 3)]
+    for t in threads:
+        t.start()
+    while len(sem._waiting) < 3:
+        time.sleep(0.001)
+    sem.release()
+    for t in threads:
+        t.join()
+
+    assert order == [5, 3, 1]
+    assert sem.peak == 1
+
+
+def test_priority_semaphore_unlimited():
+    sem = PrioritySemaphore(0)
+    for _ in range(10):
+        sem.acquire()
+    assert sem.in_use == 10
+
+
+def test_limiter_is_shared_and_resizable():
+    first = limiter("test-shared", 2)
+    assert limiter("test-shared", 3) is first
+    assert first.limit == 3
@@ -43,3 +43,13 @@ def test_load_from_yaml():
 def test_load_missing_file():
     config = SummonConfig.load("/nonexistent/path/summon.yaml")
     assert config.max_stage_retries == 3  # defaults
+
+
+def test_sandbox_defaults_and_override():
+    config = SummonConfig()
+    assert config.sandbox.enabled
+    assert "PATH" in config.sandbox.env_passthrough
+
+    config = SummonConfig.model_validate({"sandbox": {"cpu_seconds": 30, "use_cgroup": False}})
+    assert config.sandbox.cpu_seconds == 30
+    assert config.sandbox.address_space_mb == 8192
@@ -0,0 +1,57 @@
+"""Tests for per-component HLD slicing in Stage 4."""
+
+from summon.config import SummonConfig
+from summon.context_slice import slice_report
+from summon.stages import stage4_implement
+
+
+def _hld(n):
+    return {
+        "project_name": "p", "entry_point": "c0.py", "shared_types": ["Record"],
+        "components": [
+            {"id": f"c{i}", "name": f"c{i}", "files": [f"c{i}.py"], "interfaces": [f"c{i}_api(x) -> int"],
+             "dependencies": [f"c{i - 1}"] if i else [], "description": "does things " * 40}
+            for i in range(n)
+        ],
+    }
+
+
+def test_slice_report_estimates_savings():
+    hld = _hld(20)
+    report = slice_report(hld, hld["components"], {"c1": ["c0"]})
+    assert set(report["per_component"]) == {f"c{i}" for i in range(20)}
+    assert report["full_total"] == report["full_tokens"] * 20
+    assert report["per_component"]["c1"] > report["per_component"]["c2"]
+    assert report["saved_pct"] > 80
+    assert slice_report({}, [], {})["saved_pct"] == 0.0
+
+
+def test_components_receive_only_their_hld_slice(monkeypatch, tmp_path):
+    seen: dict[str, dict] = {}
+
+    def fake_lld(config):
+        def node(state):
+            seen[state["component"]["id"]] = state["hld"]
+            return {"_lld_result": {"lld_summary": ""}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", fake_lld)
+    monkeypatch.setattr(stage4_implement, "create_coder_node", lambda c: lambda s: {"_code_result": {"files": []}})
+    monkeypatch.setattr(
+        stage4_implement, "create_code_reviewer_node", lambda c: lambda s: {"_review_result": {"approved": True}},
+    )
+
+    hld = _hld(4)
+    result = stage4_implement.create_stage4_graph(
+        SummonConfig(prefetch_dependencies=False, component_cache=False),
+    ).compile().invoke({
+        "spec": {"language": "python"}, "hld": hld, "components": hld["components"],
+        "component_results": [], "workspace_path": str(tmp_path),
+    })
+
+    sliced = seen["c2"]
+    assert sliced["component"]["id"] == "c2"
+    assert [d["id"] for d in sliced["dependencies"]] == ["c1"]
+    assert sliced["shared_types"] == ["Record"] and sliced["entry_point"] == "c0.py"
+    assert "c3" not in str(sliced)
+    assert result["hld_context_report"]["saved_pct"] > 0
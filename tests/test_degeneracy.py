@@ -0,0 +1,17 @@
+"""Tests for the deterministic degeneracy checks."""
+
+from summon.degeneracy import check_file
+
+
+def test_check_file_flags_degenerate_files():
+    assert check_file("a.py", "def f(:\n")["issue"] == "syntax_error"
+    assert check_file("a.py", "x = 1\n" * 20)["issue"] == "repetition"
+    stubs = 'def f():\n    """Doc."""\n    pass\n\ndef g():\n    raise NotImplementedError()\n'
+    assert check_file("a.py", stubs)["issue"] == "stub_only"
+
+
+def test_check_file_accepts_real_code_and_other_files():
+    code = "def f(x):\n    return x + 1\n\ndef g():\n    pass\n"
+    assert check_file("a.py", code) is None
+    assert check_file("README.md", "def f(:\n") is None
+    assert check_file("empty.py", "") is None
@@ -1,9 +1,13 @@
 """Tests for subprocess executor."""
 
+import asyncio
 import tempfile
+import time
 from pathlib import Path
 
-from summon.executor import run_command
+import pytest
+
+from summon.executor import run_command, run_command_async, run_commands
 
 
 def test_successful_command():
@@ -39,3 +43,62 @@ def test_list_command():
         result = run_command(["echo", "hello"], cwd=d)
         assert result.success
         assert "hello" in result.stdout
+
+
+def _pid_alive(pid: int) -> bool:
+    """True if *pid* exists and is not a zombie."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(") ", 1)[1][0] != "Z"
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not Path("/proc").is_dir(), reason="needs /proc")
+def test_timeout_kills_process_group():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("sleep 30 & echo $! > child.pid; wait", cwd=d, timeout=1)
+        assert result.timed_out
+        pid = int(Path(d, "child.pid").read_text())
+        time.sleep(0.2)
+        assert not _pid_alive(pid)
+
+
+def test_timeout_keeps_partial_output():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("echo early; sleep 10", cwd=d, timeout=1)
+        assert "early" in result.stdout
+        assert "timed out" in result.stderr.lower()
+
+
+def test_output_is_bounded():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("seq 1 100000", cwd=d, max_output=1000)
+        assert result.truncated
+        assert result.stdout.startswith("1\n2\n")
+        assert result.stdout.rstrip().endswith("100000")
+        assert len(result.stdout) < 1200
+
+
+def test_resource_accounting():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("python -c 'sum(range(10**6))'", cwd=d)
+        assert result.success
+        assert result.wall_time > 0
+        assert result.cpu_time > 0
+        assert result.max_rss_kb > 0
+
+
+def test_run_commands_preserves_order():
+    with tempfile.TemporaryDirectory() as d:
+        results = run_commands(
+            [{"cmd": f"sleep 0.{3 - i}; echo {i}", "cwd": d} for i in range(3)],
+            max_workers=3,
+        )
+        assert [r.stdout.strip() for r in results] == ["0", "1", "2"]
+
+
+def test_run_command_async():
+    with tempfile.TemporaryDirectory() as d:
+        result = asyncio.run(run_command_async("echo hi", d))
+        assert result.stdout.strip() == "hi"
@@ -0,0 +1,84 @@
+"""Tests for single-interpreter import validation."""
+
+import os
+import sys
+
+from summon.import_check import third_party_imports, validate_modules
+from summon.workspace import Workspace
+
+
+def _env(ws: Workspace) -> dict[str, str]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(ws.path)
+    return env
+
+
+def test_validate_modules_reports_per_module():
+    ws = Workspace()
+    try:
+        ws.write_file("models.py", "class Item:\n    pass\n")
+        ws.write_file("service.py", "from models import Item\n")
+        ws.write_file("broken.py", "from models import Missing\n")
+        ws.write_file("syntax.py", "def f(:\n")
+        ws.write_file("pkg/__init__.py", "")
+        ws.write_file("pkg/mod.py", "import json\nVALUE = json.dumps(1)\n")
+        files = ["models.py", "service.py", "broken.py", "syntax.py", "pkg/mod.py"]
+
+        results = validate_modules(sys.executable, ws.path, files, env=_env(ws))
+
+        by_module = {r["module"]: r for r in results}
+        assert [r["file"] for r in results] == files
+        assert by_module["models"]["ok"]
+        assert by_module["service"]["ok"]
+        assert by_module["pkg.mod"]["ok"]
+        assert not by_module["broken"]["ok"]
+        assert "ImportError" in by_module["broken"]["error"]
+        assert "Missing" in by_module["broken"]["traceback"]
+        assert not by_module["syntax"]["ok"]
+        assert "SyntaxError" in by_module["syntax"]["error"]
+    finally:
+        ws.cleanup()
+
+
+def test_validate_modules_isolates_crashes_and_hangs():
+    ws = Workspace()
+    try:
+        ws.write_file("crash.py", "import os\nos._exit(3)\n")
+        ws.write_file("hang.py", "import time\ntime.sleep(60)\n")
+        ws.write_file("fine.py", "X = 1\n")
+        results = validate_modules(
+            sys.executable, ws.path, ["crash.py", "hang.py", "fine.py"],
+            env=_env(ws), per_module_timeout=1,
+        )
+        crash, hang, fine = results
+        assert not crash["ok"] and "exit status 3" in crash["error"]
+        assert not hang["ok"] and "TimeoutError" in hang["error"]
+        assert fine["ok"]
+    finally:
+        ws.cleanup()
+
+
+def test_third_party_imports_excludes_stdlib_and_local():
+    ws = Workspace()
+    try:
+        ws.write_file("main.py", "import os\nimport requests\nfrom models import X\nfrom yaml import safe_load\n")
+        ws.write_file("models.py", "from .x import y\n")
+        assert third_party_imports(ws.path, ["main.py", "models.py"]) == ["requests", "yaml"]
+    finally:
+        ws.cleanup()
+
+
+def test_third_party_imports_treats_src_and_test_dirs_as_local():
+    ws = Workspace()
+    try:
+        ws.write_file("src/foo.py", "import requests\n")
+        ws.write_file("src/pkg/__init__.py", "")
+        ws.write_file("src/pkg/util.py", "")
+        ws.write_file("tests/helpers.py", "")
+        ws.write_file("tests/test_foo.py", "import foo\nimport helpers\nfrom pkg.util import x\nimport util\n")
+        ws.write_file(".venv/lib/site-packages/yaml.py", "")
+        ws.write_file("main.py", "import yaml\n")
+        files = ["src/foo.py", "tests/test_foo.py", "main.py"]
+        assert third_party_imports(ws.path, files) == ["requests", "yaml"]
+    finally:
+        ws.cleanup()
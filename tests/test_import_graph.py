@@ -0,0 +1,228 @@
+"""Tests for static import resolution."""
+
+from summon.import_graph import (
+    analyze_imports,
+    apply_rewrites,
+    dependency_graph,
+    impacted_files,
+    installed_top_levels,
+)
+from summon.workspace import Workspace
+
+
+def _analyze(ws: Workspace, installed: set[str] | None = frozenset()):
+    files = ws.list_project_files()
+    return analyze_imports(ws, files, installed=set(installed) if installed is not None else None)
+
+
+def test_clean_local_imports_resolve_statically():
+    ws = Workspace()
+    try:
+        ws.write_file("models.py", "import json\n\nclass Item:\n    pass\n")
+        ws.write_file("service.py", "from models import Item\n")
+        ws.write_file("pkg/__init__.py", "from pkg.core import run\n")
+        ws.write_file("pkg/core.py", "def run():\n    pass\n")
+        ws.write_file("pkg/cli.py", "from .core import run\nfrom pkg import core\n")
+
+        analysis = _analyze(ws)
+
+        assert analysis.unresolved == []
+        assert not analysis.has_fixes
+        assert analysis.ambiguous == set()
+    finally:
+        ws.cleanup()
+
+
+def test_unresolved_names_and_modules_reported():
+    ws = Workspace()
+    try:
+        ws.write_file("models.py", "class Item:\n    pass\n")
+        ws.write_file("a.py", "from models import Missing\n")
+        ws.write_file("b.py", "import nosuchmodule\n")
+        ws.write_file("c.py", "def f(:\n")
+
+        analysis = _analyze(ws)
+
+        reasons = {e["file"]: e["reason"] for e in analysis.unresolved}
+        assert "cannot import name 'Missing'" in reasons["a.py"]
+        assert "No module named 'nosuchmodule'" in reasons["b.py"]
+        assert "SyntaxError" in reasons["c.py"]
+    finally:
+        ws.cleanup()
+
+
+def test_guarded_imports_are_skipped():
+    ws = Workspace()
+    try:
+        ws.write_file(
+            "a.py",
+            "from typing import TYPE_CHECKING\n"
+            "try:\n    import ujson\nexcept ImportError:\n    ujson = None\n"
+            "if TYPE_CHECKING:\n    from nowhere import Thing\n",
+        )
+        assert _analyze(ws).unresolved == []
+    finally:
+        ws.cleanup()
+
+
+def test_third_party_and_dynamic_modules_are_ambiguous():
+    ws = Workspace()
+    try:
+        ws.write_file("api.py", "import requests\n")
+        ws.write_file("service.py", "from api import requests\n")
+        ws.write_file("lazy.py", "def __getattr__(name):\n    return name\n")
+        ws.write_file("user.py", "from lazy import anything\n")
+        ws.write_file("plain.py", "import os\n")
+
+        analysis = _analyze(ws, installed={"requests"})
+
+        assert analysis.unresolved == []
+        # service.py imports api.py, which needs a real import to check.
+        assert analysis.ambiguous == {"api.py", "service.py", "lazy.py", "user.py"}
+
+        # Without a venv, unknown top-level modules can't be ruled out.
+        ws.write_file("other.py", "import yaml\n")
+        analysis = _analyze(ws, installed=None)
+        assert "other.py" in analysis.ambiguous
+        assert analysis.unresolved == []
+    finally:
+        ws.cleanup()
+
+
+def test_rewrites_src_prefix_and_wrong_sibling():
+    ws = Workspace()
+    try:
+        ws.write_file("models.py", "class Item:\n    pass\n")
+        ws.write_file("utils.py", "def slugify(s):\n    return s\n")
+        ws.write_file(
+            "service.py",
+            "import os\n"
+            "from src.models import Item  # flat layout\n"
+            "from models import Item as I, slugify\n"
+            "\n"
+            "def make():\n"
+            "    return Item(), I, slugify, os\n",
+        )
+
+        analysis = _analyze(ws)
+        assert len(analysis.rewrites) == 2
+        applied = apply_rewrites(ws, analysis)
+
+        assert len(applied) == 2
+        content = ws.read_file("service.py")
+        assert "from models import Item\n" in content
+        assert "from models import Item as I\nfrom utils import slugify\n" in content
+        assert content.endswith("return Item(), I, slugify, os\n")
+        after = _analyze(ws)
+        assert after.unresolved == [] and not after.has_fixes
+    finally:
+        ws.cleanup()
+
+
+def test_ambiguous_wrong_sibling_is_reported_not_rewritten():
+    ws = Workspace()
+    try:
+        ws.write_file("a.py", "def helper():\n    pass\n")
+        ws.write_file("b.py", "def helper():\n    pass\n")
+        ws.write_file("c.py", "def other():\n    pass\n")
+        ws.write_file("main.py", "from c import helper\n")
+
+        analysis = _analyze(ws)
+
+        assert analysis.rewrites == []
+        assert "defined in: a, b" in analysis.unresolved[0]["reason"]
+    finally:
+        ws.cleanup()
+
+
+def test_missing_init_created_for_imported_package():
+    ws = Workspace()
+    try:
+        ws.write_file("app/core.py", "VALUE = 1\n")
+        ws.write_file("main.py", "from app.core import VALUE\n")
+        ws.write_file("scripts/tool.py", "import os\n")
+
+        analysis = _analyze(ws)
+
+        assert analysis.missing_inits == ["app/__init__.py"]
+        apply_rewrites(ws, analysis)
+        assert ws.file_exists("app/__init__.py")
+    finally:
+        ws.cleanup()
+
+
+def test_installed_top_levels_reads_site_packages():
+    ws = Workspace()
+    try:
+        assert installed_top_levels(ws.path) is None
+
+        site = ".venv/lib/python3.12/site-packages/"
+        ws.write_file(site + "requests/__init__.py", "")
+        ws.write_file(site + "six.py", "")
+        ws.write_file(site + "_cffi.cpython-312-x86_64-linux-gnu.so", "")
+        ws.write_file(site + "PyYAML-6.0.dist-info/top_level.txt", "_yaml\nyaml\n")
+
+        names = installed_top_levels(ws.path)
+        assert {"requests", "six", "_cffi", "yaml", "_yaml"} <= names
+
+        ws.write_file(site + "__editable__.mypkg.pth", "/somewhere\n")
+        assert installed_top_levels(ws.path) is None
+    finally:
+        ws.cleanup()
+
+
+def test_dependency_graph_and_impacted_tests():
+    ws = Workspace()
+    try:
+        ws.write_file("src/app/__init__.py", "")
+        ws.write_file("src/app/models.py", "class Item:\n    pass\n")
+        ws.write_file("src/app/service.py", "from .models import Item\n")
+        ws.write_file("src/app/cli.py", "import argparse\n")
+        ws.write_file("tests/test_service.py", "from app.service import Item\n")
+        ws.write_file("tests/test_cli.py", "from app import cli\n")
+        files = ws.list_project_files()
+
+        graph = dependency_graph(ws, files)
+
+        assert graph["src/app/service.py"] == {"src/app/__init__.py", "src/app/models.py"}
+        assert graph["tests/test_cli.py"] == {"src/app/__init__.py", "src/app/cli.py"}
+
+        impacted = impacted_files(graph, {"src/app/models.py"})
+        assert "tests/test_service.py" in impacted
+        assert "tests/test_cli.py" not in impacted
+        # Package __init__ runs for every submodule import.
+        assert {"tests/test_service.py", "tests/test_cli.py"} <= impacted_files(
+            graph, {"src/app/__init__.py"},
+        )
+    finally:
+        ws.cleanup()
+
+
+def test_cycles_and_unconfirmed_stdlib_names_are_ambiguous():
+    ws = Workspace()
+    try:
+        ws.write_file("a.py", "from b import g\n\ndef f():\n    return 1\n")
+        ws.write_file("b.py", "from a import f\n\ndef g():\n    return 2\n")
+        ws.write_file("j.py", "from json import nonexistent\n")
+        ws.write_file("ok.py", "from json import dumps\n")
+
+        analysis = _analyze(ws)
+
+        assert analysis.ambiguous == {"a.py", "b.py", "j.py"}
+    finally:
+        ws.cleanup()
+
+
+def test_wrong_sibling_rewrite_ignores_test_modules():
+    ws = Workspace()
+    try:
+        ws.write_file("models.py", "class Item:\n    pass\n")
+        ws.write_file("tests/conftest.py", "def fixture_data():\n    return 1\n")
+        ws.write_file("service.py", "from models import fixture_data\n")
+
+        analysis = _analyze(ws)
+
+        assert analysis.rewrites == []
+        assert "cannot import name 'fixture_data'" in analysis.unresolved[0]["reason"]
+    finally:
+        ws.cleanup()
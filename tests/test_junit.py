@@ -0,0 +1,125 @@
+"""Tests for JUnit XML test report parsing."""
+
+import subprocess
+import sys
+
+from summon.junit import (
+    load_durations,
+    load_report,
+    parse_frames,
+    parse_junit_xml,
+    save_durations,
+)
+from summon.workspace import Workspace
+
+_TESTS = '''\
+import pytest
+
+from calc import add
+
+
+def test_add():
+    assert add(1, 2) == 3
+
+
+def test_add_wrong():
+    assert add(2, 2) == 5
+
+
+class TestCalc:
+    def test_raises(self):
+        raise ValueError("boom")
+
+    @pytest.mark.skip(reason="later")
+    def test_skipped(self):
+        pass
+'''
+
+
+def test_parse_real_pytest_report():
+    ws = Workspace()
+    try:
+        ws.write_file("calc.py", "def add(a, b):\n    return a + b\n")
+        ws.write_file("tests/test_calc.py", _TESTS)
+        subprocess.run(
+            [sys.executable, "-m", "pytest", "tests/", "-q", "--tb=short", "-p", "no:cacheprovider",
+             "-o", "junit_family=xunit1", "--junitxml=report.xml", "--rootdir", str(ws.path)],
+            cwd=ws.path, capture_output=True, env={"PYTHONPATH": str(ws.path), "PATH": ""},
+        )
+
+        report = load_report(ws.path / "report.xml")
+
+        assert report is not None
+        by_id = {r.nodeid: r for r in report.records}
+        assert by_id["tests/test_calc.py::test_add"].outcome == "passed"
+        assert by_id["tests/test_calc.py::TestCalc::test_skipped"].outcome == "skipped"
+
+        wrong = by_id["tests/test_calc.py::test_add_wrong"]
+        assert wrong.outcome == "failed"
+        assert "assert 4 == 5" in wrong.message
+        assert wrong.frames[0]["file"] == "tests/test_calc.py"
+
+        raises = by_id["tests/test_calc.py::TestCalc::test_raises"]
+        assert raises.failing
+        assert "ValueError: boom" in raises.message
+
+        assert not report.ok
+        summary = report.as_dict()
+        assert (summary["passed"], summary["failed"], summary["skipped"]) == (1, 2, 1)
+        assert "details" not in summary["failures"][0]
+
+        rendered = report.render()
+        assert "2 failing test(s)" in rendered
+        assert "tests/test_calc.py::test_add_wrong [failed]" in rendered
+        assert "test_add [passed]" not in rendered
+    finally:
+        ws.cleanup()
+
+
+def test_collection_error_is_an_error_record():
+    xml = (
+        '<testsuites><testsuite name="pytest" errors="1" failures="0" tests="1">'
+        '<testcase classname="" name="tests.test_x" file="tests/test_x.py" time="0.0">'
+        '<error message="collection failure">tests/test_x.py:1: in &lt;module&gt;\n'
+        "    import missing\nE   ModuleNotFoundError: No module named 'missing'</error>"
+        "</testcase></testsuite></testsuites>"
+    )
+    report = parse_junit_xml(xml)
+
+    assert report.records[0].nodeid == "tests/test_x.py"
+    assert report.records[0].outcome == "error"
+    assert report.records[0].frames == [{"file": "tests/test_x.py", "line": 1, "function": "<module>"}]
+    assert not report.ok
+
+
+def test_empty_report_is_not_ok():
+    assert not parse_junit_xml("<testsuites><testsuite/></testsuites>").ok
+
+
+def test_invalid_report():
+    assert load_report("/nonexistent/report.xml") is None
+
+
+def test_parse_frames():
+    text = "tests/test_a.py:10: in test_a\n    run()\nsrc/app.py:3: in run\n    raise X\nE   X\n"
+    assert parse_frames(text) == [
+        {"file": "tests/test_a.py", "line": 10, "function": "test_a"},
+        {"file": "src/app.py", "line": 3, "function": "run"},
+    ]
+
+
+def test_durations_are_merged(tmp_path):
+    first = parse_junit_xml(
+        '<testsuite><testcase classname="tests.test_a" file="tests/test_a.py" name="test_x" time="1.5"/>'
+        '<testcase classname="tests.test_a" file="tests/test_a.py" name="test_y" time="0.5"/></testsuite>'
+    )
+    save_durations(tmp_path, first)
+    second = parse_junit_xml(
+        '<testsuite><testcase classname="tests.test_a" file="tests/test_a.py" name="test_y" time="2.0"/></testsuite>'
+    )
+    save_durations(tmp_path, second)
+
+    assert load_durations(tmp_path) == {
+        "tests/test_a.py::test_x": 1.5,
+        "tests/test_a.py::test_y": 2.0,
+    }
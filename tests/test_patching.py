@@ -0,0 +1,91 @@
+"""Tests for the search/replace fixer edit protocol."""
+
+from summon.patching import apply_edit, apply_edits, apply_fixes
+from summon.workspace import Workspace
+
+SOURCE = """\
+from src.models import Item
+
+
+class Cart:
+    def add(self, item):
+        self.items.append(item)
+        return len(self.items)
+"""
+
+
+def test_apply_edit_exact():
+    out = apply_edit(SOURCE, "from src.models import Item", "from models import Item")
+    assert out.startswith("from models import Item\n")
+
+
+def test_apply_edit_ambiguous_match_fails():
+    assert apply_edit("x = 1\nx = 1\n", "x = 1", "x = 2") is None
+
+
+def test_apply_edit_no_match_fails():
+    assert apply_edit(SOURCE, "import nothing", "import something") is None
+
+
+def test_apply_edit_ignores_trailing_whitespace():
+    search = "class Cart:   \n    def add(self, item):"
+    out = apply_edit(SOURCE, search, "class Cart:\n    def add(self, item, qty=1):")
+    assert "def add(self, item, qty=1):" in out
+
+
+def test_apply_edit_reindents_replacement():
+    search = "self.items.append(item)\nreturn len(self.items)"
+    replace = "self.items.extend([item])\nreturn len(self.items)"
+    out = apply_edit(SOURCE, search, replace)
+    assert "        self.items.extend([item])\n        return len(self.items)\n" in out
+
+
+def test_apply_edits_is_all_or_nothing():
+    edits = [
+        {"search": "from src.models import Item", "replace": "from models import Item"},
+        {"search": "does not exist", "replace": "x"},
+    ]
+    assert apply_edits(SOURCE, edits) is None
+
+
+def test_apply_fixes_patches_and_reports_savings():
+    ws = Workspace()
+    try:
+        ws.write_file("cart.py", SOURCE + "\n# padding\n" * 40)
+        report = apply_fixes(ws, [{
+            "file_path": "cart.py",
+            "edits": [{"search": "from src.models import Item", "replace": "from models import Item"}],
+        }])
+        assert report.patched == ["cart.py"]
+        assert ws.read_file("cart.py").startswith("from models import Item")
+        assert report.saved_tokens > 0
+    finally:
+        ws.cleanup()
+
+
+def test_apply_fixes_falls_back_to_content():
+    ws = Workspace()
+    try:
+        ws.write_file("cart.py", SOURCE)
+        report = apply_fixes(ws, [
+            {"file_path": "cart.py", "edits": [{"search": "missing", "replace": "x"}],
+             "content": "print('rewritten')\n"},
+            {"file_path": "new.py", "content": "VALUE = 1\n"},
+        ])
+        assert report.replaced == ["cart.py", "new.py"]
+        assert ws.read_file("cart.py") == "print('rewritten')\n"
+    finally:
+        ws.cleanup()
+
+
+def test_apply_fixes_reports_failed_edits():
+    ws = Workspace()
+    try:
+        ws.write_file("cart.py", SOURCE)
+        report = apply_fixes(ws, [
+            {"file_path": "cart.py", "edits": [{"search": "missing", "replace": "x"}]},
+        ])
+        assert report.failed == ["cart.py"]
+        assert ws.read_file("cart.py") == SOURCE
+    finally:
+        ws.cleanup()
@@ -0,0 +1,65 @@
+"""Tests for background dependency prefetching."""
+
+import json
+
+from summon import prefetch
+from summon.venv_cache import MARKER
+
+
+def test_requirements_from_sdd():
+    deps = [
+        "FastAPI (web framework)",
+        "requests>=2.31 for HTTP",
+        "pydantic[email] >= 2.0, <3",
+        "sqlite3",
+        "Python 3.11",
+        "fastapi",
+    ]
+    assert prefetch.requirements_from_sdd(deps) == ["fastapi", "requests>=2.31", "pydantic[email]>=2.0,<3"]
+
+
+def test_requirements_from_text():
+    text = "# deps\nrequests==2.31  # http\n-e .\n./vendor/x.whl\nclick\n"
+    assert prefetch.requirements_from_text(text) == ["requests==2.31", "click"]
+    assert prefetch.requirement_name("Flask_Login>=0.6") == "flask-login"
+
+
+def _fake_uv(tmp_path):
+    """A ``uv`` stand-in that logs installs and rejects unknown packages."""
+    log = tmp_path / "uv.log"
+    script = tmp_path / "uv"
+    script.write_text(
+        "#!/bin/sh\n"
+        f"echo \"$@\" >> {log}\n"
+        'if [ "$1" = venv ]; then mkdir -p "$2/bin" && touch "$2/bin/python"; exit 0; fi\n'
+        'case " $* " in *" no-such-package "*) exit 1;; esac\n'
+        "exit 0\n"
+    )
+    script.chmod(0o755)
+    return str(script), log
+
+
+def test_schedule_installs_in_background(tmp_path):
+    uv, log = _fake_uv(tmp_path)
+    ws = tmp_path / "ws"
+    ws.mkdir()
+
+    assert prefetch.schedule(str(ws), ["requests", "no-such-package"], uv=uv)
+    assert prefetch.schedule(str(ws), ["requests", "click"], uv=uv)
+    installed = prefetch.finish(str(ws))
+
+    assert set(installed) == {"requests", "click", "pytest"}
+    calls = log.read_text().splitlines()
+    assert calls[0].startswith("venv ")
+    assert json.loads((ws / ".venv" / prefetch.PREFETCH_MARKER).read_text()) == sorted(installed)
+
+
+def test_schedule_leaves_cached_venvs_alone(tmp_path):
+    uv, log = _fake_uv(tmp_path)
+    venv = tmp_path / ".venv"
+    venv.mkdir()
+    (venv / MARKER).write_text("abc")
+
+    assert not prefetch.schedule(str(tmp_path), ["requests"], uv=uv)
+    assert prefetch.finish(str(tmp_path)) is None
+    assert not log.exists()
@@ -0,0 +1,104 @@
+"""Tests for the warm pytest server."""
+
+import os
+import sys
+
+import pytest
+
+from summon.pytest_server import PytestServer, environment_key, get_server, shutdown_all
+from summon.workspace import Workspace
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+
+
+def _env(ws: Workspace) -> dict[str, str]:
+    env = os.environ.copy()
+    env["PYTHONPATH"] = str(ws.path)
+    return env
+
+
+def test_runs_see_project_changes_between_iterations():
+    ws = Workspace()
+    try:
+        ws.write_file("calc.py", "def add(a, b):\n    return a - b\n")
+        ws.write_file("tests/test_calc.py", "from calc import add\n\ndef test_add():\n    assert add(1, 2) == 3\n")
+        server = get_server(ws.path, sys.executable, _env(ws))
+        assert server is not None
+
+        first = server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=60)
+        assert first is not None
+        assert first.returncode == 1
+        assert "1 failed" in first.stdout
+
+        ws.write_file("calc.py", "def add(a, b):\n    return a + b\n")
+        second = server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=60)
+        assert second.success
+        assert "1 passed" in second.stdout
+
+        # Same environment: the running server is reused.
+        assert get_server(ws.path, sys.executable, _env(ws)) is server
+    finally:
+        shutdown_all()
+        ws.cleanup()
+
+
+def test_src_layout_project_is_not_preloaded():
+    ws = Workspace()
+    try:
+        ws.write_file("src/foo.py", "def f():\n    return 1\n")
+        ws.write_file("tests/test_foo.py", "import foo\n\ndef test_f():\n    assert foo.f() == 2\n")
+        env = os.environ.copy()
+        env["PYTHONPATH"] = str(ws.path / "src")
+        server = PytestServer(ws.path, sys.executable, env)
+        assert server.start()
+
+        assert server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=60).returncode == 1
+        ws.write_file("src/foo.py", "def f():\n    return 2\n")
+        second = server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=60)
+        assert second.success, second.output
+        server.stop()
+    finally:
+        ws.cleanup()
+
+
+def test_run_output_is_bounded():
+    ws = Workspace()
+    try:
+        ws.write_file("tests/test_loud.py", "def test_loud():\n    print('x' * 200_000)\n    assert False\n")
+        server = PytestServer(ws.path, sys.executable, _env(ws))
+        assert server.start()
+
+        result = server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=60, max_output=4000)
+
+        assert len(result.stdout) < 5000
+        assert "bytes truncated" in result.stdout
+        assert "1 failed" in result.stdout
+        server.stop()
+    finally:
+        ws.cleanup()
+
+
+def test_hung_run_is_killed():
+    ws = Workspace()
+    try:
+        ws.write_file("tests/test_hang.py", "import time\n\ndef test_hang():\n    time.sleep(60)\n")
+        server = PytestServer(ws.path, sys.executable, _env(ws))
+        assert server.start()
+
+        result = server.run(["tests/", "-q", "-p", "no:cacheprovider"], timeout=1)
+
+        assert result.timed_out
+        assert "timed out after 1s" in result.stderr
+        server.stop()
+        assert not server.alive
+        assert server.run(["tests/"]) is None
+    finally:
+        ws.cleanup()
+
+
+def test_environment_key_tracks_requirements(tmp_path):
+    env = {"PYTHONPATH": str(tmp_path)}
+    before = environment_key(tmp_path, "python", env)
+    (tmp_path / "requirements.txt").write_text("requests\n")
+    assert environment_key(tmp_path, "python", env) != before
+    assert environment_key(tmp_path, "python", {}) != environment_key(tmp_path, "python", env)
@@ -0,0 +1,74 @@
+"""Tests for the per-test timeout plugin."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from summon.junit import load_report
+from summon.pytest_timeouts import (
+    PLUGIN_DIR,
+    PLUGIN_NAME,
+    TIMEOUTS_FILE,
+    adaptive_timeouts,
+    install_plugin,
+    load_timeouts,
+)
+from summon.workspace import Workspace
+
+
+def test_adaptive_timeouts_scale_and_clamp():
+    timeouts = adaptive_timeouts(
+        {"a::fast": 0.01, "a::medium": 2.0, "a::slow": 30.0},
+        default=30, multiplier=10, minimum=5, maximum=60,
+    )
+    assert timeouts["default"] == 30
+    assert timeouts["tests"] == {"a::fast": 5, "a::medium": 20, "a::slow": 60}
+
+
+def test_adaptive_timeouts_keep_deadline_of_timed_out_tests():
+    previous = {"default": 30, "tests": {"a::hung": 5.0}}
+    timeouts = adaptive_timeouts(
+        {"a::hung": 5.01, "a::new_hang": 30.0, "a::fine": 1.0},
+        default=30, multiplier=10, minimum=5, maximum=60, previous=previous,
+    )
+    assert timeouts["tests"]["a::hung"] == 5.0
+    assert timeouts["tests"]["a::new_hang"] == 30
+    assert timeouts["tests"]["a::fine"] == 10
+
+
+@pytest.mark.skipif(not hasattr(__import__("signal"), "SIGALRM"), reason="requires SIGALRM")
+def test_hung_test_fails_and_suite_completes():
+    ws = Workspace()
+    try:
+        ws.write_file(
+            "tests/test_mixed.py",
+            "import time\n\n"
+            "def block_forever():\n    while True:\n        time.sleep(0.05)\n\n"
+            "def test_hangs():\n    block_forever()\n\n"
+            "def test_passes():\n    assert True\n",
+        )
+        install_plugin(ws.path, {"default": 1, "tests": {}})
+        assert load_timeouts(ws.path) == {"default": 1, "tests": {}}
+
+        env = os.environ.copy()
+        env["PYTHONPATH"] = os.pathsep.join([str(ws.path), str(ws.path / PLUGIN_DIR)])
+        proc = subprocess.run(
+            [sys.executable, "-m", "pytest", "tests/", "-q", "-p", "no:cacheprovider",
+             "-p", PLUGIN_NAME, f"--summon-timeouts={TIMEOUTS_FILE}",
+             "-o", "junit_family=xunit1", "--junitxml=report.xml"],
+            cwd=ws.path, env=env, capture_output=True, text=True, timeout=60,
+        )
+
+        report = load_report(ws.path / "report.xml")
+        by_id = {r.nodeid: r for r in report.records}
+        hung = by_id["tests/test_mixed.py::test_hangs"]
+        assert hung.outcome == "failed"
+        assert "PerTestTimeout" in hung.message
+        assert "exceeded its 1s timeout during call" in hung.message
+        assert any(f["function"] == "block_forever" for f in hung.frames)
+        assert by_id["tests/test_mixed.py::test_passes"].outcome == "passed"
+        assert proc.returncode == 1
+    finally:
+        ws.cleanup()
@@ -0,0 +1,81 @@
+"""Tests for the AST-derived repository map."""
+
+from summon.repomap import (
+    _summary_cache,
+    clear_cache,
+    module_name,
+    render_map_entry,
+    summarize_source,
+)
+from summon.workspace import Workspace, collect_file_contents
+
+SOURCE = '''\
+import os
+from dataclasses import dataclass
+
+MAX_ITEMS = 10
+
+
+@dataclass
+class Item:
+    name: str
+    count: int = 0
+
+    def total(self, factor: float = 1.0) -> float:
+        return self.count * factor
+
+    def _private(self):
+        pass
+
+
+async def fetch(url: str, *, timeout: int = 5) -> bytes:
+    return b""
+'''
+
+
+def test_summarize_source_outline():
+    summary = summarize_source(SOURCE)
+    assert "imports: import os; from dataclasses import dataclass" in summary
+    assert "MAX_ITEMS = 10" in summary
+    assert "class Item:" in summary
+    assert "    name: str" in summary
+    assert "    def total(self, factor: float=1.0) -> float" in summary
+    assert "_private" not in summary
+    assert "async def fetch(url: str, *, timeout: int=5) -> bytes" in summary
+    assert "return" not in summary
+
+
+def test_summarize_source_syntax_error():
+    assert "unparseable" in summarize_source("def broken(:\n")
+
+
+def test_summarize_source_is_cached_by_content():
+    clear_cache()
+    first = summarize_source(SOURCE)
+    assert len(_summary_cache) == 1
+    assert summarize_source(str(SOURCE)) is first
+    assert len(_summary_cache) == 1
+
+
+def test_module_name():
+    assert module_name("models.py") == "models"
+    assert module_name("pkg/sub/mod.py") == "pkg.sub.mod"
+    assert module_name("pkg/__init__.py") == "pkg"
+
+
+def test_render_map_entry_non_python():
+    assert render_map_entry("requirements.txt", "requests") == "--- requirements.txt ---"
+
+
+def test_collect_file_contents_maps_omitted_files():
+    ws = Workspace()
+    try:
+        ws.write_file("big.py", "x = 1\n" * 50)
+        ws.write_file("models.py", SOURCE)
+        out = collect_file_contents(ws, ["big.py", "models.py"], budget=100, map_budget=1000)
+        assert "=== big.py ===" in out
+        assert "=== models.py ===" not in out
+        assert "--- models.py (module models) ---" in out
+        assert "class Item:" in out
+    finally:
+        ws.cleanup()
@@ -0,0 +1,119 @@
+"""Tests for the resource-limited sandbox runner."""
+
+import signal
+import sys
+import tempfile
+
+import pytest
+
+from summon.config import SandboxLimits
+from summon.executor import run_command
+from summon.sandbox import detect_breach, rlimits_for, scrub_env
+
+pytestmark = pytest.mark.skipif(sys.platform == "win32", reason="POSIX rlimits")
+
+PY = sys.executable
+
+
+def _limits(**overrides) -> SandboxLimits:
+    return SandboxLimits(use_cgroup=False, **overrides)
+
+
+def test_scrub_env_drops_secrets():
+    env = {"PATH": "/bin", "ANTHROPIC_API_KEY": "sk-secret", "PYTHONPATH": "/ws"}
+    scrubbed = scrub_env(env, _limits())
+    assert scrubbed["PATH"] == "/bin"
+    assert scrubbed["PYTHONPATH"] == "/ws"
+    assert "ANTHROPIC_API_KEY" not in scrubbed
+
+
+def test_scrub_env_keeps_toolchain_settings():
+    env = {"npm_config_registry": "https://npm.internal", "GOPROXY": "https://proxy", "GOFLAGS": "-mod=mod",
+           "GOPRIVATE": "corp.example", "AWS_SECRET_ACCESS_KEY": "x"}
+    scrubbed = scrub_env(env, _limits())
+    assert scrubbed["npm_config_registry"] == "https://npm.internal"
+    assert {"GOPROXY", "GOFLAGS", "GOPRIVATE"} <= set(scrubbed)
+    assert "AWS_SECRET_ACCESS_KEY" not in scrubbed
+
+
+def test_rlimits_zero_disables():
+    rlimits = rlimits_for(_limits(address_space_mb=0, processes=0))
+    assert "RLIMIT_AS" not in rlimits
+    assert "RLIMIT_NPROC" not in rlimits
+    assert rlimits["RLIMIT_NOFILE"] == (1024, 1024)
+
+
+def test_sandboxed_command_runs():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("echo hello", cwd=d, sandbox=_limits())
+        assert result.success
+        assert result.stdout.strip() == "hello"
+        assert result.limit_exceeded == ""
+
+
+def test_sandboxed_env_is_scrubbed(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-secret")
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command("echo key=$OPENAI_API_KEY", cwd=d, sandbox=_limits())
+        assert result.stdout.strip() == "key="
+
+
+def test_memory_limit_reported():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command(
+            [PY, "-c", "x = bytearray(2 * 1024 ** 3)"],
+            cwd=d, sandbox=_limits(address_space_mb=512),
+        )
+        assert not result.success
+        assert result.limit_exceeded == "memory"
+        assert "RESOURCE LIMIT EXCEEDED: memory" in result.output
+
+
+def test_cpu_limit_reported():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command(
+            [PY, "-c", "while True: pass"],
+            cwd=d, timeout=30, sandbox=_limits(cpu_seconds=1),
+        )
+        assert result.limit_exceeded == "cpu_time"
+
+
+def test_open_files_limit_reported():
+    with tempfile.TemporaryDirectory() as d:
+        result = run_command(
+            [PY, "-c", "fs = [open('/dev/null') for _ in range(200)]"],
+            cwd=d, sandbox=_limits(open_files=64),
+        )
+        assert result.limit_exceeded == "open_files"
+
+
+def test_detect_breach_from_signals_and_cgroup():
+    assert detect_breach(-signal.SIGXCPU, "") == "cpu_time"
+    assert detect_breach(-signal.SIGKILL, "", cgroup_events={"oom_kill": 1}) == "memory"
+    assert detect_breach(-1, "", timed_out=True) == "wall_time"
+    assert detect_breach(1, "AssertionError") == ""
+    assert detect_breach(0, "MemoryError") == ""
+    cpu = {"RLIMIT_CPU": (10, 15)}
+    assert detect_breach(-signal.SIGKILL, "", rlimits=cpu) == "cpu_time"
+    assert detect_breach(-signal.SIGKILL, "") == ""
+
+
+def test_memory_breach_needs_an_uncaught_memory_error():
+    assert detect_breach(1, "AssertionError: expected MemoryError to be raised") == ""
+    assert detect_breach(1, "    except MemoryError:\n        pass\nAssertionError") == ""
+    assert detect_breach(1, "Traceback (most recent call last):\n  File \"x\"\nMemoryError") == "memory"
+    assert detect_breach(1, ">       buf = bytearray(n)\nE       MemoryError\n") == "memory"
+
+
+def test_process_breach_needs_failed_fork_under_nproc():
+    nproc = {"RLIMIT_NPROC": (64, 64)}
+    eagain = "BlockingIOError: [Errno 11] Resource temporarily unavailable"
+    # Ordinary EAGAIN failures in the code under test are not breaches.
+    assert detect_breach(1, "sock.recv(1)\n" + eagain, rlimits=nproc) == ""
+    assert detect_breach(1, "AssertionError: EAGAIN expected", rlimits=nproc) == ""
+    fork = '  File "t.py", line 3, in test_spawn\n    os.fork()\n' + eagain
+    assert detect_breach(1, fork, rlimits=nproc) == "processes"
+    assert detect_breach(1, "bash: fork: retry: Resource temporarily unavailable", rlimits=nproc) == "processes"
+    # Without RLIMIT_NPROC a failed fork is not ours to report.
+    assert detect_breach(1, fork, rlimits={"RLIMIT_AS": (1, 1)}) == ""
+    assert detect_breach(-9, "", cgroup_events={"pids_max": 1}) == "processes"
@@ -0,0 +1,141 @@
+"""Tests for dependency-aware Stage 4 scheduling."""
+
+import threading
+import time
+
+from summon.config import SummonConfig
+from summon.scheduling import dependency_context, estimate_size, plan_waves, strongly_connected
+from summon.stages import stage4_implement
+
+
+def _comp(cid, deps=(), name=None):
+    return {"id": cid, "name": name or cid, "description": "", "files": [], "dependencies": list(deps)}
+
+
+def test_plan_waves_orders_by_dependencies():
+    plan = plan_waves([
+        _comp("cli", ["service", "models"]),
+        _comp("service", ["Models Layer"]),
+        _comp("models", name="Models Layer"),
+        _comp("utils", ["unknown"]),
+    ])
+    assert plan.waves == [["models", "utils"], ["service"], ["cli"]]
+    assert plan.dependencies["service"] == ["models"]
+    assert plan.cycles == []
+
+
+def test_plan_waves_collapses_cycles():
+    plan = plan_waves([
+        _comp("a", ["b"]),
+        _comp("b", ["a", "base"]),
+        _comp("base"),
+        _comp("top", ["a"]),
+    ])
+    assert plan.cycles == [["a", "b"]]
+    assert plan.waves == [["base"], ["a", "b"], ["top"]]
+
+
+def test_strongly_connected_handles_long_chains():
+    graph = {str(i): [str(i + 1)] for i in range(5000)}
+    graph["5000"] = []
+    assert len(strongly_connected(graph)) == 5001
+
+
+def test_dependency_context_uses_latest_result():
+    results = [
+        {"component_id": "models", "files": [{"path": "models.py", "content": "class Old: pass\n"}]},
+        {"component_id": "models", "files": [
+            {"path": "models.py", "content": "class User:\n    name: str\n\ndef load(path: str) -> User: ...\n"},
+            {"path": "schema.sql", "content": "create table t();"},
+        ]},
+    ]
+    text = dependency_context(["models", "missing"], results)
+    assert "## models" in text
+    assert "def load(path: str) -> User" in text
+    assert "--- schema.sql ---" in text
+    assert "Old" not in text
+
+
+def test_estimate_size_prefers_bigger_components():
+    small = {"files": ["a.py"], "interfaces": ["f()"], "description": "tiny"}
+    big = {"files": ["a.py", "b.py", "c.py"], "interfaces": [], "description": "tiny"}
+    assert estimate_size(big) > estimate_size(small)
+    assert estimate_size(small, lld="x" * 50_000) > estimate_size(small)
+
+
+def test_stage4_runs_waves_with_dependency_signatures(monkeypatch, tmp_path):
+    seen: list[tuple[str, str]] = []
+
+    def fake_lld(config):
+        return lambda state: {"_lld_result": {"lld_summary": ""}}
+
+    def fake_coder(config):
+        def node(state):
+            cid = state["component"]["id"]
+            seen.append((cid, state.get("dependency_interfaces", "")))
+            return {"_code_result": {"files": [
+                {"path": f"{cid}.py", "content": f"def {cid}_api(x: int) -> int:\n    return x\n"},
+            ]}}
+        return node
+
+    def fake_reviewer(config):
+        return lambda state: {"_review_result": {"approved": True}}
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", fake_lld)
+    monkeypatch.setattr(stage4_implement, "create_coder_node", fake_coder)
+    monkeypatch.setattr(stage4_implement, "create_code_reviewer_node", fake_reviewer)
+
+    config = SummonConfig(prefetch_dependencies=False, component_cache=False)
+    graph = stage4_implement.create_stage4_graph(config).compile()
+    result = graph.invoke({
+        "spec": {"language": "python"},
+        "hld": {},
+        "components": [_comp("app", ["core"]), _comp("core")],
+        "component_results": [],
+        "workspace_path": str(tmp_path),
+    })
+
+    assert [cid for cid, _ in seen] == ["core", "app"]
+    assert "def core_api(x: int) -> int" in dict(seen)["app"]
+    assert sorted(r["component_id"] for r in result["component_results"]) == ["app", "core"]
+    # Files are streamed to disk; results carry manifests only.
+    assert (tmp_path / "app.py").exists()
+    manifest = result["component_results"][0]["files"][0]
+    assert set(manifest) == {"path", "sha1", "lines"}
+
+
+def test_stage4_bounds_parallel_components_largest_first(monkeypatch, tmp_path):
+    started: list[str] = []
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def fake_lld(config):
+        def node(state):
+            with lock:
+                started.append(state["component"]["id"])
+                running["now"] += 1
+                running["peak"] = max(running["peak"], running["now"])
+            time.sleep(0.05)
+            with lock:
+                running["now"] -= 1
+            return {"_lld_result": {"lld_summary": ""}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", fake_lld)
+    monkeypatch.setattr(stage4_implement, "create_coder_node", lambda c: lambda s: {"_code_result": {"files": []}})
+    monkeypatch.setattr(
+        stage4_implement, "create_code_reviewer_node", lambda c: lambda s: {"_review_result": {"approved": True}},
+    )
+
+    components = [
+        {**_comp(f"c{n}"), "files": [f"f{i}.py" for i in range(n)]} for n in (1, 4, 2, 3)
+    ]
+    config = SummonConfig(prefetch_dependencies=False, component_cache=False, max_parallel_components=1)
+    graph = stage4_implement.create_stage4_graph(config).compile()
+    graph.invoke({
+        "spec": {"language": "python"}, "hld": {}, "components": components,
+        "component_results": [], "workspace_path": str(tmp_path),
+    })
+
+    assert running["peak"] == 1
+    assert started == ["c4", "c3", "c2", "c1"]
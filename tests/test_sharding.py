@@ -0,0 +1,58 @@
+"""Tests for parallel test sharding."""
+
+from summon.executor import ExecResult
+from summon.junit import TestRecord, TestReport
+from summon.sharding import default_workers, merge_reports, merge_results, plan_shards, unit_duration
+
+
+def test_default_workers():
+    assert default_workers(3) == 3
+    assert default_workers(0) >= 1
+
+
+def test_unit_duration_sums_file_tests():
+    durations = {"tests/test_a.py::test_x": 1.0, "tests/test_a.py::test_y": 2.0, "tests/test_b.py::t": 0.5}
+    assert unit_duration("tests/test_a.py", durations) == 3.0
+    assert unit_duration("tests/test_b.py::t", durations) == 0.5
+    assert unit_duration("tests/test_c.py", durations) is None
+
+
+def test_plan_shards_balances_by_duration():
+    durations = {"a.py::t": 8.0, "b.py::t": 4.0, "c.py::t": 3.0, "d.py::t": 1.0}
+    shards = plan_shards(["a.py", "b.py", "c.py", "d.py"], durations, workers=2)
+
+    assert sorted(map(sorted, shards)) == [["a.py"], ["b.py", "c.py", "d.py"]]
+
+
+def test_plan_shards_unknown_durations_and_small_inputs():
+    shards = plan_shards(["a.py", "b.py", "c.py", "d.py"], {}, workers=2)
+    assert sorted(len(s) for s in shards) == [2, 2]
+    assert sorted(u for s in shards for u in s) == ["a.py", "b.py", "c.py", "d.py"]
+
+    assert plan_shards(["a.py"], {}, workers=8) == [["a.py"]]
+    assert plan_shards([], {}, workers=8) == []
+
+
+def test_merge_results_and_reports():
+    ok = ExecResult(returncode=0, stdout="1 passed", stderr="", wall_time=2.0, cpu_time=1.0, max_rss_kb=10)
+    bad = ExecResult(returncode=1, stdout="1 failed", stderr="oops", wall_time=3.0, cpu_time=2.0, max_rss_kb=20)
+
+    merged = merge_results([ok, bad])
+
+    assert merged.returncode == 1
+    assert "shard 1/2" in merged.stdout and "1 failed" in merged.stdout
+    assert (merged.wall_time, merged.cpu_time, merged.max_rss_kb) == (3.0, 3.0, 20)
+    assert merge_results([ok]) is ok
+
+    # A shard that collected nothing doesn't fail a run where others passed.
+    empty = ExecResult(returncode=5, stdout="no tests ran", stderr="")
+    assert merge_results([ok, empty]).returncode == 0
+    assert merge_results([bad, empty]).returncode == 1
+    assert merge_results([empty, empty]).returncode == 5
+
+    r1 = TestReport([TestRecord("a.py::t", "passed")])
+    r2 = TestReport([TestRecord("b.py::t", "failed")])
+    report = merge_reports([r1, r2])
+    assert [r.nodeid for r in report.records] == ["a.py::t", "b.py::t"]
+    assert not report.ok
+    assert merge_reports([r1, None]) is None
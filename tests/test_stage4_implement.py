@@ -0,0 +1,91 @@
+"""Tests for Stage 4 per-file code generation."""
+
+import threading
+import time
+
+from summon.config import SummonConfig
+from summon.stages import stage4_implement
+
+
+def _lld(paths):
+    return {"lld_summary": "plan", "files": [
+        {"path": p, "purpose": "", "signatures": [f"def {p[:-3]}_api() -> int"]} for p in paths
+    ]}
+
+
+def test_file_manifest_dedupes_and_skips_malformed_entries():
+    lld = {"files": [{"path": "a.py"}, {"path": "a.py"}, "b.py", {"purpose": "no path"}, {"path": "c.py"}]}
+    assert [e["path"] for e in stage4_implement.file_manifest(lld)] == ["a.py", "c.py"]
+    assert stage4_implement.file_manifest("plain text") == []
+
+
+def _run(monkeypatch, tmp_path, paths, file_coder, config):
+    coder_calls: list[int] = []
+    reviews: list[list[str]] = []
+
+    def fake_coder(config):
+        def node(state):
+            coder_calls.append(1)
+            return {"_code_result": {"files": [{"path": p, "content": "x = 1\n"} for p in paths]}}
+        return node
+
+    def fake_reviewer(config):
+        def node(state):
+            reviews.append([f["path"] for f in state["_code_result"]["files"]])
+            return {"_review_result": {"approved": True}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", lambda c: lambda s: {"_lld_result": _lld(paths)})
+    monkeypatch.setattr(stage4_implement, "create_coder_node", fake_coder)
+    monkeypatch.setattr(stage4_implement, "create_file_coder_node", lambda c: file_coder)
+    monkeypatch.setattr(stage4_implement, "create_code_reviewer_node", fake_reviewer)
+
+    stage4_implement.create_stage4_graph(config).compile().invoke({
+        "spec": {"language": "python"}, "hld": {},
+        "components": [{"id": "big", "name": "big", "files": paths}],
+        "component_results": [], "workspace_path": str(tmp_path),
+    })
+    return coder_calls, reviews
+
+
+def test_large_components_are_written_one_file_per_call_in_parallel(monkeypatch, tmp_path):
+    paths = [f"part{i}.py" for i in range(5)]
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+    contracts: list[str] = []
+
+    def file_coder(state):
+        with lock:
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            contracts.append(state["_file_manifest"])
+        time.sleep(0.05)
+        with lock:
+            running["now"] -= 1
+        path = state["_file_path"]
+        return {"_file_result": {"path": path, "content": f"def {path[:-3]}_api() -> int:\n    return 1\n"}}
+
+    config = SummonConfig(
+        prefetch_dependencies=False, component_cache=False, review_skip_max_lines=0, per_file_min_files=4,
+    )
+    coder_calls, reviews = _run(monkeypatch, tmp_path, paths, file_coder, config)
+
+    assert coder_calls == []
+    assert running["peak"] > 1
+    assert all("part4_api" in contract for contract in contracts)
+    # One combined review over every file.
+    assert reviews == [paths]
+    assert (tmp_path / "part3.py").read_text().startswith("def part3_api")
+
+
+def test_small_components_and_failed_files_use_a_single_call(monkeypatch, tmp_path):
+    config = SummonConfig(
+        prefetch_dependencies=False, component_cache=False, review_skip_max_lines=0, per_file_min_files=4,
+    )
+    never = lambda state: {"_file_result": {"content": "unused"}}  # noqa: E731
+    coder_calls, _ = _run(monkeypatch, tmp_path, ["a.py", "b.py"], never, config)
+    assert coder_calls == [1]
+
+    empty = lambda state: {"_file_result": {}}  # noqa: E731
+    coder_calls, _ = _run(monkeypatch, tmp_path, [f"p{i}.py" for i in range(4)], empty, config)
+    assert coder_calls == [1]
@@ -0,0 +1,150 @@
+"""Tests for the Stage 5 graph's concurrent test generation."""
+
+import threading
+import time
+
+from summon.config import SummonConfig
+from summon.stages import stage5_testing
+
+
+def test_adversarial_and_criteria_generation_overlap_unit_tests(monkeypatch, tmp_path):
+    events: list[str] = []
+    running = {"now": 0, "peak": 0}
+    lock = threading.Lock()
+
+    def llm(name, output):
+        def factory(config):
+            def node(state):
+                with lock:
+                    events.append(name)
+                    running["now"] += 1
+                    running["peak"] = max(running["peak"], running["now"])
+                time.sleep(0.05)
+                with lock:
+                    running["now"] -= 1
+                return output
+            return node
+        return factory
+
+    monkeypatch.setattr(stage5_testing, "create_integrator_node", llm("integrate", {"_integration_result": {}}))
+    monkeypatch.setattr(stage5_testing, "create_test_writer_node", llm("write_tests", {"_test_result": {
+        "test_code": "def test_ok(): pass\n", "test_file_path": "tests/test_main.py",
+    }}))
+    monkeypatch.setattr(stage5_testing, "create_adversarial_tester_node", llm("write_adversarial", {
+        "_adversarial_test_result": {"test_code": "def test_edge(): pass\n"},
+    }))
+    monkeypatch.setattr(stage5_testing, "create_acceptance_criteria_gen_node", llm("criteria", {
+        "_acceptance_gen_result": {"criteria": [{"id": "AC-1"}]},
+    }))
+    monkeypatch.setattr(stage5_testing, "create_bug_fixer_node", llm("fix_bugs", {"_fix_result": {}}))
+    monkeypatch.setattr(stage5_testing, "create_acceptance_test_gen_node", llm("acceptance_tests", {
+        "_acceptance_test_gen_result": {},
+    }))
+    for name in ("_install_deps", "_validate_imports"):
+        monkeypatch.setattr(stage5_testing, name, lambda state, config=None: {"import_validation_passing": True})
+    monkeypatch.setattr(stage5_testing, "_build_integration_context", lambda state: {})
+    monkeypatch.setattr(stage5_testing, "_process_integration", lambda state: {})
+    monkeypatch.setattr(stage5_testing, "_check_degeneracy", lambda state: {"degeneracy_detected": False})
+
+    def run_tests(state, config=None):
+        # The adversarial file must not be part of the unit-test loop.
+        assert not (tmp_path / "tests" / "test_adversarial.py").exists()
+        events.append("run_tests")
+        return {"tests_passing": "fix_bugs" in events}
+
+    monkeypatch.setattr(stage5_testing, "_run_tests", run_tests)
+    monkeypatch.setattr(
+        stage5_testing, "_run_adversarial_tests",
+        lambda state, config=None: {"adversarial_tests_passing": True},
+    )
+    monkeypatch.setattr(
+        stage5_testing, "_run_acceptance_tests",
+        lambda state, config=None: {"acceptance_tests_passing": True},
+    )
+
+    graph = stage5_testing.create_stage5_graph(SummonConfig()).compile()
+    result = graph.invoke({"spec": {}, "workspace_path": str(tmp_path), "stage_retries": {}})
+
+    assert running["peak"] == 3
+    assert set(events[1:4]) == {"write_tests", "write_adversarial", "criteria"}
+    assert result["acceptance_criteria"].count("AC-1") == 1
+    assert (tmp_path / "tests" / "test_adversarial.py").read_text() == "def test_edge(): pass\n"
+    assert events.count("criteria") == 1
+    assert events[-1] == "acceptance_tests"
+
+
+def test_validate_imports_imports_statically_clean_modules(tmp_path):
+    (tmp_path / "a.py").write_text("from b import g\n\ndef f():\n    return 1\n")
+    (tmp_path / "b.py").write_text("from a import f\n\ndef g():\n    return 2\n")
+    (tmp_path / "consts.py").write_text("X = undefined_name + 1\n")
+    (tmp_path / "fine.py").write_text("import json\n")
+
+    result = stage5_testing._validate_imports(
+        {"workspace_path": str(tmp_path), "spec": {"language": "python"}}, SummonConfig(),
+    )
+
+    assert not result["import_validation_passing"]
+    failed = {r["file"] for r in result["import_results"] if not r["ok"]}
+    assert "consts.py" in failed
+    assert failed & {"a.py", "b.py"}
+    assert "fine.py" not in failed
+
+
+def test_install_deps_installs_what_the_wheelhouse_has(monkeypatch, tmp_path):
+    import zipfile
+
+    from summon.executor import ExecResult
+
+    house = tmp_path / "house"
+    house.mkdir()
+    for name in ("idna", "pytest"):
+        with zipfile.ZipFile(house / f"{name}-1.0-py3-none-any.whl", "w") as whl:
+            whl.writestr(f"{name}-1.0.dist-info/METADATA", f"Name: {name}\nVersion: 1.0\n")
+    ws = tmp_path / "ws"
+    ws.mkdir()
+    (ws / "requirements.txt").write_text("idna\nrich==13.0\n")
+
+    commands = []
+
+    def fake_run(cmd, cwd=".", timeout=0, **kwargs):
+        commands.append(cmd)
+        return ExecResult(returncode=0, stdout="", stderr="")
+
+    monkeypatch.setattr(stage5_testing, "run_command", fake_run)
+    monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/uv" if name == "uv" else None)
+
+    result = stage5_testing._install_deps(
+        {"workspace_path": str(ws), "spec": {"language": "python"}},
+        SummonConfig(wheelhouse=str(house), prefetch_dependencies=False),
+    )
+
+    assert result == {"missing_wheels": ["rich==13.0"]}
+    install = commands[-1]
+    assert install[:3] == ["/usr/bin/uv", "pip", "install"]
+    assert "idna" in install and "pytest" in install and "rich==13.0" not in install
+    assert commands[0][:2] == ["/usr/bin/uv", "venv"]
+
+
+def test_apply_fix_result_resets_patch_failures(tmp_path):
+    state = {
+        "workspace_path": str(tmp_path), "patch_failures": "other.py",
+        "_fix_result": {"fixes": []}, "stage_retries": {"test_fix": 1},
+    }
+    updates = stage5_testing._apply_fix_result(state, "_fix_result", "adversarial_fix")
+    assert updates["patch_failures"] == "none"
+    assert updates["stage_retries"] == {"test_fix": 1, "adversarial_fix": 1}
+
+
+def test_sharded_run_passes_with_a_fixtures_only_test_file(tmp_path):
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_helpers.py").write_text(
+        "import pytest\n\n\n@pytest.fixture\ndef thing():\n    return 1\n",
+    )
+    (tmp_path / "tests" / "test_a.py").write_text("def test_a():\n    assert True\n")
+
+    result, report = stage5_testing._run_pytest(
+        str(tmp_path), ["tests/"], "unit", SummonConfig(test_workers=2, warm_test_server=False),
+    )
+
+    assert "shard 2/2" in result.stdout
+    assert stage5_testing._pytest_outcome(result, report)[0]
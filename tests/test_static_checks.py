@@ -0,0 +1,109 @@
+"""Tests for the Stage 4 pre-review static checks."""
+
+from summon.config import SummonConfig
+from summon.stages import stage4_implement
+from summon.static_checks import check_component, interface_names
+
+
+def _codes(diagnostics):
+    return sorted(d.code for d in diagnostics)
+
+
+def test_check_component_finds_mechanical_problems():
+    files = [
+        ("broken.py", "def f(:\n"),
+        ("service.py",
+         "from src.models import User\n\n"
+         "def load(path: str) -> User:\n    return parse(path)\n\n"
+         "def save(user: User) -> None:\n    raise NotImplementedError\n"),
+    ]
+    diagnostics = check_component(files, ["load(path) -> User"])
+    assert _codes(diagnostics) == ["src-import", "stub", "syntax", "undefined-name"]
+    assert str(diagnostics[0]).startswith("broken.py:1: [syntax]")
+    assert any("`parse`" in d.message for d in diagnostics)
+
+
+def test_check_component_accepts_clean_code():
+    code = (
+        "import abc\nfrom typing import Protocol\n\n"
+        "class Store(Protocol):\n    def get(self, key: str) -> str: ...\n\n"
+        "class Base(abc.ABC):\n    @abc.abstractmethod\n    def run(self) -> None:\n        pass\n\n"
+        "def download_video(url: str) -> str:\n"
+        "    try:\n        data = [c for c in url if c]\n    except ValueError as exc:\n        raise RuntimeError(exc)\n"
+        "    return ''.join(data)\n"
+    )
+    assert check_component([("video.py", code)], ["download_video(url) -> str", "class Store"]) == []
+
+
+def test_legitimate_no_ops_are_not_stubs():
+    code = (
+        "import logging\n\n"
+        "class NullHandler(logging.Handler):\n    def emit(self, record):\n        pass\n\n"
+        "class Session:\n"
+        "    def __exit__(self, *exc):\n        pass\n\n"
+        "    def on_close(self) -> None:\n        \"\"\"Hook for subclasses.\"\"\"\n\n"
+        "    def close(self) -> None:\n        self.on_close()\n"
+    )
+    assert check_component([("session.py", code)]) == []
+    only_stubs = "def a():\n    pass\n\ndef b():\n    pass\n"
+    assert _codes(check_component([("stubs.py", only_stubs)])) == ["stub"]
+
+
+def test_prose_and_method_interfaces_are_ignored():
+    assert interface_names([
+        "Returns (x, y) tuple", "run(self) -> list", "def close(cls)", "class Runner(Base)", "start(config)",
+    ]) == ["Runner", "start"]
+
+
+def test_missing_interfaces():
+    assert interface_names(["download_video(url) -> str", "class Downloader", "REST API for users"]) == [
+        "download_video", "Downloader",
+    ]
+    diagnostics = check_component([("a.py", "def other():\n    return 1\n")], ["class Downloader"])
+    assert _codes(diagnostics) == ["missing-interface"]
+
+
+def test_stage4_bounces_broken_code_and_skips_review(monkeypatch, tmp_path):
+    coder_calls: list[str] = []
+    reviews: list[int] = []
+
+    def fake_coder(config):
+        def node(state):
+            coder_calls.append(state.get("_static_issues", ""))
+            body = "    return helper(x)\n" if len(coder_calls) == 1 else "    return x * 2\n"
+            return {"_code_result": {"files": [{"path": "calc.py", "content": "def double(x: int) -> int:\n" + body}]}}
+        return node
+
+    def fake_reviewer(config):
+        def node(state):
+            reviews.append(1)
+            return {"_review_result": {"approved": True}}
+        return node
+
+    monkeypatch.setattr(stage4_implement, "create_lld_node", lambda c: lambda s: {"_lld_result": {}})
+    monkeypatch.setattr(stage4_implement, "create_coder_node", fake_coder)
+    monkeypatch.setattr(stage4_implement, "create_code_reviewer_node", fake_reviewer)
+
+    config = SummonConfig(prefetch_dependencies=False, component_cache=False)
+    graph = stage4_implement.create_stage4_graph(config).compile()
+    result = graph.invoke({
+        "spec": {"language": "python"}, "hld": {},
+        "components": [{"id": "calc", "name": "calc", "files": ["calc.py"], "interfaces": ["double(x) -> int"]}],
+        "component_results": [], "workspace_path": str(tmp_path),
+    })
+
+    assert len(coder_calls) == 2
+    assert "[undefined-name] `helper`" in coder_calls[1]
+    assert reviews == []
+    assert result["component_results"][0]["review_feedback"]["skipped"]
+    assert (tmp_path / "calc.py").read_text().endswith("return x * 2\n")
+
+    # Large components still get the LLM review.
+    coder_calls.clear()
+    config = SummonConfig(prefetch_dependencies=False, component_cache=False, review_skip_max_lines=0)
+    stage4_implement.create_stage4_graph(config).compile().invoke({
+        "spec": {"language": "python"}, "hld": {},
+        "components": [{"id": "calc", "name": "calc", "files": ["calc.py"], "interfaces": []}],
+        "component_results": [], "workspace_path": str(tmp_path),
+    })
+    assert reviews == [1]
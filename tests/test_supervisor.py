@@ -1,6 +1,28 @@
 """Tests for supervisor gate."""
 
-from summon.supervisor import gate_passed
+import json
+from types import SimpleNamespace
+
+from summon import supervisor
+from summon.concurrency import limiter
+from summon.config import SummonConfig
+from summon.supervisor import create_gate_node, gate_passed
+
+_GATE_RESPONSE = json.dumps({
+    "stage": "design", "passed": True, "score": 0.9, "conformance": 0.9, "quality": 0.9,
+    "coherence": 0.9, "scope_creep": 0.0, "feedback": "ok",
+})
+
+
+class _FakeLLM:
+    def __init__(self):
+        self.prompts = []
+        self.in_use = []
+
+    def invoke(self, messages):
+        self.prompts.append(messages[-1].content)
+        self.in_use.append(limiter("llm", 3).in_use)
+        return SimpleNamespace(content=_GATE_RESPONSE)
 
 
 def test_gate_passed_with_passing_result():
@@ -30,3 +52,30 @@ def test_gate_passed_uses_latest():
         ]
     }
     assert gate_passed(state) == "pass"
+
+
+def test_gate_llm_call_shares_the_llm_limiter(monkeypatch):
+    llm = _FakeLLM()
+    monkeypatch.setattr(supervisor, "get_llm", lambda model: llm)
+    gate = create_gate_node(SummonConfig(max_concurrent_llm_calls=3), "design", "hld")
+
+    result = gate({"spec": {}, "hld": {"components": []}})
+
+    assert llm.in_use == [1]
+    assert result["gate_results"][0]["passed"]
+
+
+def test_implementation_gate_sees_file_contents(monkeypatch, tmp_path):
+    (tmp_path / "core.py").write_text("def core_api():\n    return 42\n")
+    llm = _FakeLLM()
+    monkeypatch.setattr(supervisor, "get_llm", lambda model: llm)
+    gate = create_gate_node(SummonConfig(), "implementation", "component_results")
+
+    gate({
+        "spec": {}, "workspace_path": str(tmp_path),
+        "component_results": [
+            {"component_id": "core", "files": [{"path": "core.py", "sha1": "x", "lines": 2}]},
+        ],
+    })
+
+    assert "return 42" in llm.prompts[0]
@@ -0,0 +1,76 @@
+"""Tests for the TypeScript / Go toolchain caches."""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from summon.toolchain_cache import (
+    ensure_node_modules,
+    go_affected_packages,
+    node_modules_key,
+    toolchain_env,
+)
+from summon.venv_cache import read_marker
+
+
+def test_node_modules_key(tmp_path):
+    (tmp_path / "package.json").write_text(json.dumps({
+        "name": "demo", "version": "1.0.0", "scripts": {"test": "jest"},
+        "devDependencies": {"jest": "^29.0.0"},
+    }))
+    key = node_modules_key(tmp_path, "v20.0.0")
+
+    # Scripts don't affect the dependency set; the node version does.
+    data = json.loads((tmp_path / "package.json").read_text())
+    data["scripts"]["build"] = "tsc"
+    (tmp_path / "package.json").write_text(json.dumps(data))
+    assert node_modules_key(tmp_path, "v20.0.0") == key
+    assert node_modules_key(tmp_path, "v22.0.0") != key
+
+    (tmp_path / "package-lock.json").write_text('{"lockfileVersion": 3}')
+    assert node_modules_key(tmp_path, "v20.0.0") != key
+
+    data["dependencies"] = {"local": "file:../local"}
+    (tmp_path / "package.json").write_text(json.dumps(data))
+    assert node_modules_key(tmp_path, "v20.0.0") is None
+
+
+def test_toolchain_env_points_at_shared_caches(tmp_path):
+    go = toolchain_env("go", tmp_path)
+    assert go["GOMODCACHE"] == str(tmp_path / "go" / "mod")
+    assert go["GOCACHE"] == str(tmp_path / "go" / "build")
+    assert toolchain_env("typescript", tmp_path)["npm_config_cache"] == str(tmp_path / "npm")
+    assert toolchain_env("python", tmp_path) == {}
+
+
+@pytest.mark.skipif(shutil.which("npm") is None, reason="requires npm")
+def test_ensure_node_modules_builds_once_and_clones(tmp_path):
+    cache = tmp_path / "cache"
+    for name in ("ws1", "ws2"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "package.json").write_text('{"name": "demo", "version": "1.0.0"}')
+
+    assert ensure_node_modules(tmp_path / "ws1", "v20", cache_dir=cache)
+    assert ensure_node_modules(tmp_path / "ws2", "v20", cache_dir=cache)
+
+    key = node_modules_key(tmp_path / "ws1", "v20")
+    assert read_marker(tmp_path / "ws2" / "node_modules") == key
+    assert [p.name for p in (cache / "node_modules").iterdir()] == [key]
+
+
+@pytest.mark.skipif(shutil.which("go") is None, reason="requires go")
+def test_go_affected_packages(tmp_path):
+    (tmp_path / "go.mod").write_text("module example.com/demo\n\ngo 1.21\n")
+    for pkg, body in {
+        "util": "package util\n\nfunc Add(a, b int) int { return a + b }\n",
+        "calc": 'package calc\n\nimport "example.com/demo/util"\n\nfunc Twice(a int) int { return util.Add(a, a) }\n',
+        "other": "package other\n\nfunc Noop() {}\n",
+    }.items():
+        (tmp_path / pkg).mkdir()
+        (tmp_path / pkg / f"{pkg}.go").write_text(body)
+
+    env = {**os.environ, **toolchain_env("go", tmp_path / "cache")}
+    assert go_affected_packages(tmp_path, ["util/util.go"], env=env) == ["./calc", "./util"]
+    assert go_affected_packages(tmp_path, ["other/other.go"], env=env) == ["./other"]
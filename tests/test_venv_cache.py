@@ -0,0 +1,97 @@
+"""Tests for the content-addressed venv cache."""
+
+from pathlib import Path
+
+from summon.venv_cache import (
+    MARKER,
+    clone_tree,
+    ensure_venv,
+    normalize_requirements,
+    read_marker,
+    venv_key,
+)
+
+
+def test_normalize_requirements():
+    text = "# deps\nRequests >= 2.0\n\nflask_login==0.6  # auth\nrequests>=2.0\nPyYAML\n"
+    assert normalize_requirements(text) == ["flask-login==0.6", "pyyaml", "requests>=2.0"]
+    assert normalize_requirements("-e .\n") is None
+    assert normalize_requirements("-r base.txt\n") is None
+    assert normalize_requirements("./vendor/pkg.whl\n") is None
+
+
+def test_venv_key_ignores_formatting_but_not_content():
+    key = venv_key("py3.12", "requests\nflask\n")
+    assert key == venv_key("py3.12", "Flask\n\n# web\nrequests\n")
+    assert key != venv_key("py3.11", "requests\nflask\n")
+    assert key != venv_key("py3.12", "requests\n")
+    assert venv_key("py3.12", "-e .") is None
+
+
+def _fake_build(calls: list[Path]):
+    def build(target: Path) -> bool:
+        calls.append(target)
+        (target / "bin").mkdir(parents=True)
+        script = target / "bin" / "pytest"
+        script.write_text(f"#!{target}/bin/python\nimport pytest\n")
+        script.chmod(0o755)
+        (target / "bin" / "python").symlink_to("/usr/bin/python3")
+        site = target / "lib" / "site-packages"
+        site.mkdir(parents=True)
+        (site / "requests.py").write_text("VERSION = 1\n")
+        return True
+    return build
+
+
+def test_ensure_venv_builds_once_and_clones(tmp_path):
+    cache = tmp_path / "cache"
+    calls: list[Path] = []
+    first = tmp_path / "ws1" / ".venv"
+    second = tmp_path / "ws2" / ".venv"
+
+    assert ensure_venv(first, "abc", _fake_build(calls), cache_dir=cache) == "built"
+    assert ensure_venv(first, "abc", _fake_build(calls), cache_dir=cache) == "current"
+    assert ensure_venv(second, "abc", _fake_build(calls), cache_dir=cache) == "cloned"
+    assert len(calls) == 1
+
+    assert read_marker(second) == "abc"
+    assert (second / "lib" / "site-packages" / "requests.py").read_text() == "VERSION = 1\n"
+    assert (second / "bin" / "python").is_symlink()
+    # Scripts point at the clone, and the cache copy is left alone.
+    assert (second / "bin" / "pytest").read_text().startswith(f"#!{second}/bin/python")
+    assert (cache / "abc" / "bin" / "pytest").read_text().startswith(f"#!{cache / 'abc'}/bin/python")
+    assert not list(cache.glob("*.tmp-*"))
+
+
+def test_ensure_venv_replaces_stale_venv(tmp_path):
+    venv = tmp_path / ".venv"
+    venv.mkdir()
+    (venv / "stale.txt").write_text("old")
+    (venv / MARKER).write_text("old-key")
+
+    assert ensure_venv(venv, "new", _fake_build([]), cache_dir=tmp_path / "cache") == "built"
+    assert not (venv / "stale.txt").exists()
+    assert read_marker(venv) == "new"
+
+
+def test_ensure_venv_failed_build_leaves_workspace(tmp_path):
+    venv = tmp_path / ".venv"
+    venv.mkdir()
+    (venv / "keep.txt").write_text("x")
+
+    assert ensure_venv(venv, "k", lambda target: False, cache_dir=tmp_path / "cache") == "failed"
+    assert (venv / "keep.txt").exists()
+    assert not (tmp_path / "cache" / "k").exists()
+
+
+def test_clone_tree_shares_or_copies_files(tmp_path):
+    src = tmp_path / "src"
+    (src / "pkg").mkdir(parents=True)
+    (src / "pkg" / "mod.py").write_text("x = 1\n")
+
+    method = clone_tree(src, tmp_path / "dst")
+
+    assert method in ("reflink", "hardlink", "copy")
+    assert (tmp_path / "dst" / "pkg" / "mod.py").read_text() == "x = 1\n"
+    if method == "hardlink":
+        assert (tmp_path / "dst" / "pkg" / "mod.py").stat().st_ino == (src / "pkg" / "mod.py").stat().st_ino
@@ -0,0 +1,56 @@
+"""Tests for the offline wheelhouse."""
+
+import zipfile
+from pathlib import Path
+
+from summon.wheelhouse import add, install_args, missing_requirements, scan
+
+
+def _wheel(root: Path, name: str, version: str, requires: list[str] = ()) -> Path:
+    path = root / f"{name}-{version}-py3-none-any.whl"
+    metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: {version}\n"
+    metadata += "".join(f"Requires-Dist: {req}\n" for req in requires)
+    with zipfile.ZipFile(path, "w") as whl:
+        whl.writestr(f"{name}-{version}.dist-info/METADATA", metadata)
+    return path
+
+
+def test_scan_indexes_wheels_and_sdists(tmp_path):
+    _wheel(tmp_path, "Flask_Login", "0.6.3")
+    (tmp_path / "python-dateutil-2.9.0.tar.gz").write_bytes(b"")
+    (tmp_path / "notes.txt").write_text("ignored")
+
+    index = scan(tmp_path)
+
+    assert set(index) == {"flask-login", "python-dateutil"}
+    assert index["python-dateutil"][0].version == "2.9.0"
+    assert not index["python-dateutil"][0].is_wheel
+
+
+def test_missing_requirements_follows_dependencies(tmp_path):
+    _wheel(tmp_path, "requests", "2.31.0", ["idna<4,>=2.5", "certifi>=2017", "PySocks; extra == 'socks'"])
+    _wheel(tmp_path, "idna", "3.6")
+    _wheel(tmp_path, "pytest", "8.0.0")
+
+    missing = missing_requirements(["requests>=2", "pytest", "rich==13.0"], tmp_path)
+
+    assert missing == ["rich==13.0", "certifi>=2017 (required by requests)"]
+
+
+def test_missing_requirements_checks_versions(tmp_path):
+    _wheel(tmp_path, "idna", "3.6")
+    assert missing_requirements(["idna<3"], tmp_path) == ["idna<3"]
+    assert missing_requirements(["idna>=3"], tmp_path) == []
+
+
+def test_install_args_are_offline(tmp_path):
+    assert install_args(tmp_path) == ["--offline", "--no-index", "--find-links", str(tmp_path.resolve())]
+    assert "--offline" not in install_args(tmp_path, uv=False)
+
+
+def test_add_copies_local_distributions(tmp_path):
+    built = _wheel(tmp_path, "mylib", "1.0")
+    house = tmp_path / "house"
+
+    assert add(house, [str(built)]) is None
+    assert "mylib" in scan(house)
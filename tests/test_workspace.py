@@ -3,7 +3,7 @@
 import tempfile
 from pathlib import Path
 
-from summon.workspace import Workspace
+from summon.workspace import Workspace, collect_file_contents
 
 
 def test_workspace_creates_temp_dir():
@@ -50,3 +50,31 @@ def test_list_files():
         assert "src/b.py" in files
     finally:
         ws.cleanup()
+
+
+def test_list_project_files_prunes_venv():
+    ws = Workspace()
+    try:
+        ws.write_file("b.py", "b")
+        ws.write_file("a.py", "a")
+        ws.write_file(".venv/lib/site.py", "x")
+        ws.write_file("pkg/__pycache__/mod.cpython-311.pyc", "x")
+        assert ws.list_project_files() == ["a.py", "b.py"]
+    finally:
+        ws.cleanup()
+
+
+def test_collect_file_contents_memoized():
+    ws = Workspace()
+    try:
+        ws.write_file("a.py", "A = 1\n")
+        ws.write_file("b.py", "B = 2\n")
+        first = collect_file_contents(ws, ["a.py", "b.py"])
+        assert collect_file_contents(ws, ["a.py", "b.py"]) is first
+
+        ws.write_file("b.py", "B = 3\n")
+        second = collect_file_contents(ws, ["a.py", "b.py"])
+        assert "B = 3" in second
+        assert second.startswith("=== a.py ===\nA = 1\n")
+    finally:
+        ws.cleanup()